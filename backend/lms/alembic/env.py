@@ -5,6 +5,7 @@ from alembic import context
 
 # models
 from lms.api.books.model import *
+from lms.api.loans.model import *
 from lms.base.model import Base
 from lms.config import settings
 from sqlalchemy import pool, text
@@ -0,0 +1,71 @@
+"""Add - book_facets materialized view (저자별/가격대/쪽수 구간/전체 재고 집계)
+
+Revision ID: 3f9a7c2e5b18
+Revises: 8c41d0e6f3b2
+Create Date: 2025-04-14 10:21:37.512803
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9a7c2e5b18"
+down_revision: Union[str, None] = "8c41d0e6f3b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 가격대(원) / 쪽수 구간 경계 - 바꾸려면 새 마이그레이션에서 view를 다시 만들어야 함
+# width_bucket(x, ARRAY[...])은 첫 경계 미만이면 0, 마지막 경계 이상이면 배열 길이를 반환
+BOOK_FACETS_VIEW = """
+CREATE MATERIALIZED VIEW book_facets AS
+WITH
+price_edges AS (SELECT ARRAY[10000, 20000, 30000, 50000]::float8[] AS edges),
+page_edges AS (SELECT ARRAY[100, 200, 300, 500]::float8[] AS edges),
+priced AS (
+    SELECT b.quantity, b.price, width_bucket(b.price, e.edges) AS band, e.edges
+    FROM books b, price_edges e
+),
+paged AS (
+    SELECT b.quantity, b.page_count, width_bucket(b.page_count, e.edges) AS band, e.edges
+    FROM books b, page_edges e
+)
+SELECT 'author'::text AS facet, a.id::text AS bucket, a.name::text AS label,
+       NULL::float8 AS lower, NULL::float8 AS upper,
+       count(*) AS book_count, coalesce(sum(b.quantity), 0) AS stock, now() AS refreshed_at
+FROM books b
+JOIN authors a ON a.id = b.author_id
+GROUP BY a.id, a.name
+UNION ALL
+SELECT 'price', coalesce(band::text, 'unknown'), NULL,
+       CASE WHEN band > 0 THEN edges[band] END, edges[band + 1],
+       count(*), coalesce(sum(quantity), 0), now()
+FROM priced
+GROUP BY band, edges
+UNION ALL
+SELECT 'page_count', coalesce(band::text, 'unknown'), NULL,
+       CASE WHEN band > 0 THEN edges[band] END, edges[band + 1],
+       count(*), coalesce(sum(quantity), 0), now()
+FROM paged
+GROUP BY band, edges
+UNION ALL
+SELECT 'total', 'all', NULL, NULL, NULL, count(*), coalesce(sum(quantity), 0), now()
+FROM books
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(BOOK_FACETS_VIEW)
+    # REFRESH MATERIALIZED VIEW CONCURRENTLY에 필요한 unique 인덱스
+    op.create_index("ix_book_facets_facet_bucket", "book_facets", ["facet", "bucket"], unique=True)
+    # 저자 facet 상위 N개 조회
+    op.create_index("ix_book_facets_facet_count", "book_facets", ["facet", sa.text("book_count DESC")], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS book_facets")
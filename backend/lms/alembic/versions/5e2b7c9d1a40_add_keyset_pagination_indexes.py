@@ -0,0 +1,30 @@
+"""Add - keyset pagination 복합 인덱스
+
+Revision ID: 5e2b7c9d1a40
+Revises: cf55aacbed57
+Create Date: 2025-04-10 10:12:31.402118
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e2b7c9d1a40"
+down_revision: Union[str, None] = "cf55aacbed57"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_books_created_id", "books", ["created", "id"], unique=False)
+    op.create_index("ix_authors_name_id", "authors", ["name", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_authors_name_id", table_name="authors")
+    op.drop_index("ix_books_created_id", table_name="books")
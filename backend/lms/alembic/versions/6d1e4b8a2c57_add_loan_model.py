@@ -0,0 +1,40 @@
+"""Add - Loan model (도서 대출/반납 기록)
+
+Revision ID: 6d1e4b8a2c57
+Revises: 3f9a7c2e5b18
+Create Date: 2025-04-15 14:03:12.274906
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6d1e4b8a2c57"
+down_revision: Union[str, None] = "3f9a7c2e5b18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "loans",
+        sa.Column("book_id", sa.String(length=36), nullable=False),
+        sa.Column("borrower", sa.String(length=255), nullable=True),
+        sa.Column("returned", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("modified", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.ForeignKeyConstraint(["book_id"], ["books.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_loans_book_id"), "loans", ["book_id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_loans_book_id"), table_name="loans")
+    op.drop_table("loans")
@@ -0,0 +1,46 @@
+"""Add - pg_trgm GIN 인덱스 (books.title, authors.name)
+
+Revision ID: 8c41d0e6f3b2
+Revises: 5e2b7c9d1a40
+Create Date: 2025-04-10 15:47:02.918264
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8c41d0e6f3b2"
+down_revision: Union[str, None] = "5e2b7c9d1a40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_books_title_trgm",
+        "books",
+        ["title"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_authors_name_trgm",
+        "authors",
+        ["name"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_authors_name_trgm", table_name="authors")
+    op.drop_index("ix_books_title_trgm", table_name="books")
+    # pg_trgm 확장은 다른 객체가 사용할 수 있으므로 유지
@@ -0,0 +1,101 @@
+"""Add - authors.book_count (books 트리거로 유지) 및 인기순 정렬 인덱스
+
+Revision ID: 9a3c5e7f1b24
+Revises: 6d1e4b8a2c57
+Create Date: 2025-04-16 11:37:45.618230
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9a3c5e7f1b24"
+down_revision: Union[str, None] = "6d1e4b8a2c57"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# INSERT/DELETE는 문장 단위 트리거 - 대량 등록(bulk, COPY 가져오기)도 저자별로 한 번만 갱신
+# 저자 row는 id 순으로 잠가서 동시에 실행되는 대량 쓰기 간의 교착 상태를 피함
+SYNC_AUTHOR_BOOK_COUNT = """
+CREATE OR REPLACE FUNCTION sync_author_book_count() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM 1 FROM authors WHERE id IN (SELECT author_id FROM new_books) ORDER BY id FOR NO KEY UPDATE;
+        UPDATE authors a SET book_count = a.book_count + d.n
+        FROM (SELECT author_id, count(*) AS n FROM new_books GROUP BY author_id) d
+        WHERE a.id = d.author_id;
+    ELSE
+        PERFORM 1 FROM authors WHERE id IN (SELECT author_id FROM old_books) ORDER BY id FOR NO KEY UPDATE;
+        UPDATE authors a SET book_count = a.book_count - d.n
+        FROM (SELECT author_id, count(*) AS n FROM old_books GROUP BY author_id) d
+        WHERE a.id = d.author_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# UPDATE는 저자가 바뀐 row에만 실행되는 row 트리거 - 재고 변경(대출/반납) 등 다른 수정에는 비용 없음
+MOVE_AUTHOR_BOOK_COUNT = """
+CREATE OR REPLACE FUNCTION move_author_book_count() RETURNS trigger AS $$
+BEGIN
+    UPDATE authors SET book_count = book_count - 1 WHERE id = OLD.author_id;
+    UPDATE authors SET book_count = book_count + 1 WHERE id = NEW.author_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+TRIGGERS = [
+    """
+    CREATE TRIGGER books_author_book_count_insert AFTER INSERT ON books
+    REFERENCING NEW TABLE AS new_books
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_author_book_count()
+    """,
+    """
+    CREATE TRIGGER books_author_book_count_delete AFTER DELETE ON books
+    REFERENCING OLD TABLE AS old_books
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_author_book_count()
+    """,
+    """
+    CREATE TRIGGER books_author_book_count_update AFTER UPDATE OF author_id ON books
+    FOR EACH ROW WHEN (OLD.author_id IS DISTINCT FROM NEW.author_id)
+    EXECUTE FUNCTION move_author_book_count()
+    """,
+]
+
+BACKFILL = """
+UPDATE authors a SET book_count = c.n
+FROM (SELECT author_id, count(*) AS n FROM books GROUP BY author_id) c
+WHERE a.id = c.author_id
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("authors", sa.Column("book_count", sa.Integer(), server_default=sa.text("0"), nullable=False))
+
+    # 트리거 생성과 채우기 사이에 도서 쓰기가 끼어들지 않도록 잠금 (트랜잭션 종료 시 해제)
+    op.execute("LOCK TABLE books IN SHARE MODE")
+    op.execute(SYNC_AUTHOR_BOOK_COUNT)
+    op.execute(MOVE_AUTHOR_BOOK_COUNT)
+    for trigger in TRIGGERS:
+        op.execute(trigger)
+    op.execute(BACKFILL)
+
+    # 인기순(book_count DESC, id DESC) keyset pagination
+    op.create_index("ix_authors_book_count_id", "authors", ["book_count", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_authors_book_count_id", table_name="authors")
+    for name in ("insert", "delete", "update"):
+        op.execute(f"DROP TRIGGER IF EXISTS books_author_book_count_{name} ON books")
+    op.execute("DROP FUNCTION IF EXISTS move_author_book_count()")
+    op.execute("DROP FUNCTION IF EXISTS sync_author_book_count()")
+    op.drop_column("authors", "book_count")
@@ -0,0 +1,33 @@
+"""Add - 저자 자동완성 접두어 인덱스 (lower(name) text_pattern_ops)
+
+Revision ID: b2d8f4a6c913
+Revises: 9a3c5e7f1b24
+Create Date: 2025-04-17 09:48:26.771350
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b2d8f4a6c913"
+down_revision: Union[str, None] = "9a3c5e7f1b24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_authors_name_prefix",
+        "authors",
+        [sa.text("lower(name) text_pattern_ops")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_authors_name_prefix", table_name="authors")
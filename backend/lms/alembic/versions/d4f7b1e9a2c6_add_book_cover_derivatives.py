@@ -0,0 +1,30 @@
+"""Add - 도서 표지 파생 이미지 (books.cover_derivatives)
+
+Revision ID: d4f7b1e9a2c6
+Revises: b2d8f4a6c913
+Create Date: 2025-04-18 10:12:47.305218
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "d4f7b1e9a2c6"
+down_revision: Union[str, None] = "b2d8f4a6c913"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # nullable 컬럼 추가는 테이블을 다시 쓰지 않음 - 기존 표지는 backfill-covers 명령으로 생성
+    op.add_column("books", sa.Column("cover_derivatives", postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("books", "cover_derivatives")
@@ -1,12 +1,28 @@
 from datetime import datetime
-from typing import List, Optional
+from enum import Enum
+from typing import List, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from lms.api.authors.model import Author
-from lms.deps import SessionDep
-from lms.util.utils import PaginationParams, paginate
+from lms.api.authors.suggest import (
+    SUGGEST_MAX_LIMIT,
+    author_suggest_index,
+    suggest_authors,
+)
+from lms.api.books.cache import invalidate_author
+from lms.deps import ReadSessionDep, SessionDep
+from lms.util.utils import (
+    LOOKUP_MAX_KEYS,
+    NEXT_CURSOR_HEADER,
+    Lookup,
+    Paginated,
+    PaginationParams,
+    keyed_lookup,
+    paginate,
+)
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import ARRAY, String, any_, bindparam, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(prefix="/api/authors", tags=["authors"])
 
@@ -33,22 +49,67 @@ class AuthorResponse(AuthorBase):
         from_attributes = True
 
 
+class AuthorDetailResponse(AuthorResponse):
+    """
+    저자 API 응답 - 저자의 도서 수 포함
+
+    도서 응답에 포함되는 AuthorResponse에는 넣지 않음 (도서 등록/삭제마다 바뀌는 값이 도서 캐시에 남지 않도록)
+    """
+
+    book_count: int = 0
+
+
+class AuthorSummaryResponse(BaseModel):
+    """도서 목록 요약 응답에 포함되는 저자 정보 (description 제외)"""
+
+    id: str
+    name: str
+    created: datetime
+    modified: datetime
+
+    class Config:
+        from_attributes = True
+
+
 ########################################################
 # Author CRUD
 ########################################################
 
 
-@router.post("/", response_model=AuthorResponse)
+@router.post("/", response_model=AuthorDetailResponse)
 async def create_author(author: AuthorCreate, session: SessionDep):
     db_author = Author(**author.model_dump())
     session.add(db_author)
     await session.commit()
     await session.refresh(db_author)
+
+    author_suggest_index.add(db_author.id, db_author.name, db_author.book_count)
     return db_author
 
 
-@router.get("/{id}", response_model=AuthorResponse)
-async def get_author(id: str, session: SessionDep):
+########################################################
+# Suggest
+# 도서 등록 폼의 저자 입력 자동완성 - 이름 접두어(한글은 자모 단위) 일치, 도서 수 많은 순
+########################################################
+
+
+class AuthorSuggestion(BaseModel):
+    id: str
+    name: str
+    book_count: int
+
+
+@router.get("/suggest", response_model=List[AuthorSuggestion])
+async def suggest_author_names(
+    session: ReadSessionDep,
+    q: str = Query(..., min_length=1, max_length=255),
+    limit: int = Query(10, ge=1, le=SUGGEST_MAX_LIMIT),
+):
+    return [suggestion._asdict() for suggestion in await suggest_authors(session, q, limit)]
+
+
+@router.get("/{id}", response_model=AuthorDetailResponse)
+async def get_author(id: str, session: ReadSessionDep):
     query = select(Author).where(Author.id == id)
     result = await session.execute(query)
     author = result.scalar_one_or_none()
@@ -58,18 +119,69 @@ async def get_author(id: str, session: SessionDep):
     return author
 
 
-@router.get("/", response_model=List[AuthorResponse])
-async def get_authors(session: SessionDep, name: Optional[str] = None, pagination: PaginationParams = Depends()):
-    query = select(Author).order_by(Author.name)
+class AuthorOrder(str, Enum):
+    name = "name"
+    # 검색어와의 trigram 유사도 순 (name 검색어가 있을 때만 적용)
+    relevance = "relevance"
+    # 도서 수 많은 순
+    popular = "popular"
+
+
+@router.get(
+    "/",
+    response_model=Union[List[AuthorDetailResponse], Paginated[AuthorDetailResponse], Lookup[AuthorDetailResponse]],
+)
+async def get_authors(
+    response: Response,
+    session: ReadSessionDep,
+    name: Optional[str] = None,
+    pagination: PaginationParams = Depends(),
+    envelope: bool = Query(False, description="true면 items와 함께 페이지 메타데이터(Paginated)를 반환"),
+    order: AuthorOrder = Query(AuthorOrder.name),
+    ids: Optional[List[str]] = Query(
+        None, description="지정하면 해당 저자들만 {id: 저자 | null} 형태(Lookup)로 반환 (?ids=a,b 또는 ?ids=a&ids=b)"
+    ),
+):
+    if ids:
+        return await _lookup_authors(session, [key for value in ids for key in value.split(",") if key])
+
+    query = select(Author)
 
     if name:
+        # trigram GIN 인덱스(ix_authors_name_trgm)로 처리
         query = query.where(Author.name.ilike(f"%{name}%"))
 
-    paginated = await paginate(session, query, pagination)
+    if order == AuthorOrder.relevance and name:
+        query = query.order_by(func.similarity(Author.name, name).desc(), Author.id)
+        paginated = await paginate(session, query, pagination)
+    elif order == AuthorOrder.popular:
+        # (book_count, id) 복합 인덱스(ix_authors_book_count_id)를 역방향으로 사용
+        query = query.order_by(Author.book_count.desc(), Author.id.desc())
+        paginated = await paginate(session, query, pagination, keyset=(Author.book_count, Author.id), descending=True)
+    else:
+        # (name, id) 복합 인덱스(ix_authors_name_id) 순서와 동일하게 정렬
+        query = query.order_by(Author.name, Author.id)
+        paginated = await paginate(session, query, pagination, keyset=(Author.name, Author.id))
+    if paginated.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = paginated.next_cursor
+    if envelope:
+        return paginated
     return paginated.items
 
 
-@router.put("/{id}", response_model=AuthorResponse)
+async def _lookup_authors(session: AsyncSession, ids: List[str]) -> dict:
+    """id 목록 전체를 = ANY(:ids) 한 번으로 조회"""
+    if len(ids) > LOOKUP_MAX_KEYS:
+        raise HTTPException(status_code=400, detail=f"Too many ids (max {LOOKUP_MAX_KEYS})")
+
+    query = select(Author).where(Author.id == any_(bindparam("ids", list(set(ids)), type_=ARRAY(String))))
+    found = {
+        author.id: AuthorDetailResponse.model_validate(author) for author in (await session.execute(query)).scalars()
+    }
+    return keyed_lookup(ids, found)
+
+
+@router.put("/{id}", response_model=AuthorDetailResponse)
 async def update_author(id: str, author_update: AuthorCreate, session: SessionDep):
     query = select(Author).where(Author.id == id)
     result = await session.execute(query)
@@ -85,6 +197,9 @@ async def update_author(id: str, author_update: AuthorCreate, session: SessionDe
 
     await session.commit()
     await session.refresh(db_author)
+
+    await invalidate_author(db_author.id)
+    author_suggest_index.add(db_author.id, db_author.name, db_author.book_count)
     return db_author
 
 
@@ -99,4 +214,6 @@ async def delete_author(id: str, session: SessionDep):
 
     await session.delete(db_author)
     await session.commit()
+
+    author_suggest_index.remove(id)
     return {"message": "Author deleted successfully"}
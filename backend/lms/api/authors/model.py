@@ -1,11 +1,27 @@
 from lms.base.model import IdBase, TimestampedMixin
-from sqlalchemy import String, Text
+from sqlalchemy import Index, Integer, String, Text, column, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 
 class Author(TimestampedMixin, IdBase):
     __tablename__ = "authors"
+    __table_args__ = (
+        # 목록 keyset pagination (name, id)
+        Index("ix_authors_name_id", "name", "id"),
+        # ILIKE '%x%' 검색 및 similarity 정렬 (pg_trgm)
+        Index("ix_authors_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        # 인기순 keyset pagination (book_count DESC, id DESC)
+        Index("ix_authors_book_count_id", "book_count", "id"),
+        # 자동완성 접두어 검색 lower(name) LIKE 'q%' (text_pattern_ops - 로케일과 관계없이 LIKE 접두어에 사용 가능)
+        Index(
+            "ix_authors_name_prefix",
+            func.lower(column("name")).label("name_lower"),
+            postgresql_ops={"name_lower": "text_pattern_ops"},
+        ),
+    )
 
     name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     description: Mapped[str] = mapped_column(Text, nullable=True)
+    # 저자의 도서 수 - books 테이블 트리거로 유지하므로 애플리케이션에서 직접 수정하지 않음
+    book_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
     books = relationship("Book", back_populates="author_rel")
@@ -0,0 +1,272 @@
+import asyncio
+import heapq
+import logging
+import time
+import unicodedata
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from lms.api.authors.model import Author
+from lms.database import read_session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# 전체 재구성 주기(초) - book_count는 books 트리거로 바뀌므로 재구성 시 반영
+SUGGEST_REBUILD_INTERVAL = 300
+SUGGEST_MAX_LIMIT = 20
+
+########################################################
+# 정규화 (한글 자모 분해)
+########################################################
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ["", *"ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"]
+
+# 겹받침/이중 모음은 입력 순서대로 분해 - 입력 중인 "닭"(ㄷㅏㄹㄱ)이 "달걀"(ㄷㅏㄹㄱㅕㄹ)의 접두어가 되도록
+COMPOUND_JAMO = {
+    "ㄳ": "ㄱㅅ",
+    "ㄵ": "ㄴㅈ",
+    "ㄶ": "ㄴㅎ",
+    "ㄺ": "ㄹㄱ",
+    "ㄻ": "ㄹㅁ",
+    "ㄼ": "ㄹㅂ",
+    "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ",
+    "ㄿ": "ㄹㅍ",
+    "ㅀ": "ㄹㅎ",
+    "ㅄ": "ㅂㅅ",
+    "ㅘ": "ㅗㅏ",
+    "ㅙ": "ㅗㅐ",
+    "ㅚ": "ㅗㅣ",
+    "ㅝ": "ㅜㅓ",
+    "ㅞ": "ㅜㅔ",
+    "ㅟ": "ㅜㅣ",
+    "ㅢ": "ㅡㅣ",
+}
+
+
+def normalize_name(value: str) -> str:
+    """
+    자동완성 키 - 소문자, 공백 제거, 한글 음절은 자모 단위로 분해
+
+    "김", "김ㅊ", "김처" 처럼 조합 중인 입력도 "김철수"의 접두어가 됨
+    """
+    value = unicodedata.normalize("NFC", value).lower()
+    jamo = []
+    for char in value:
+        if char.isspace():
+            continue
+        code = ord(char)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            index = code - HANGUL_BASE
+            char = CHOSEONG[index // 588] + JUNGSEONG[index % 588 // 28] + JONGSEONG[index % 28]
+        jamo.append("".join(COMPOUND_JAMO.get(c, c) for c in char))
+    return "".join(jamo)
+
+
+########################################################
+# Trie
+########################################################
+
+
+class Suggestion(NamedTuple):
+    id: str
+    name: str
+    book_count: int
+
+
+def _rank(suggestion: Suggestion):
+    # 도서 수 많은 순, 같으면 이름 순
+    return (-suggestion.book_count, suggestion.name, suggestion.id)
+
+
+class _Node:
+    __slots__ = ("children", "authors", "top")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        # 이 노드에서 끝나는 키의 저자 (동명이인)
+        self.authors: Dict[str, Suggestion] = {}
+        # 하위 트리의 상위 SUGGEST_MAX_LIMIT명 - 쓰기 시 경로의 캐시를 지우고 다음 조회 때 다시 계산
+        self.top: Optional[List[Suggestion]] = None
+
+
+class AuthorSuggestIndex:
+    """
+    정규화된 저자 이름의 프로세스 내 trie
+
+    - 주기적으로(SUGGEST_REBUILD_INTERVAL) DB에서 전체 재구성, 저자 API 쓰기는 즉시 반영
+    - 재구성 중의 쓰기는 기록해 두었다가 새 trie에 다시 적용한 뒤 교체 (조회 시점 이후의 쓰기가 사라지지 않도록)
+    - 아직 구성되지 않았으면 None을 반환하고 호출 측에서 DB 접두어 검색으로 처리
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        self._keys: Dict[str, str] = {}
+        self._built_at: Optional[float] = None
+        self._rebuilding: Optional[asyncio.Task] = None
+        # 진행 중인 재구성마다 그동안의 쓰기 (("add", id, name, book_count) 또는 ("remove", id))
+        self._pending_writes: List[List[tuple]] = []
+
+    def __len__(self):
+        return len(self._keys)
+
+    @property
+    def ready(self) -> bool:
+        return self._built_at is not None
+
+    def _path(self, key: str, create: bool = False) -> List[_Node]:
+        nodes = [self._root]
+        for char in key:
+            node = nodes[-1].children.get(char)
+            if node is None:
+                if not create:
+                    return []
+                node = nodes[-1].children[char] = _Node()
+            nodes.append(node)
+        return nodes
+
+    def add(self, author_id: str, name: str, book_count: int = 0):
+        """저자 추가 또는 이름/도서 수 갱신"""
+        for writes in self._pending_writes:
+            writes.append(("add", author_id, name, book_count))
+        self._add(author_id, name, book_count)
+
+    def remove(self, author_id: str):
+        for writes in self._pending_writes:
+            writes.append(("remove", author_id))
+        self._remove(author_id)
+
+    def _add(self, author_id: str, name: str, book_count: int):
+        self._remove(author_id)
+        key = normalize_name(name)
+        nodes = self._path(key, create=True)
+        nodes[-1].authors[author_id] = Suggestion(author_id, name, book_count)
+        self._keys[author_id] = key
+        for node in nodes:
+            node.top = None
+
+    def _remove(self, author_id: str):
+        key = self._keys.pop(author_id, None)
+        if key is None:
+            return
+        nodes = self._path(key)
+        nodes[-1].authors.pop(author_id, None)
+        for node in nodes:
+            node.top = None
+        # 빈 가지 정리
+        for parent, char, node in reversed(list(zip(nodes, key, nodes[1:]))):
+            if node.children or node.authors:
+                break
+            del parent.children[char]
+
+    def _top(self, node: _Node) -> List[Suggestion]:
+        """
+        하위 트리의 상위 N명 - 자식 노드의 상위 N명을 합쳐서 계산 (캐시가 지워진 노드만 다시 계산)
+
+        쓰기 후에는 변경된 키의 경로만 다시 계산하므로 짧은 접두어("ㄱ")도 하위 트리 전체를 순회하지 않음
+        """
+        stack = [(node, False)]
+        while stack:
+            current, expanded = stack.pop()
+            if current.top is not None:
+                continue
+            if not expanded:
+                stack.append((current, True))
+                stack.extend((child, False) for child in current.children.values() if child.top is None)
+                continue
+            candidates = list(current.authors.values())
+            for child in current.children.values():
+                candidates.extend(child.top)
+            current.top = heapq.nsmallest(SUGGEST_MAX_LIMIT, candidates, key=_rank)
+        return node.top
+
+    def suggest(self, query: str, limit: int) -> Optional[List[Suggestion]]:
+        if not self.ready:
+            return None
+        key = normalize_name(query)
+        nodes = self._path(key)
+        if not key or not nodes:
+            return []
+        return self._top(nodes[-1])[:limit]
+
+    ########################################################
+    # 재구성
+    ########################################################
+
+    def build(self, rows: Iterable[Tuple[str, str, int]]):
+        """(id, name, book_count) 목록으로 구성하고 모든 노드의 상위 N명을 미리 계산"""
+        for author_id, name, book_count in rows:
+            self.add(author_id, name, book_count)
+        self._top(self._root)
+
+    async def rebuild(self):
+        """
+        DB의 전체 저자로 새 trie를 만들어서 교체 (조회는 교체 전까지 기존 trie 사용)
+
+        조회를 시작하기 전부터의 쓰기를 기록해서 교체 직전에 새 trie에 순서대로 다시 적용
+        (조회 결과에 이미 반영된 쓰기를 다시 적용해도 결과는 같음)
+        """
+        writes = []
+        self._pending_writes.append(writes)
+        try:
+            async with read_session() as session:
+                rows = (await session.execute(select(Author.id, Author.name, Author.book_count))).all()
+            # 저자 수만큼 CPU를 쓰므로 이벤트 루프를 막지 않도록 스레드에서 구성
+            index = AuthorSuggestIndex()
+            await run_in_threadpool(index.build, rows)
+            # 이벤트 루프에서 교체까지 await 없이 실행하므로 그 사이에 들어오는 쓰기는 없음
+            for write in writes:
+                if write[0] == "add":
+                    index._add(*write[1:])
+                else:
+                    index._remove(*write[1:])
+        finally:
+            self._pending_writes.remove(writes)
+        self._root, self._keys = index._root, index._keys
+        self._built_at = time.monotonic()
+        logger.info(f"저자 자동완성 인덱스 재구성 완료: {len(self._keys)}명")
+
+    async def _rebuild_in_background(self):
+        try:
+            await self.rebuild()
+        except Exception as e:
+            logger.error(f"저자 자동완성 인덱스 재구성 오류: {str(e)}")
+
+    def refresh_if_stale(self):
+        """처음이거나 재구성 주기가 지났으면 백그라운드에서 재구성 (요청은 기다리지 않음)"""
+        stale = self._built_at is None or time.monotonic() - self._built_at > SUGGEST_REBUILD_INTERVAL
+        if stale and (self._rebuilding is None or self._rebuilding.done()):
+            self._rebuilding = asyncio.get_running_loop().create_task(self._rebuild_in_background())
+
+
+author_suggest_index = AuthorSuggestIndex()
+
+
+def prefix_query(q: str, limit: int):
+    """
+    trie가 아직 없을 때 사용하는 DB 접두어 검색
+
+    lower(name) LIKE 'q%' - text_pattern_ops 인덱스(ix_authors_name_prefix)로 처리 (자모 단위 접두어는 지원하지 않음)
+    """
+    pattern = q.strip().lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    return (
+        select(Author.id, Author.name, Author.book_count)
+        .where(func.lower(Author.name).like(pattern, escape="\\"))
+        .order_by(Author.book_count.desc(), Author.name, Author.id)
+        .limit(limit)
+    )
+
+
+async def suggest_authors(session: AsyncSession, q: str, limit: int) -> List[Suggestion]:
+    author_suggest_index.refresh_if_stale()
+    suggestions = author_suggest_index.suggest(q, limit)
+    if suggestions is None:
+        rows = (await session.execute(prefix_query(q, limit))).all()
+        suggestions = [Suggestion(*row) for row in rows]
+    return suggestions
@@ -1,18 +1,109 @@
+import asyncio
+import csv
+import io
+import json
+import logging
+import os
+import shutil
+import tempfile
+import uuid
 from datetime import datetime
-from typing import List, Optional
-
-from fastapi import APIRouter, Depends, HTTPException, UploadFile
-from lms.api.authors.api import AuthorResponse
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    UploadFile,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from lms.api.authors.api import AuthorResponse, AuthorSummaryResponse
 from lms.api.authors.model import Author
+from lms.api.books.cache import (
+    BOOK_LIST_PREFIX,
+    BOOK_LIST_TAG,
+    author_cache_tag,
+    book_cache_key,
+    invalidate_book,
+    invalidate_books,
+)
+from lms.api.books.derivatives import CoverDerivatives
+from lms.api.books.facets import BookFacets, fetch_book_facets
+from lms.api.books.importer import ImportFormat, ImportProgress, import_books
 from lms.api.books.model import Book
 from lms.api.books.scrap import scrape_aladin_book
-from lms.base.storage import s3_client
-from lms.broker import process_book_info_task
-from lms.deps import SessionDep
-from lms.util.utils import paginate, validate_file_type
-from pydantic import BaseModel
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload
+from lms.api.books.search import (
+    book_to_document,
+    delete_book_document,
+    index_book_document,
+    index_books_by_id,
+    search_books,
+)
+from lms.api.loans.model import Loan
+from lms.base.cache import cache, make_cache_key
+from lms.base.model import generate_id
+from lms.base.storage import storage
+from lms.broker import (
+    get_redis_client,
+    process_book_info_task,
+    schedule_cover_derivatives,
+    schedule_facets_refresh,
+)
+from lms.config import settings
+from lms.database import engine, is_pinned_session, is_replica_session, read_session
+from lms.deps import ReadSessionDep, SessionDep
+from lms.util.utils import (
+    LOOKUP_MAX_KEYS,
+    NEXT_CURSOR_HEADER,
+    FastJSONResponse,
+    Lookup,
+    Paginated,
+    PaginationParams,
+    TotalMode,
+    db_error_info,
+    db_error_reason,
+    has_conditional_headers,
+    is_not_modified,
+    isbn13_to_isbn10,
+    json_dumps,
+    keyed_lookup,
+    make_etag,
+    normalize_isbn,
+    not_modified_response,
+    page_query,
+    paginate,
+    raw_json_response,
+    to_aware_datetime,
+    validate_file_type,
+    validator_headers,
+)
+from pydantic import BaseModel, Field
+from sqlalchemy import (
+    ARRAY,
+    Row,
+    String,
+    any_,
+    bindparam,
+    delete,
+    exists,
+    func,
+    insert,
+    literal_column,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, contains_eager, defer, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/books", tags=["books"])
 
@@ -63,19 +154,71 @@ class BookResponse(BookBase):
     created: datetime
     modified: datetime
     cover_image: str
+    # 목록/카드용 썸네일 - 워커가 생성하기 전이거나 표지가 없으면 null (cover_image 사용)
+    cover_derivatives: Optional[CoverDerivatives] = None
 
     class Config:
         from_attributes = True
 
 
-########################################################
-# Common
-########################################################
+class BookSummaryResponse(BaseModel):
+    """목록용 요약 응답 - 긴 본문(description/table_of_contents/introduction) 제외"""
+
+    id: str
+    book_manage_id: str
+    title: str
+    isbn: str
+    price: Optional[float] = None
+    quantity: int = 0
+    page_count: Optional[int] = None
+    dimensions: Optional[str] = None
+    weight: Optional[float] = None
+    publisher_image: Optional[str] = None
+    author_id: str
+    author: AuthorSummaryResponse
+    created: datetime
+    modified: datetime
+    cover_image: str
+    # 목록/카드용 썸네일 - 워커가 생성하기 전이거나 표지가 없으면 null (cover_image 사용)
+    cover_derivatives: Optional[CoverDerivatives] = None
 
+    class Config:
+        from_attributes = True
 
-class Pagination(BaseModel):
-    page: int = 1
-    size: int = 10
+
+class BookFields(str, Enum):
+    full = "full"
+    summary = "summary"
+
+
+def serialize_book(book: Book, schema=BookResponse) -> Dict[str, Any]:
+    """BookResponse(또는 BookSummaryResponse) 형태의 JSON 호환 dict (캐시 저장용)"""
+    book.author = book.author_rel
+    return schema.model_validate(book).model_dump(mode="json")
+
+
+# 응답 스키마별 (필드 순서, 저자 필드) - 스키마 정의에서 한 번만 계산
+_BOOK_DICT_FIELDS = {
+    schema: (list(schema.model_fields), list(schema.model_fields["author"].annotation.model_fields))
+    for schema in (BookResponse, BookSummaryResponse)
+}
+
+
+def book_to_dict(book: Book, schema=BookResponse) -> Dict[str, Any]:
+    """
+    목록용 빠른 변환 - 항목마다 pydantic 검증을 거치지 않고 스키마 필드를 ORM 객체에서 바로 복사
+
+    값은 DB 컬럼 타입 그대로(datetime 등)이므로 json_dumps로 인코딩하면 serialize_book과 같은 JSON
+    """
+    fields, author_fields = _BOOK_DICT_FIELDS[schema]
+    item = {}
+    for name in fields:
+        if name == "author":
+            author = book.author_rel
+            item[name] = {field: getattr(author, field) for field in author_fields}
+        else:
+            item[name] = getattr(book, name)
+    return item
 
 
 ########################################################
@@ -89,19 +232,286 @@ class BookFilter(BaseModel):
     title: Optional[str] = None
 
 
-@router.get("/", response_model=List[BookResponse])
-async def get_books(session: SessionDep, filter: BookFilter = Depends(), pagination: Pagination = Depends()):
-    query = select(Book).options(joinedload(Book.author_rel)).order_by(Book.created.desc())
+class BookOrder(str, Enum):
+    latest = "latest"
+    # 검색어와의 trigram 유사도 순 (author_name/title 검색어가 있을 때만 적용)
+    relevance = "relevance"
 
+
+def _books_query(filter: BookFilter, order: BookOrder):
+    """
+    목록 조회 쿼리와 keyset 정보 (query, keyset, descending)
+
+    저자는 inner join 하나로 필터, 응답(contains_eager), ETag probe에 함께 사용
+    """
+    query = select(Book).join(Book.author_rel)
+
+    # ILIKE '%x%' 조건은 trigram GIN 인덱스(ix_books_title_trgm, ix_authors_name_trgm)로 처리
+    scores = []
     if filter.author_name:
-        query = query.join(Author).where(Author.name.ilike(f"%{filter.author_name}%"))
+        query = query.where(Author.name.ilike(f"%{filter.author_name}%"))
+        scores.append(func.similarity(Author.name, filter.author_name))
     if filter.title:
         query = query.where(Book.title.ilike(f"%{filter.title}%"))
+        scores.append(func.similarity(Book.title, filter.title))
+
+    if order == BookOrder.relevance and scores:
+        relevance = scores[0]
+        for score in scores[1:]:
+            relevance = relevance + score
+        # 유사도 정렬은 keyset을 만들 수 없으므로 page 방식으로만 조회
+        return query.order_by(relevance.desc(), Book.id), None, False
+
+    # (created, id) 복합 인덱스(ix_books_created_id) 순서와 동일하게 정렬
+    return query.order_by(Book.created.desc(), Book.id.desc()), (Book.created, Book.id), True
+
+
+def _book_list_etag(cache_key: str, rows: Sequence[Tuple[Any, Any, Any]], has_more: bool, total=None) -> str:
+    """목록 ETag - 조회 조건 + 페이지에 포함된 (id, modified, author.modified)"""
+    parts = [cache_key, has_more, total]
+    for book_id, modified, author_modified in rows:
+        parts += [book_id, to_aware_datetime(modified), to_aware_datetime(author_modified)]
+    return make_etag(*parts)
+
+
+# summary 목록에서 조회하지 않는 긴 본문 컬럼 (목록 응답 크기의 대부분을 차지)
+BOOK_TEXT_COLUMNS = (Book.description, Book.table_of_contents, Book.introduction)
+
+
+def _book_list_options(fields: BookFields):
+    """목록 조회 로더 옵션 - summary면 본문 컬럼을 SELECT 하지 않음"""
+    author = contains_eager(Book.author_rel)
+    if fields == BookFields.summary:
+        return [author.load_only(Author.name, Author.created, Author.modified), *map(defer, BOOK_TEXT_COLUMNS)]
+    return [author]
+
+
+@router.get(
+    "/",
+    response_model=Union[
+        List[BookResponse], Paginated[BookResponse], List[BookSummaryResponse], Paginated[BookSummaryResponse]
+    ],
+)
+async def get_books(
+    request: Request,
+    session: ReadSessionDep,
+    filter: BookFilter = Depends(),
+    pagination: PaginationParams = Depends(),
+    envelope: bool = Query(False, description="true면 items와 함께 페이지 메타데이터(Paginated)를 반환"),
+    order: BookOrder = Query(BookOrder.latest),
+    fields: BookFields = Query(BookFields.full, description="summary면 긴 본문 필드를 제외한 BookSummaryResponse"),
+):
+    cache_key = make_cache_key(
+        BOOK_LIST_PREFIX,
+        {**filter.model_dump(), **pagination.model_dump(), "envelope": envelope, "order": order, "fields": fields},
+    )
+    query, keyset, descending = _books_query(filter, order)
+
+    # 조건부 요청이면 페이지의 (id, modified)만 조회해서 변경 여부 판단
+    if pagination.total == TotalMode.none and has_conditional_headers(request):
+        probe = page_query(
+            query.with_only_columns(Book.id, Book.modified, Author.modified), pagination, keyset, descending
+        )
+        rows = (await session.execute(probe)).all()
+        etag = _book_list_etag(cache_key, rows[: pagination.size], len(rows) > pagination.size)
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+
+    cached = None if is_pinned_session(session) else await cache.get(cache_key)
+    if cached is None:
+        fill = await cache.begin_fill(cache_key, [BOOK_LIST_TAG], replica=is_replica_session(session))
+        paginated = await paginate(
+            session, query.options(*_book_list_options(fields)), pagination, keyset=keyset, descending=descending
+        )
+        schema = BookSummaryResponse if fields == BookFields.summary else BookResponse
+        items = [book_to_dict(book, schema) for book in paginated.items]
+        body = {**paginated.model_dump(mode="json", exclude={"items"}), "items": items} if envelope else items
+        rows = [(book.id, book.modified, book.author_rel.modified) for book in paginated.items]
+        cached = {
+            # 인코딩된 본문을 캐시해서 캐시 적중 시에는 직렬화 없이 그대로 응답
+            "body": json_dumps(body).decode(),
+            "next_cursor": paginated.next_cursor,
+            "etag": _book_list_etag(cache_key, rows, paginated.has_more, paginated.total),
+        }
+        await cache.set(cache_key, cached, tags=[BOOK_LIST_TAG], fill=fill)
+
+    headers = validator_headers(cached["etag"])
+    if cached["next_cursor"]:
+        headers[NEXT_CURSOR_HEADER] = cached["next_cursor"]
+    return raw_json_response(cached["body"], headers)
+
+
+########################################################
+# Search
+# 형태소(nori) 기반 도서 검색 - OpenSearch
+########################################################
 
-    paginated = await paginate(session, query, pagination)
-    for book in paginated.items:
-        book.author = book.author_rel
-    return paginated.items
+
+class BookSearchHit(BaseModel):
+    id: str
+    book_manage_id: str
+    title: str
+    isbn: str
+    author_id: str
+    author_name: str
+    cover_image: str
+    price: Optional[float] = None
+    score: float
+    highlight: Dict[str, List[str]] = {}
+
+
+class BookSearchResponse(BaseModel):
+    total: int
+    page: int
+    size: int
+    took: int
+    items: List[BookSearchHit]
+
+
+@router.get("/search", response_model=BookSearchResponse)
+async def search(
+    q: str = Query(..., min_length=1),
+    author_name: Optional[str] = None,
+    page: int = Query(1, ge=1),
+    size: int = Query(settings.PAGINATION_SIZE, ge=1, le=100),
+):
+    """
+    제목/저자/설명/소개/목차 통합 검색 (관련도 순, 하이라이트 포함)
+    """
+    try:
+        result = await search_books(q, author_name=author_name, page=page, size=size)
+    except Exception:
+        raise HTTPException(status_code=503, detail="Search service unavailable")
+    return BookSearchResponse(page=page, size=size, **result)
+
+
+########################################################
+# Export
+# 전체 카탈로그 내보내기 (NDJSON/CSV 스트리밍)
+########################################################
+# 서버 측 cursor에서 한 번에 가져오는 행 수이자 응답에 한 번에 쓰는 행 수
+EXPORT_CHUNK_ROWS = 1000
+
+EXPORT_COLUMNS = (
+    Book.id,
+    Book.book_manage_id,
+    Book.isbn,
+    Book.title,
+    Book.author_id,
+    Author.name.label("author_name"),
+    Book.description,
+    Book.price,
+    Book.quantity,
+    Book.page_count,
+    Book.dimensions,
+    Book.weight,
+    Book.table_of_contents,
+    Book.introduction,
+    Book.publisher_image,
+    Book._cover_image.label("cover_image"),
+    Book.created,
+    Book.modified,
+)
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv; charset=utf-8",
+}
+
+
+def _export_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+async def _export_chunks(rows: AsyncIterator[Any], format: ExportFormat) -> AsyncIterator[str]:
+    """행을 EXPORT_CHUNK_ROWS 단위의 NDJSON/CSV 문자열 조각으로 변환"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if format == ExportFormat.csv else None
+    if writer:
+        # 엑셀에서 한글이 깨지지 않도록 UTF-8 BOM
+        buffer.write("\ufeff")
+        writer.writerow(EXPORT_FIELDS)
+
+    count = 0
+    async for row in rows:
+        values = [_export_value(value) for value in row]
+        if writer:
+            writer.writerow(values)
+        else:
+            buffer.write(json.dumps(dict(zip(EXPORT_FIELDS, values)), ensure_ascii=False))
+            buffer.write("\n")
+
+        count += 1
+        if count % EXPORT_CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+async def _stream_export(query, format: ExportFormat) -> AsyncIterator[str]:
+    """
+    서버 측 cursor(session.stream)로 조회하면서 바로 응답에 기록
+
+    요청 의존성(SessionDep)은 StreamingResponse 전송 전에 정리되므로 응답이 끝날 때까지 유지되는 별도 세션 사용
+    """
+    async with read_session() as session:
+        result = await session.stream(query.execution_options(yield_per=EXPORT_CHUNK_ROWS))
+        try:
+            async for chunk in _export_chunks(result, format):
+                yield chunk
+        except Exception as e:
+            # 이미 200 응답을 보내기 시작했으므로 연결을 끊어서 클라이언트가 잘린 파일임을 알 수 있게 함
+            logger.error(f"도서 내보내기 오류: {str(e)}")
+            raise
+        finally:
+            await result.close()
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_books(
+    filter: BookFilter = Depends(),
+    format: ExportFormat = Query(ExportFormat.ndjson),
+):
+    """
+    도서 전체(필터 적용) 내보내기
+
+    행 수와 관계없이 EXPORT_CHUNK_ROWS 단위로만 메모리에 올림
+    """
+    query, __, __ = _books_query(filter, BookOrder.latest)
+    query = query.with_only_columns(*EXPORT_COLUMNS)
+
+    filename = f"books_{datetime.now().strftime('%Y%m%d%H%M%S')}.{format.value}"
+    return StreamingResponse(
+        _stream_export(query, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+########################################################
+# Facets
+# 저자별/가격대/쪽수 구간 도서 수와 재고 - book_facets materialized view에서 조회
+########################################################
+
+
+@router.get("/facets", response_model=BookFacets)
+async def get_book_facets(session: ReadSessionDep, author_limit: int = Query(20, ge=1, le=100)):
+    """
+    탐색 화면용 집계
+
+    view는 5분마다, 그리고 대량 등록/가져오기 후 갱신되므로 refreshed_at/stale_seconds로 반영 시점을 확인
+    """
+    return await fetch_book_facets(session, author_limit)
 
 
 ########################################################
@@ -110,17 +520,165 @@ async def get_books(session: SessionDep, filter: BookFilter = Depends(), paginat
 ########################################################
 
 
+def _book_validators(book_id: str, modified, author_modified):
+    """상세 응답의 (ETag, Last-Modified) - 응답에 저자 정보가 포함되므로 저자 수정 시각도 반영"""
+    modified, author_modified = to_aware_datetime(modified), to_aware_datetime(author_modified)
+    return make_etag(book_id, modified, author_modified), max(modified, author_modified)
+
+
 @router.get("/{id}", response_model=BookResponse)
-async def get_book(id: str, session: SessionDep):
-    query = select(Book).options(joinedload(Book.author_rel)).where(Book.book_manage_id == id)
-    result = await session.execute(query)
-    book = result.scalar_one_or_none()
+async def get_book(id: str, request: Request, session: ReadSessionDep):
+    # 조건부 요청이면 전체 row 대신 modified만 조회해서 변경 여부 판단
+    if has_conditional_headers(request):
+        probe = (
+            select(Book.id, Book.modified, Author.modified)
+            .join(Author, Author.id == Book.author_id)
+            .where(Book.book_manage_id == id)
+        )
+        row = (await session.execute(probe)).one_or_none()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Book not found")
+        etag, last_modified = _book_validators(*row)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+
+    cache_key = book_cache_key(id)
+    content = None if is_pinned_session(session) else await cache.get(cache_key)
+    if content is None:
+        fill = await cache.begin_fill(cache_key, replica=is_replica_session(session))
+        query = select(Book).options(joinedload(Book.author_rel)).where(Book.book_manage_id == id)
+        result = await session.execute(query)
+        book = result.scalar_one_or_none()
+
+        if not book:
+            raise HTTPException(status_code=404, detail="Book not found")
+
+        content = serialize_book(book)
+        await cache.set(cache_key, content, tags=[author_cache_tag(book.author_id)], fill=fill)
+
+    etag, last_modified = _book_validators(content["id"], content["modified"], content["author"]["modified"])
+    return FastJSONResponse(content=content, headers=validator_headers(etag, last_modified))
 
-    if not book:
-        raise HTTPException(status_code=404, detail="Book not found")
+
+########################################################
+# Lookup
+# 키 목록(id / 관리번호 / ISBN)으로 한 번에 조회 - 대출 데스크 스캐너, 대사 작업용
+########################################################
+
+
+class BookLookupKey(str, Enum):
+    id = "id"
+    book_manage_id = "book_manage_id"
+    # ISBN-10은 ISBN-13으로 변환해서 조회
+    isbn = "isbn"
+
+
+BOOK_LOOKUP_COLUMNS = {
+    BookLookupKey.id: Book.id,
+    BookLookupKey.book_manage_id: Book.book_manage_id,
+    BookLookupKey.isbn: Book.isbn,
+}
+
+
+class BookLookupRequest(BaseModel):
+    by: BookLookupKey = BookLookupKey.isbn
+    keys: List[str] = Field(..., min_length=1, max_length=LOOKUP_MAX_KEYS)
+    fields: BookFields = BookFields.full
+
+
+@router.post("/lookup", response_model=Union[Lookup[BookResponse], Lookup[BookSummaryResponse]])
+async def lookup_books(lookup: BookLookupRequest, session: ReadSessionDep):
+    """
+    {"items": {입력 키: 도서 | null}, "missing": [찾지 못한 입력 키]}
+
+    키 목록 전체를 = ANY(:keys) 한 번으로 조회
+    """
+    by_isbn = lookup.by == BookLookupKey.isbn
+    if by_isbn:
+        # 저장된 ISBN은 정규화되어 있지 않고 쓰기 시 체크 숫자도 확인하지 않으므로 (ISBN-10, 하이픈 포함 등)
+        # 입력 값 그대로와, 유효한 ISBN이면 ISBN-13, ISBN-10 표기까지 모두 조회
+        isbns = {key: normalize_isbn(key) for key in lookup.keys}
+        values = set()
+        for key, isbn in isbns.items():
+            values.update(value for value in (key.strip(), isbn, isbn and isbn13_to_isbn10(isbn)) if value)
     else:
-        book.author = book.author_rel
-    return book
+        values = set(lookup.keys)
+
+    column = BOOK_LOOKUP_COLUMNS[lookup.by]
+    schema = BookSummaryResponse if lookup.fields == BookFields.summary else BookResponse
+    found = {}
+    normalized_found = {}
+    if values:
+        query = (
+            select(Book)
+            .join(Book.author_rel)
+            .options(*_book_list_options(lookup.fields))
+            .where(column == any_(bindparam("keys", list(values), type_=ARRAY(String))))
+        )
+        for book in (await session.execute(query)).scalars():
+            value = getattr(book, column.key)
+            found[value] = book_to_dict(book, schema)
+            if by_isbn and (isbn := normalize_isbn(value)):
+                # 같은 ISBN-13이 여러 행이면 ISBN-13 그대로 저장된 행 우선
+                if value == isbn or isbn not in normalized_found:
+                    normalized_found[isbn] = found[value]
+
+    if by_isbn:
+        # 저장된 값과 정확히 같은 입력은 그 도서, 아니면 정규화된 ISBN-13이 같은 도서
+        found = {key: found.get(key.strip()) or normalized_found.get(isbns[key]) for key in lookup.keys}
+    return FastJSONResponse(content=keyed_lookup(lookup.keys, found))
+
+
+########################################################
+# Write
+# 생성/수정/삭제는 RETURNING 한 문장으로 처리하고, 저자 존재 여부/ISBN 중복은 제약 조건 위반으로 판단
+########################################################
+
+BOOK_CONSTRAINT_MESSAGES = {
+    "ix_books_book_manage_id": "Book manage id already exists",
+    "books_isbn_key": "ISBN already exists",
+    "books_author_id_fkey": "Author not found",
+}
+
+FOREIGN_KEY_VIOLATION = "23503"
+
+
+def _book_write_error(error: DBAPIError) -> Optional[HTTPException]:
+    """제약 조건 위반을 기존 API 응답(저자 없음 404, 중복 400)으로 변환"""
+    sqlstate, constraint = db_error_info(error)
+    if constraint not in BOOK_CONSTRAINT_MESSAGES:
+        return None
+    status_code = 404 if sqlstate == FOREIGN_KEY_VIOLATION else 400
+    return HTTPException(status_code=status_code, detail=BOOK_CONSTRAINT_MESSAGES[constraint])
+
+
+def _returning_with_author(write, *extra_columns):
+    """
+    WITH written AS (<write> RETURNING books.*) SELECT ... FROM written JOIN authors
+
+    쓰기 결과와 응답에 필요한 저자 정보를 한 번에 조회
+    """
+    written = write.returning(*Book.__table__.c, *extra_columns).cte("written")
+    book = aliased(Book, written)
+    extra = [written.c[column.name] for column in extra_columns]
+    return select(book, Author, *extra).join(Author, Author.id == book.author_id)
+
+
+async def _execute_book_write(session: AsyncSession, query) -> Optional[Row]:
+    try:
+        row = (await session.execute(query)).one_or_none()
+        await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        error = _book_write_error(e)
+        if error is None:
+            raise
+        raise error from e
+
+    if row is not None:
+        # 조회 없이 응답(book_to_dict)에서 저자 정보를 쓸 수 있도록 관계 값만 채움
+        set_committed_value(row[0], "author_rel", row[1])
+    return row
 
 
 ########################################################
@@ -129,71 +687,302 @@ async def get_book(id: str, session: SessionDep):
 
 
 @router.post("/", response_model=BookResponse)
-async def create_book(book: BookCreate, session: SessionDep):
-    # check author exists
-    author_query = select(Author).where(Author.id == book.author_id)
-    result = await session.execute(author_query)
-    author = result.scalar_one_or_none()
+async def create_book(book: BookCreate, session: SessionDep, background_tasks: BackgroundTasks):
+    # id 기본값은 CTE 안의 INSERT에는 적용되지 않으므로 직접 생성
+    query = _returning_with_author(insert(Book).values(id=generate_id(), **book.model_dump()))
+    db_book, author = await _execute_book_write(session, query)
 
-    if not author:
-        raise HTTPException(status_code=404, detail="Author not found")
+    await invalidate_book(db_book.book_manage_id)
+    background_tasks.add_task(index_book_document, db_book.id, book_to_document(db_book, author.name))
+    return book_to_dict(db_book)
 
-    # isbn 중복 체크
-    isbn_query = select(Book).where(Book.isbn == book.isbn)
-    result = await session.execute(isbn_query)
-    isbn_book = result.scalar_one_or_none()
 
-    if isbn_book:
-        raise HTTPException(status_code=400, detail="ISBN already exists")
+########################################################
+# Bulk upsert
+# 수서 시스템 카탈로그 동기화용 대량 등록/수정 (ISBN 기준)
+########################################################
+BULK_MAX_ITEMS = 5000
+# INSERT 한 문장에 넣는 행 수 (행당 바인드 파라미터 14개 - asyncpg 한도 32767 이내)
+BULK_CHUNK_SIZE = 500
+
+# ISBN 충돌 시 갱신하는 컬럼 - 관리번호(book_manage_id)는 기존 값 유지
+BULK_UPDATE_COLUMNS = [name for name in BookCreate.model_fields if name not in ("isbn", "book_manage_id")]
+
+
+class BulkItemStatus(str, Enum):
+    created = "created"
+    updated = "updated"
+    failed = "failed"
+
+
+class BookBulkRequest(BaseModel):
+    items: List[BookCreate] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class BookBulkItemResult(BaseModel):
+    index: int
+    isbn: str
+    status: BulkItemStatus
+    id: Optional[str] = None
+    book_manage_id: Optional[str] = None
+    reason: Optional[str] = None
+
+
+class BookBulkResponse(BaseModel):
+    created: int
+    updated: int
+    failed: int
+    items: List[BookBulkItemResult]
+
+
+def _upsert_books_query(rows: List[Dict[str, Any]]):
+    """
+    INSERT ... ON CONFLICT (isbn) DO UPDATE ... RETURNING
+
+    새로 INSERT된 행은 xmax가 0이므로 생성/수정 여부를 추가 조회 없이 구분
+    """
+    query = pg_insert(Book).values(rows)
+    query = query.on_conflict_do_update(
+        index_elements=[Book.isbn],
+        set_={**{name: query.excluded[name] for name in BULK_UPDATE_COLUMNS}, "modified": func.now()},
+    )
+    return query.returning(Book.id, Book.isbn, Book.book_manage_id, literal_column("xmax = 0").label("created"))
+
+
+async def _upsert_books(session: AsyncSession, rows: List[Dict[str, Any]]) -> Dict[str, Tuple[str, str, bool]]:
+    """{isbn: (id, book_manage_id, created)}"""
+    result = await session.execute(_upsert_books_query(rows))
+    return {isbn: (book_id, book_manage_id, created) for book_id, isbn, book_manage_id, created in result.all()}
+
+
+@router.post("/bulk", response_model=BookBulkResponse)
+async def bulk_upsert_books(request: BookBulkRequest, session: SessionDep, background_tasks: BackgroundTasks):
+    """
+    도서 대량 등록/수정 (ISBN이 이미 있으면 수정)
+
+    - 저자 존재 여부는 IN 조회 한 번으로 확인
+    - BULK_CHUNK_SIZE 단위로 upsert, 청크마다 savepoint
+    - 청크가 제약 조건 위반 등으로 실패하면 해당 청크만 건별로 다시 실행해서 실패 항목과 사유를 특정
+    """
+    items = request.items
+    results: List[Optional[BookBulkItemResult]] = [None] * len(items)
+
+    def fail(index: int, reason: str):
+        results[index] = BookBulkItemResult(
+            index=index, isbn=items[index].isbn, status=BulkItemStatus.failed, reason=reason
+        )
+
+    author_ids = {item.author_id for item in items}
+    existing_author_ids = set((await session.scalars(select(Author.id).where(Author.id.in_(author_ids)))).all())
+
+    # 한 문장에서 같은 행을 두 번 갱신할 수 없으므로 요청 안의 중복 ISBN/관리번호는 먼저 온 항목만 반영
+    pending: List[Tuple[int, Dict[str, Any]]] = []
+    seen_isbns, seen_manage_ids = set(), set()
+    for index, item in enumerate(items):
+        if item.author_id not in existing_author_ids:
+            fail(index, "Author not found")
+        elif item.isbn in seen_isbns:
+            fail(index, "Duplicate ISBN in request")
+        elif item.book_manage_id in seen_manage_ids:
+            fail(index, "Duplicate book_manage_id in request")
+        else:
+            seen_isbns.add(item.isbn)
+            seen_manage_ids.add(item.book_manage_id)
+            pending.append((index, item.model_dump()))
+
+    for start in range(0, len(pending), BULK_CHUNK_SIZE):
+        chunk = pending[start : start + BULK_CHUNK_SIZE]
+        try:
+            async with session.begin_nested():
+                upserted = await _upsert_books(session, [row for __, row in chunk])
+        except DBAPIError:
+            upserted = {}
+            for index, row in chunk:
+                try:
+                    async with session.begin_nested():
+                        upserted.update(await _upsert_books(session, [row]))
+                except DBAPIError as e:
+                    fail(index, db_error_reason(e, BOOK_CONSTRAINT_MESSAGES))
+
+        for index, row in chunk:
+            if row["isbn"] not in upserted:
+                continue
+            book_id, book_manage_id, created = upserted[row["isbn"]]
+            results[index] = BookBulkItemResult(
+                index=index,
+                isbn=row["isbn"],
+                status=BulkItemStatus.created if created else BulkItemStatus.updated,
+                id=book_id,
+                book_manage_id=book_manage_id,
+            )
 
-    db_book = Book(**book.model_dump())
-    session.add(db_book)
     await session.commit()
-    await session.refresh(db_book)
 
-    # author_rel을 author로 매핑
-    db_book.author = db_book.author_rel
+    written = [result for result in results if result.status != BulkItemStatus.failed]
+    if written:
+        await invalidate_books(result.book_manage_id for result in written)
+        background_tasks.add_task(index_books_by_id, [result.id for result in written])
+        background_tasks.add_task(schedule_facets_refresh)
 
-    return db_book
+    counts = {status: 0 for status in BulkItemStatus}
+    for result in results:
+        counts[result.status] += 1
+    return BookBulkResponse(
+        created=counts[BulkItemStatus.created],
+        updated=counts[BulkItemStatus.updated],
+        failed=counts[BulkItemStatus.failed],
+        items=results,
+    )
 
 
 ########################################################
-# Update
+# Import
+# 파일(CSV/NDJSON) 대량 가져오기 - 진행 상황은 Redis에 저장해서 어느 레플리카에서든 조회
 ########################################################
+IMPORT_JOB_TTL = 60 * 60 * 24
+
+IMPORT_EXTENSIONS = {".csv": ImportFormat.csv, ".ndjson": ImportFormat.ndjson, ".jsonl": ImportFormat.ndjson}
+
+
+class ImportJobState(str, Enum):
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+
+
+class BookImportJob(ImportProgress):
+    job_id: str
+    state: ImportJobState
+    error_file: Optional[str] = None
+    detail: Optional[str] = None
+
+
+def _import_job_key(job_id: str) -> str:
+    return f"import:job:{job_id}"
+
+
+async def _save_import_job(job: BookImportJob):
+    client = await get_redis_client()
+    await client.set(_import_job_key(job.job_id), job.model_dump_json(), ex=IMPORT_JOB_TTL)
+
+
+async def _run_import_job(job: BookImportJob, path: str, format: ImportFormat):
+    """업로드된 임시 파일을 가져오고, 거부된 행이 있으면 오류 파일을 스토리지에 올림"""
+    error_path = f"{path}.errors.csv"
+
+    async def on_progress(progress: ImportProgress):
+        for field, value in progress.model_dump().items():
+            setattr(job, field, value)
+        await _save_import_job(job)
+
+    try:
+        async with engine.connect() as conn:
+            with (
+                open(path, encoding="utf-8-sig", newline="") as lines,
+                open(error_path, "w", encoding="utf-8", newline="") as errors,
+            ):
+                progress = await import_books(conn, lines, format, errors=errors, on_progress=on_progress)
+        await on_progress(progress)
+        if progress.created or progress.updated:
+            await schedule_facets_refresh()
+
+        if progress.rejected:
+            with open(error_path, "rb") as f:
+                upload = UploadFile(file=f, filename=f"{job.job_id}_errors.csv")
+                job.error_file = await storage.upload(upload, "media/import", f"{job.job_id}_errors.csv")
+        job.state = ImportJobState.completed
+    except Exception as e:
+        logger.error(f"도서 가져오기 오류: {job.job_id} {str(e)}")
+        job.state = ImportJobState.failed
+        job.detail = str(e)
+    finally:
+        await _save_import_job(job)
+        for file_path in (path, error_path):
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+
+@router.post("/import", response_model=BookImportJob, status_code=202)
+async def import_books_file(
+    file: UploadFile,
+    background_tasks: BackgroundTasks,
+    format: Optional[ImportFormat] = Query(None, description="생략하면 파일 확장자(.csv/.ndjson/.jsonl)로 판단"),
+):
+    """
+    CSV/NDJSON 파일로 도서 대량 가져오기 (ISBN 기준 upsert, 저자는 author_name으로 조회/생성)
 
+    가져오기는 백그라운드에서 실행되며 GET /api/books/import/{job_id}로 진행 상황 확인
+    """
+    if format is None:
+        __, extension = os.path.splitext(file.filename or "")
+        format = IMPORT_EXTENSIONS.get(extension.lower())
+        if format is None:
+            raise HTTPException(status_code=400, detail="Import format is required (csv or ndjson)")
 
-@router.put("/{id}", response_model=BookResponse)
-async def update_book(id: str, book_update: BookUpdate, session: SessionDep):
-    query = select(Book).options(joinedload(Book.author_rel)).where(Book.book_manage_id == id)
-    result = await session.execute(query)
-    db_book = result.scalar_one_or_none()
+    # 응답 후에는 업로드 파일이 닫히므로 백그라운드 작업용 임시 파일로 복사
+    fd, path = tempfile.mkstemp(suffix=f".{format.value}")
+    with os.fdopen(fd, "wb") as out:
+        await run_in_threadpool(shutil.copyfileobj, file.file, out)
 
-    if not db_book:
-        raise HTTPException(status_code=404, detail="Book not found")
+    job = BookImportJob(job_id=uuid.uuid4().hex, state=ImportJobState.running)
+    await _save_import_job(job)
+    background_tasks.add_task(_run_import_job, job, path, format)
+    return job
 
-    if book_update.author_id is not None:
-        author_query = select(Author).where(Author.id == book_update.author_id)
-        author_result = await session.execute(author_query)
-        author = author_result.scalar_one_or_none()
-        if not author:
-            raise HTTPException(status_code=404, detail="Author not found")
 
-    if book_update.isbn is not None and book_update.isbn != db_book.isbn:
-        isbn_query = select(Book).where(Book.isbn == book_update.isbn)
-        isbn_result = await session.execute(isbn_query)
-        existing_book = isbn_result.scalar_one_or_none()
-        if existing_book:
-            raise HTTPException(status_code=400, detail="ISBN already exists")
+@router.get("/import/{job_id}", response_model=BookImportJob)
+async def get_import_job(job_id: str):
+    client = await get_redis_client()
+    raw = await client.get(_import_job_key(job_id))
+    if raw is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return BookImportJob.model_validate_json(raw)
 
-    for field, value in book_update.model_dump(exclude_unset=True).items():
-        setattr(db_book, field, value)
 
-    await session.commit()
-    await session.refresh(db_book)
+########################################################
+# Update
+########################################################
 
-    # Map author_rel to author for response
-    db_book.author = db_book.author_rel
-    return db_book
+
+@router.put("/{id}", response_model=BookResponse)
+async def update_book(id: str, book_update: BookUpdate, session: SessionDep, background_tasks: BackgroundTasks):
+    values = book_update.model_dump(exclude_unset=True)
+
+    # 새 표지는 먼저 업로드하고 이전 표지 파일은 커밋 후 삭제
+    cover_changed = "cover_image" in values
+    if cover_changed:
+        values["_cover_image"] = await storage.set_file(None, values.pop("cover_image"), "media/cover")
+        # 이전 표지의 썸네일은 비우고 커밋 후 워커에서 다시 생성
+        values["cover_derivatives"] = None
+
+    # 대상 행을 잠그고 이전 표지 값을 함께 RETURNING (modified는 onupdate로 갱신)
+    books = Book.__table__
+    target = (
+        select(books.c.id, books.c._cover_image.label("previous_cover_image"))
+        .where(books.c.book_manage_id == id)
+        .with_for_update()
+        .subquery("target")
+    )
+    write = update(books).where(books.c.id == target.c.id).values(**values)
+    try:
+        row = await _execute_book_write(session, _returning_with_author(write, target.c.previous_cover_image))
+        if row is None:
+            raise HTTPException(status_code=404, detail="Book not found")
+    except Exception:
+        # 쓰기가 실패하면(없는 도서, ISBN 중복, 없는 저자 등) 먼저 올린 새 표지 삭제
+        if cover_changed:
+            await storage.set_file(values["_cover_image"], None, "media/cover")
+        raise
+
+    db_book, author, previous_cover_image = row
+    if cover_changed and previous_cover_image and previous_cover_image != db_book.cover_image:
+        await storage.set_file(previous_cover_image, None, "media/cover")
+
+    await invalidate_book(db_book.book_manage_id)
+    background_tasks.add_task(index_book_document, db_book.id, book_to_document(db_book, author.name))
+    if cover_changed and db_book.cover_image:
+        background_tasks.add_task(schedule_cover_derivatives, db_book.id)
+    return book_to_dict(db_book)
 
 
 ########################################################
@@ -202,16 +991,22 @@ async def update_book(id: str, book_update: BookUpdate, session: SessionDep):
 
 
 @router.delete("/{id}")
-async def delete_book(id: str, session: SessionDep):
-    query = select(Book).where(Book.book_manage_id == id)
-    result = await session.execute(query)
-    db_book = result.scalar_one_or_none()
+async def delete_book(id: str, session: SessionDep, background_tasks: BackgroundTasks):
+    # 미반납 대출이 있으면 삭제하지 않음 (반납된 대출 기록은 FK ON DELETE CASCADE로 함께 삭제)
+    open_loans = exists().where(Loan.__table__.c.book_id == Book.__table__.c.id, Loan.__table__.c.returned.is_(None))
+    query = (
+        delete(Book.__table__).where(Book.__table__.c.book_manage_id == id, ~open_loans).returning(Book.__table__.c.id)
+    )
+    book_id = (await session.execute(query)).scalar_one_or_none()
+    await session.commit()
 
-    if not db_book:
+    if book_id is None:
+        if await session.scalar(select(Book.id).where(Book.book_manage_id == id)) is not None:
+            raise HTTPException(status_code=409, detail="Book has outstanding loans")
         raise HTTPException(status_code=404, detail="Book not found")
 
-    await session.delete(db_book)
-    await session.commit()
+    await invalidate_book(id)
+    background_tasks.add_task(delete_book_document, book_id)
     return {"message": "Book deleted successfully"}
 
 
@@ -248,21 +1043,77 @@ async def get_book_info_from_url(request: ScrapeBookInfoRequest):
 MAX_FILE_SIZE_MEGA = 5
 
 
-@router.post("/upload", response_model=List[str])
-async def upload_files(files: List[UploadFile]):
-    uploads = []
-    for f in files:
-        # File size limit
-        if not f.size:
-            raise HTTPException(status_code=400, detail="File size is 0 bytes")
-        if f.size > MAX_FILE_SIZE_MEGA * 1024 * 1024:
-            raise HTTPException(status_code=400, detail=f"File size limit is {MAX_FILE_SIZE_MEGA} Mega bytes")
+class UploadStatus(str, Enum):
+    uploaded = "uploaded"
+    failed = "failed"
+
+
+class UploadItemResult(BaseModel):
+    index: int
+    filename: Optional[str] = None
+    status: UploadStatus
+    url: Optional[str] = None
+    reason: Optional[str] = None
+
 
-        # File type validation
-        validate_file_type(f)
+class UploadResponse(BaseModel):
+    uploaded: int
+    failed: int
+    items: List[UploadItemResult]
 
-        # Upload to S3
-        file_url = s3_client.set_file(None, f, "media/cover")
-        uploads.append(file_url)
 
-    return uploads
+def _validate_upload(f: UploadFile):
+    # File size limit
+    if not f.size:
+        raise HTTPException(status_code=400, detail="File size is 0 bytes")
+    if f.size > MAX_FILE_SIZE_MEGA * 1024 * 1024:
+        raise HTTPException(status_code=400, detail=f"File size limit is {MAX_FILE_SIZE_MEGA} Mega bytes")
+
+    # File type validation
+    validate_file_type(f)
+
+
+async def _upload_one(index: int, f: UploadFile, semaphore: asyncio.Semaphore) -> UploadItemResult:
+    result = UploadItemResult(index=index, filename=f.filename, status=UploadStatus.failed)
+    try:
+        _validate_upload(f)
+        async with semaphore:
+            # 내용 해시 키 - 같은 이미지를 다시 올리면 기존 객체를 그대로 사용
+            result.url = await storage.upload_content_addressed(f, "media/cover")
+        if result.url is None:
+            raise ValueError("Failed to upload file to media/cover")
+    except HTTPException as e:
+        result.reason = e.detail
+    except Exception as e:
+        logger.error(f"파일 업로드 오류: {f.filename} {str(e)}")
+        result.reason = "Upload failed"
+    else:
+        result.status = UploadStatus.uploaded
+    return result
+
+
+@router.post("/upload", response_model=Union[List[str], UploadResponse])
+async def upload_files(
+    files: List[UploadFile],
+    results: bool = Query(False, description="true면 실패한 파일이 있어도 파일별 결과(UploadResponse)를 반환"),
+):
+    """
+    파일을 UPLOAD_CONCURRENCY개씩 동시에 업로드 (응답 순서는 요청 순서와 동일)
+
+    results=false(기존 형식)는 URL 목록을 반환하고, 하나라도 실패하면 400/500
+    (업로드된 객체는 다른 도서와 공유될 수 있는 내용 해시 키이므로 지우지 않음 - 참조가 없으면 sweep_orphan_objects가 정리)
+    """
+    if not results:
+        # 기존 형식은 업로드 전에 전체를 검증해서 첫 오류로 실패
+        for f in files:
+            _validate_upload(f)
+
+    semaphore = asyncio.Semaphore(settings.UPLOAD_CONCURRENCY)
+    items = await asyncio.gather(*[_upload_one(index, f, semaphore) for index, f in enumerate(files)])
+    failed = [item for item in items if item.status == UploadStatus.failed]
+
+    if results:
+        return UploadResponse(uploaded=len(items) - len(failed), failed=len(failed), items=items)
+    if failed:
+        raise HTTPException(status_code=500, detail=f"Failed to upload {failed[0].filename}")
+    return [item.url for item in items]
@@ -0,0 +1,33 @@
+from typing import Iterable, Optional
+
+from lms.base.cache import cache
+
+# 도서 목록 캐시 항목 전체에 붙는 태그 - 도서/저자 쓰기 시 한 번에 무효화
+BOOK_LIST_TAG = "books:list"
+# 캐시하는 본문 형식이 바뀌면 버전을 올려서 배포 중 이전 형식의 항목을 읽지 않도록 함
+BOOK_LIST_PREFIX = "books:list:v3"
+
+
+def book_cache_key(book_manage_id: str) -> str:
+    return f"book:{book_manage_id}"
+
+
+def author_cache_tag(author_id: str) -> str:
+    """도서 상세 응답에 포함된 저자 정보가 바뀌면 해당 저자의 도서 상세를 무효화하기 위한 태그"""
+    return f"author:{author_id}"
+
+
+async def invalidate_book(book_manage_id: Optional[str] = None):
+    """도서 생성/수정/삭제 후 상세 캐시와 목록 캐시 무효화"""
+    keys = [book_cache_key(book_manage_id)] if book_manage_id else []
+    await cache.invalidate(keys=keys, tags=[BOOK_LIST_TAG])
+
+
+async def invalidate_books(book_manage_ids: Iterable[str]):
+    """대량 등록/수정 후 여러 도서의 상세 캐시와 목록 캐시를 한 번에 무효화"""
+    await cache.invalidate(keys=[book_cache_key(i) for i in book_manage_ids], tags=[BOOK_LIST_TAG])
+
+
+async def invalidate_author(author_id: str):
+    """저자 수정 후 해당 저자의 도서 상세와 목록 캐시 무효화"""
+    await cache.invalidate(tags=[author_cache_tag(author_id), BOOK_LIST_TAG])
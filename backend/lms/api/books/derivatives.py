@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from lms.api.books.cache import invalidate_book
+from lms.api.books.model import Book
+from lms.base.storage import storage
+from lms.config import settings
+from lms.database import AsyncSessionLocal
+from lms.util.images import RenderedVariant, render_cover_derivatives
+from pydantic import BaseModel
+from sqlalchemy import or_, select, update
+
+logger = logging.getLogger(__name__)
+
+# media/cover/derivatives/<원본 sha256>/w240.webp - 원본 내용과 너비로 정해지는 키라서 덮어써도 내용이 같음
+COVER_DERIVATIVE_PREFIX = "media/cover/derivatives"
+DERIVATIVE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+# 필드 순서는 JSONB가 저장하는 키 순서(길이, 바이트 순)와 같게 둠 - 목록의 book_to_dict는 DB 값을 그대로 쓰므로
+# pydantic 경로(serialize_book)와 같은 JSON이 나오도록
+class CoverVariant(BaseModel):
+    jpeg: str
+    webp: str
+    width: int
+    height: int
+
+
+class CoverDerivatives(BaseModel):
+    # 생성에 사용한 표지 URL - 표지가 바뀌었는지 확인
+    source: str
+    # 너비 오름차순 (<img srcset>/<picture>용)
+    variants: List[CoverVariant]
+    # 흐린 미리보기 data URI (수백 바이트) - 썸네일을 받기 전 자리 표시
+    placeholder: str
+
+
+########################################################
+# Process pool
+# Pillow 디코딩/리사이즈/인코딩은 CPU 작업이라 이벤트 루프(워커의 다른 태스크)를 막지 않도록 별도 프로세스에서 실행
+########################################################
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        # fork는 부모의 이벤트 루프/스레드 상태를 복제하므로 spawn 사용 (자식은 lms.util.images만 import)
+        _process_pool = ProcessPoolExecutor(
+            max_workers=settings.COVER_DERIVATIVE_PROCESSES, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _process_pool
+
+
+async def close_process_pool():
+    global _process_pool
+    pool, _process_pool = _process_pool, None
+    if pool is not None:
+        await asyncio.get_running_loop().run_in_executor(None, pool.shutdown)
+
+
+########################################################
+# Pipeline
+########################################################
+
+
+def needs_cover_derivatives():
+    """표지가 있는데 파생 이미지가 없거나 다른 표지로 만든 도서 조건"""
+    books = Book.__table__
+    return (books.c._cover_image != "") & or_(
+        books.c.cover_derivatives.is_(None), books.c.cover_derivatives["source"].astext != books.c._cover_image
+    )
+
+
+async def _store_variant(prefix: str, variant: RenderedVariant) -> CoverVariant:
+    name = f"{prefix}/w{variant.width}"
+    jpeg, webp = await asyncio.gather(
+        storage.put(f"{name}.jpg", variant.jpeg, "image/jpeg", DERIVATIVE_CACHE_CONTROL),
+        storage.put(f"{name}.webp", variant.webp, "image/webp", DERIVATIVE_CACHE_CONTROL),
+    )
+    return CoverVariant(jpeg=jpeg, webp=webp, width=variant.width, height=variant.height)
+
+
+async def generate_cover_derivatives(book_id: str, force: bool = False) -> Optional[CoverDerivatives]:
+    """
+    도서 표지의 너비별(COVER_DERIVATIVE_WIDTHS) JPEG/WebP 썸네일과 미리보기를 만들어서 저장
+
+    - 이미 현재 표지로 만든 파생 이미지가 있으면 건너뜀 (force면 다시 생성)
+    - 스토리지에 저장되지 않은 표지(외부 URL)는 건너뜀
+    - 생성하는 동안 표지가 바뀌었으면 결과를 저장하지 않음 (바뀐 표지의 태스크가 따로 실행됨)
+    """
+    books = Book.__table__
+    async with AsyncSessionLocal() as session:
+        row = (
+            await session.execute(
+                select(books.c.book_manage_id, books.c._cover_image, books.c.cover_derivatives).where(
+                    books.c.id == book_id
+                )
+            )
+        ).one_or_none()
+    if row is None or not row._cover_image:
+        return None
+    book_manage_id, source, current = row
+    if current and current.get("source") == source and not force:
+        return CoverDerivatives.model_validate(current)
+
+    key_prefix = f"{settings.AWS_S3_CLIENT_URL_BASE}/"
+    if not source.startswith(key_prefix):
+        logger.info(f"스토리지에 없는 표지라서 파생 이미지 생성 생략: {book_id} {source}")
+        return None
+
+    data = await storage.read(source.removeprefix(key_prefix), settings.STORAGE_STREAM_MAX_SIZE)
+    rendered = await asyncio.get_running_loop().run_in_executor(
+        get_process_pool(), render_cover_derivatives, data, tuple(settings.COVER_DERIVATIVE_WIDTHS)
+    )
+    prefix = f"{COVER_DERIVATIVE_PREFIX}/{rendered.digest}"
+    variants = await asyncio.gather(*[_store_variant(prefix, variant) for variant in rendered.variants])
+    derivatives = CoverDerivatives(source=source, variants=variants, placeholder=rendered.placeholder)
+
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            update(books)
+            .where(books.c.id == book_id, books.c._cover_image == source)
+            .values(cover_derivatives=derivatives.model_dump())
+        )
+        await session.commit()
+    if result.rowcount == 0:
+        logger.info(f"생성 중 표지가 바뀌어서 파생 이미지 저장 생략: {book_id}")
+        return None
+
+    await invalidate_book(book_manage_id)
+    logger.info(f"표지 파생 이미지 생성 완료: {book_id} ({len(variants)}개 너비)")
+    return derivatives
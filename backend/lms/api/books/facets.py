@@ -0,0 +1,124 @@
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from lms.database import engine
+from lms.util.utils import timezone_now
+from pydantic import BaseModel
+from sqlalchemy import (
+    DateTime,
+    Float,
+    Integer,
+    String,
+    column,
+    select,
+    table,
+    text,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# 마이그레이션(3f9a7c2e5b18)으로 만든 materialized view - ORM 메타데이터에 넣지 않아서 autogenerate 대상에서 제외
+book_facets = table(
+    "book_facets",
+    column("facet", String),
+    column("bucket", String),
+    column("label", String),
+    column("lower", Float),
+    column("upper", Float),
+    column("book_count", Integer),
+    column("stock", Integer),
+    column("refreshed_at", DateTime(timezone=True)),
+)
+
+# CONCURRENTLY: 갱신 중에도 조회가 막히지 않음 (view의 unique 인덱스 필요)
+REFRESH_BOOK_FACETS_SQL = "REFRESH MATERIALIZED VIEW CONCURRENTLY book_facets"
+
+FACET_AUTHOR = "author"
+FACET_PRICE = "price"
+FACET_PAGE_COUNT = "page_count"
+FACET_TOTAL = "total"
+
+
+class FacetBucket(BaseModel):
+    # 저자 facet은 저자 id, 구간 facet은 구간 번호(경계 미만은 "0", 값이 없으면 "unknown")
+    key: str
+    label: Optional[str] = None
+    # 구간 facet의 [lower, upper) - 첫/마지막 구간은 한쪽이 열려 있음
+    lower: Optional[float] = None
+    upper: Optional[float] = None
+    book_count: int
+    stock: int
+
+
+class BookFacets(BaseModel):
+    authors: List[FacetBucket]
+    price: List[FacetBucket]
+    page_count: List[FacetBucket]
+    total_books: int
+    total_stock: int
+    # 마지막 갱신 시각과 경과 시간(초) - 쓰기 직후에는 갱신 주기만큼 늦게 반영될 수 있음
+    refreshed_at: Optional[datetime] = None
+    stale_seconds: Optional[float] = None
+
+
+def _bucket_order(bucket: FacetBucket):
+    return (bucket.key == "unknown", int(bucket.key) if bucket.key.isdigit() else 0)
+
+
+def book_facets_query(author_limit: int):
+    """도서 수 상위 author_limit명의 저자 facet과 나머지 facet 전체를 한 번에 조회"""
+    authors = (
+        select(book_facets)
+        .where(book_facets.c.facet == FACET_AUTHOR)
+        .order_by(book_facets.c.book_count.desc(), book_facets.c.bucket)
+        .limit(author_limit)
+    )
+    others = select(book_facets).where(book_facets.c.facet != FACET_AUTHOR)
+    return union_all(authors, others)
+
+
+async def fetch_book_facets(session: AsyncSession, author_limit: int) -> BookFacets:
+    rows = (await session.execute(book_facets_query(author_limit))).all()
+
+    buckets: Dict[str, List[FacetBucket]] = {FACET_AUTHOR: [], FACET_PRICE: [], FACET_PAGE_COUNT: []}
+    total_books = total_stock = 0
+    refreshed_at = None
+    for row in rows:
+        refreshed_at = row.refreshed_at
+        if row.facet == FACET_TOTAL:
+            total_books, total_stock = row.book_count, row.stock
+            continue
+        bucket = FacetBucket(
+            key=row.bucket,
+            label=row.label,
+            lower=row.lower,
+            upper=row.upper,
+            book_count=row.book_count,
+            stock=row.stock,
+        )
+        buckets.setdefault(row.facet, []).append(bucket)
+
+    # UNION ALL 결과는 순서가 보장되지 않으므로 저자는 도서 수 순, 구간은 구간 순으로 정렬
+    buckets[FACET_AUTHOR].sort(key=lambda bucket: (-bucket.book_count, bucket.key))
+    for facet in (FACET_PRICE, FACET_PAGE_COUNT):
+        buckets[facet].sort(key=_bucket_order)
+
+    return BookFacets(
+        authors=buckets[FACET_AUTHOR],
+        price=buckets[FACET_PRICE],
+        page_count=buckets[FACET_PAGE_COUNT],
+        total_books=total_books,
+        total_stock=total_stock,
+        refreshed_at=refreshed_at,
+        stale_seconds=(timezone_now() - refreshed_at).total_seconds() if refreshed_at else None,
+    )
+
+
+async def refresh_book_facets():
+    """book_facets 갱신 - 트랜잭션 안에서 실행되므로 실패하면 이전 집계가 그대로 유지됨"""
+    async with engine.begin() as conn:
+        await conn.execute(text(REFRESH_BOOK_FACETS_SQL))
+    logger.info("book_facets 갱신 완료")
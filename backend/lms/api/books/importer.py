@@ -0,0 +1,400 @@
+import asyncio
+import csv
+import json
+import logging
+from enum import Enum
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+)
+
+from lms.api.books.cache import invalidate_books
+from lms.api.books.search import index_books_by_id
+from lms.base.model import generate_id
+from pydantic import BaseModel, Field, ValidationError, field_validator, model_validator
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+logger = logging.getLogger(__name__)
+
+# 한 번에 COPY/병합하는 행 수 - 배치마다 커밋하므로 실패해도 이전 배치까지는 반영됨
+IMPORT_BATCH_ROWS = 5000
+
+STAGING_TABLE = "import_books_staging"
+
+# Postgres integer 컬럼 최댓값
+MAX_INTEGER = 2**31 - 1
+
+# 내보내기(GET /api/books/export) 파일을 그대로 가져올 수 있도록 같은 컬럼명 사용 (id/author_id는 무시)
+STAGING_COLUMNS = [
+    "line",
+    "id",
+    "new_author_id",
+    "author_name",
+    "book_manage_id",
+    "title",
+    "isbn",
+    "description",
+    "price",
+    "quantity",
+    "page_count",
+    "dimensions",
+    "weight",
+    "table_of_contents",
+    "introduction",
+    "publisher_image",
+]
+
+CREATE_STAGING_SQL = f"""
+CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (
+    line integer NOT NULL,
+    id varchar(36) NOT NULL,
+    new_author_id varchar(36) NOT NULL,
+    author_id varchar(36),
+    author_name varchar(255) NOT NULL,
+    book_manage_id varchar(255) NOT NULL,
+    title varchar(255) NOT NULL,
+    isbn varchar(13) NOT NULL,
+    description text,
+    price double precision,
+    quantity integer NOT NULL,
+    page_count integer,
+    dimensions varchar(50),
+    weight double precision,
+    table_of_contents text,
+    introduction text,
+    publisher_image varchar(255)
+)
+"""
+
+# 다른 ISBN의 도서가 이미 같은 관리번호를 쓰고 있으면 병합 전에 제외
+REJECT_MANAGE_ID_CONFLICTS_SQL = f"""
+DELETE FROM {STAGING_TABLE} s
+USING books b
+WHERE b.book_manage_id = s.book_manage_id AND b.isbn <> s.isbn
+RETURNING s.line
+"""
+
+# 저자 이름으로 기존 저자를 찾고, 없는 이름만 한 번에 생성한 뒤 staging에 author_id 기록
+RESOLVE_AUTHORS_SQL = f"""
+WITH names AS (
+    SELECT DISTINCT ON (author_name) author_name, new_author_id
+    FROM {STAGING_TABLE}
+    ORDER BY author_name, line
+),
+existing AS (
+    SELECT DISTINCT ON (a.name) a.name, a.id
+    FROM authors a
+    JOIN names n ON n.author_name = a.name
+    ORDER BY a.name, a.created, a.id
+),
+inserted AS (
+    INSERT INTO authors (id, name)
+    SELECT n.new_author_id, n.author_name
+    FROM names n
+    WHERE NOT EXISTS (SELECT 1 FROM existing e WHERE e.name = n.author_name)
+    RETURNING name, id
+)
+UPDATE {STAGING_TABLE} s
+SET author_id = resolved.id
+FROM (SELECT name, id FROM existing UNION ALL SELECT name, id FROM inserted) resolved
+WHERE s.author_name = resolved.name
+"""
+
+# 관리번호(book_manage_id)는 기존 값 유지 - POST /api/books/bulk와 동일한 규칙
+MERGE_BOOKS_SQL = f"""
+INSERT INTO books (
+    id, book_manage_id, title, author_id, isbn, description, price, quantity,
+    page_count, dimensions, weight, table_of_contents, introduction, publisher_image
+)
+SELECT
+    id, book_manage_id, title, author_id, isbn, description, price, quantity,
+    page_count, dimensions, weight, table_of_contents, introduction, publisher_image
+FROM {STAGING_TABLE}
+ON CONFLICT (isbn) DO UPDATE SET
+    title = excluded.title,
+    author_id = excluded.author_id,
+    description = excluded.description,
+    price = excluded.price,
+    quantity = excluded.quantity,
+    page_count = excluded.page_count,
+    dimensions = excluded.dimensions,
+    weight = excluded.weight,
+    table_of_contents = excluded.table_of_contents,
+    introduction = excluded.introduction,
+    publisher_image = excluded.publisher_image,
+    modified = now()
+RETURNING books.id, books.book_manage_id, (xmax = 0) AS created
+"""
+
+
+class ImportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class BookImportRecord(BaseModel):
+    """가져오기 파일의 한 행 - 컬럼 길이는 books/authors 테이블과 동일하게 제한"""
+
+    book_manage_id: str = Field(..., min_length=1, max_length=255)
+    title: str = Field(..., min_length=1, max_length=255)
+    isbn: str = Field(..., min_length=1, max_length=13)
+    author_name: str = Field(..., min_length=1, max_length=255)
+    # books.description은 NOT NULL - 빈 칸은 빈 문자열로 저장
+    description: str = ""
+    price: Optional[float] = None
+    quantity: int = Field(0, ge=0, le=MAX_INTEGER)
+    page_count: Optional[int] = Field(None, ge=0, le=MAX_INTEGER)
+    dimensions: Optional[str] = Field(None, max_length=50)
+    weight: Optional[float] = None
+    table_of_contents: Optional[str] = None
+    introduction: Optional[str] = None
+    publisher_image: Optional[str] = Field(None, max_length=255)
+
+    @model_validator(mode="before")
+    @classmethod
+    def drop_blank(cls, values):
+        # 빈 칸(None, 공백 문자열)은 값이 없는 것으로 보고 기본값 적용 (quantity -> 0, description -> "", 필수 컬럼 -> Field required)
+        if isinstance(values, dict):
+            return {
+                key: value
+                for key, value in values.items()
+                if value is not None and not (isinstance(value, str) and not value.strip())
+            }
+        return values
+
+    @field_validator("book_manage_id", "title", "author_name", mode="before")
+    @classmethod
+    def strip(cls, value):
+        return value.strip() if isinstance(value, str) else value
+
+    @field_validator("isbn", mode="before")
+    @classmethod
+    def normalize_isbn(cls, value):
+        # 978-89-01-27258-0 형태도 허용
+        return value.strip().replace("-", "") if isinstance(value, str) else value
+
+
+class ImportProgress(BaseModel):
+    processed: int = 0
+    created: int = 0
+    updated: int = 0
+    rejected: int = 0
+
+
+ProgressCallback = Callable[[ImportProgress], Awaitable[None]]
+
+
+########################################################
+# Parse
+########################################################
+
+
+def iter_import_records(lines: Iterable[str], format: ImportFormat) -> Iterator[Tuple[int, Any]]:
+    """
+    파일을 한 행씩 읽어서 (줄 번호, dict 또는 파싱 오류 메시지) 반환
+
+    파일 전체를 메모리에 올리지 않도록 입력은 줄 단위 iterable (열린 파일 객체)
+    """
+    if format == ImportFormat.csv:
+        reader = csv.DictReader(lines)
+        for row in reader:
+            # 빈 칸은 값 없음으로 처리
+            yield reader.line_num, {key: (value if value != "" else None) for key, value in row.items() if key}
+        return
+
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, "Invalid JSON: object expected"
+            continue
+        yield line_number, record
+
+
+def _validation_reason(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in error.errors())
+
+
+class ImportErrorWriter:
+    """거부된 행을 (line, reason, record) CSV로 기록"""
+
+    def __init__(self, output: Optional[TextIO]):
+        self.writer = csv.writer(output) if output is not None else None
+        if self.writer:
+            self.writer.writerow(["line", "reason", "record"])
+
+    def write(self, line: int, reason: str, record: Any = None):
+        if self.writer:
+            raw = json.dumps(record, ensure_ascii=False, default=str) if record is not None else ""
+            self.writer.writerow([line, reason, raw])
+
+    def write_many(self, rows: Iterable[Tuple[int, str, Any]]):
+        for line, reason, record in rows:
+            self.write(line, reason, record)
+
+
+########################################################
+# Load
+########################################################
+
+
+async def _copy_to_staging(conn: AsyncConnection, records: List[Tuple[Any, ...]]):
+    """asyncpg COPY로 staging 테이블에 적재"""
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(STAGING_TABLE, records=records, columns=STAGING_COLUMNS)
+
+
+async def _load_batch(
+    conn: AsyncConnection,
+    batch: List[Tuple[int, BookImportRecord]],
+    raw_records: Dict[int, Any],
+    progress: ImportProgress,
+    errors: ImportErrorWriter,
+) -> List[str]:
+    """배치 하나를 적재/병합하고 반영된 도서 id 목록 반환"""
+    author_ids: Dict[str, str] = {}
+    records = []
+    for line, record in batch:
+        if record.author_name not in author_ids:
+            author_ids[record.author_name] = generate_id()
+        new_author_id = author_ids[record.author_name]
+        values = record.model_dump()
+        records.append((line, generate_id(), new_author_id, *(values[column] for column in STAGING_COLUMNS[3:])))
+
+    await conn.execute(text(f"TRUNCATE {STAGING_TABLE}"))
+    await _copy_to_staging(conn, records)
+
+    conflicts = (await conn.execute(text(REJECT_MANAGE_ID_CONFLICTS_SQL))).all()
+    if conflicts:
+        rejected = [(line, "Book manage id already exists", raw_records.get(line)) for (line,) in conflicts]
+        await asyncio.to_thread(errors.write_many, rejected)
+        progress.rejected += len(rejected)
+
+    await conn.execute(text(RESOLVE_AUTHORS_SQL))
+    merged = (await conn.execute(text(MERGE_BOOKS_SQL))).all()
+    await conn.commit()
+
+    updated_manage_ids = [book_manage_id for __, book_manage_id, created in merged if not created]
+    progress.created += len(merged) - len(updated_manage_ids)
+    progress.updated += len(updated_manage_ids)
+    await invalidate_books(updated_manage_ids)
+    return [book_id for book_id, __, __ in merged]
+
+
+def _validated_batches(
+    lines: Iterable[str], format: ImportFormat, batch_size: int, progress: ImportProgress, errors: ImportErrorWriter
+) -> Iterator[Tuple[List[Tuple[int, BookImportRecord]], Dict[int, Any]]]:
+    """
+    파일 읽기/파싱/검증/파일 안 중복 처리 후 (배치, 원본 행) 반환 - 거부된 행은 errors에 기록
+
+    동기 generator - import_books가 배치마다 스레드에서 실행해서 이벤트 루프를 막지 않도록 함
+    """
+    batch: List[Tuple[int, BookImportRecord]] = []
+    raw_records: Dict[int, Any] = {}
+    seen_isbns: Dict[str, int] = {}
+    seen_manage_ids: Dict[str, str] = {}
+
+    for line, raw in iter_import_records(lines, format):
+        progress.processed += 1
+        if isinstance(raw, str):
+            errors.write(line, raw)
+            progress.rejected += 1
+            continue
+
+        try:
+            record = BookImportRecord.model_validate(raw)
+        except ValidationError as e:
+            errors.write(line, _validation_reason(e), raw)
+            progress.rejected += 1
+            continue
+
+        if seen_manage_ids.get(record.book_manage_id, record.isbn) != record.isbn:
+            errors.write(line, "Duplicate book_manage_id in file", raw)
+            progress.rejected += 1
+            continue
+
+        # 한 문장에서 같은 행을 두 번 병합할 수 없으므로 배치 안의 같은 ISBN은 나중 행으로 대체
+        if record.isbn in seen_isbns:
+            position = seen_isbns[record.isbn]
+            previous_line, previous = batch[position]
+            errors.write(previous_line, f"Superseded by line {line}", raw_records.pop(previous_line, None))
+            progress.rejected += 1
+            seen_manage_ids.pop(previous.book_manage_id, None)
+            batch[position] = (line, record)
+        else:
+            seen_isbns[record.isbn] = len(batch)
+            batch.append((line, record))
+        seen_manage_ids[record.book_manage_id] = record.isbn
+        raw_records[line] = raw
+
+        if len(batch) >= batch_size:
+            yield batch, raw_records
+            batch, raw_records = [], {}
+            seen_isbns.clear()
+            seen_manage_ids.clear()
+
+    yield batch, raw_records
+
+
+async def import_books(
+    conn: AsyncConnection,
+    lines: Iterable[str],
+    format: ImportFormat,
+    errors: Optional[TextIO] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    batch_size: int = IMPORT_BATCH_ROWS,
+    index: bool = True,
+) -> ImportProgress:
+    """
+    CSV/NDJSON 도서 파일 가져오기
+
+    1. 한 행씩 파싱/검증 (실패한 행은 errors에 기록) - 파일 입출력과 검증은 스레드에서 실행
+    2. batch_size 단위로 COPY -> 임시 staging 테이블
+    3. 저자 이름으로 기존 저자 조회/신규 생성 (한 문장)
+    4. books에 INSERT ... ON CONFLICT (isbn) DO UPDATE 로 병합 후 배치 단위 커밋
+    5. index=True면 반영된 도서를 배치 단위로 검색 색인
+
+    임시 테이블을 배치 간에 재사용하므로 세션이 아닌 하나의 연결(conn)에서 실행
+    """
+    progress = ImportProgress()
+    error_writer = ImportErrorWriter(errors)
+
+    await conn.execute(text(CREATE_STAGING_SQL))
+    await conn.commit()
+
+    batches = _validated_batches(lines, format, batch_size, progress, error_writer)
+    try:
+        # generator는 한 번에 한 스레드에서만 진행되므로 progress/errors를 동시에 쓰지 않음
+        while (item := await asyncio.to_thread(next, batches, None)) is not None:
+            batch, raw_records = item
+            if batch:
+                book_ids = await _load_batch(conn, batch, raw_records, progress, error_writer)
+                if index:
+                    await index_books_by_id(book_ids)
+            if on_progress:
+                await on_progress(progress)
+    finally:
+        # 배치 도중 실패했다면 중단된 트랜잭션을 먼저 정리
+        await conn.rollback()
+        await conn.execute(text(f"DROP TABLE IF EXISTS {STAGING_TABLE}"))
+        await conn.commit()
+
+    logger.info(
+        f"도서 가져오기 완료: processed={progress.processed} created={progress.created} "
+        f"updated={progress.updated} rejected={progress.rejected}"
+    )
+    return progress
@@ -1,12 +1,19 @@
 from fastapi import UploadFile
 from lms.base.model import IdBase, TimestampedMixin
 from lms.base.storage import s3_client
-from sqlalchemy import Float, ForeignKey, Integer, String, Text, text
+from sqlalchemy import Float, ForeignKey, Index, Integer, String, Text, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 
 class Book(TimestampedMixin, IdBase):
     __tablename__ = "books"
+    __table_args__ = (
+        # 목록 keyset pagination (created DESC, id DESC)
+        Index("ix_books_created_id", "created", "id"),
+        # ILIKE '%x%' 검색 및 similarity 정렬 (pg_trgm)
+        Index("ix_books_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+    )
 
     book_manage_id: Mapped[str] = mapped_column(String(255), nullable=False, index=True, unique=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
@@ -23,6 +30,8 @@ class Book(TimestampedMixin, IdBase):
     table_of_contents: Mapped[str] = mapped_column(Text, nullable=True)
     introduction: Mapped[str] = mapped_column(Text, nullable=True)
     publisher_image: Mapped[str] = mapped_column(String(255), nullable=True)
+    # 표지 썸네일/WebP/미리보기 URL (lms.api.books.derivatives.CoverDerivatives) - 표지가 바뀌면 비우고 워커가 다시 생성
+    cover_derivatives: Mapped[dict] = mapped_column(JSONB(none_as_null=True), nullable=True)
 
     @property
     def cover_image(self) -> str:
@@ -31,3 +40,4 @@ class Book(TimestampedMixin, IdBase):
     @cover_image.setter
     def cover_image(self, file: UploadFile | str | None = None):
         self._cover_image = s3_client.set_file(self._cover_image, file, "media/cover")
+        self.cover_derivatives = None
@@ -0,0 +1,110 @@
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Set
+
+from lms.api.books.derivatives import COVER_DERIVATIVE_PREFIX
+from lms.api.books.model import Book
+from lms.base.storage import is_content_addressed, storage
+from lms.config import settings
+from lms.database import AsyncSessionLocal
+from pydantic import BaseModel
+from sqlalchemy import select
+
+logger = logging.getLogger(__name__)
+
+# 도서 표지/출판사 이미지를 저장하는 prefix
+ORPHAN_PREFIXES = ("media/cover/", "media/publisher/")
+REFERENCE_BATCH_SIZE = 1000
+
+
+class OrphanSweepResult(BaseModel):
+    scanned: int = 0
+    referenced: int = 0
+    # 유예 기간 안이라서 남긴 객체 (업로드 후 아직 도서에 저장되지 않았을 수 있음)
+    recent: int = 0
+    deleted: int = 0
+    elapsed: float = 0
+
+
+########################################################
+# Sweep
+# 내용 해시 키 객체와 파생 이미지는 여러 도서가 공유할 수 있어서 도서 수정/삭제 시 지우지 않으므로
+# 버킷을 나열해서 어느 도서도 참조하지 않는 객체를 주기적으로 삭제
+########################################################
+
+
+def is_sweepable(key: str) -> bool:
+    """
+    정리 대상 키인지 - 내용 해시 키, 표지 파생 이미지, 끝나지 않은 스트리밍 업로드의 임시 키
+
+    예전 방식의 파일명 키(<이름>_<uuid>.<ext>)는 도서 쪽(set_file)에서 지우므로 대상이 아님
+    """
+    return (
+        is_content_addressed(key)
+        or key.startswith(f"{COVER_DERIVATIVE_PREFIX}/")
+        or any(key.startswith(f"{prefix}tmp/") for prefix in ORPHAN_PREFIXES)
+    )
+
+
+async def referenced_keys() -> Set[str]:
+    """도서가 참조하는 스토리지 키 전체 (표지, 출판사 이미지, 파생 이미지)"""
+    books = Book.__table__
+    key_prefix = f"{settings.AWS_S3_CLIENT_URL_BASE}/"
+    keys = set()
+
+    def add(url: Optional[str]):
+        if url and url.startswith(key_prefix):
+            keys.add(url.removeprefix(key_prefix))
+
+    query = select(books.c._cover_image, books.c.publisher_image, books.c.cover_derivatives).execution_options(
+        yield_per=REFERENCE_BATCH_SIZE
+    )
+    async with AsyncSessionLocal() as session:
+        async for cover_image, publisher_image, derivatives in await session.stream(query):
+            add(cover_image)
+            add(publisher_image)
+            for variant in (derivatives or {}).get("variants", []):
+                add(variant["jpeg"])
+                add(variant["webp"])
+    return keys
+
+
+async def sweep_orphan_objects(grace_seconds: Optional[int] = None, dry_run: bool = False) -> OrphanSweepResult:
+    """
+    어느 도서도 참조하지 않고 유예 기간(STORAGE_ORPHAN_GRACE_SECONDS)이 지난 객체 삭제
+
+    - 객체 목록을 먼저 만든 뒤 참조를 조회 - 목록 이후에 저장된 도서의 참조도 반영됨
+    - 업로드 API가 반환한 뒤 도서에 저장되기 전인 객체는 유예 기간으로 보호
+      (이미 있는 객체를 다시 사용하면 touch_object로 LastModified를 갱신하므로 오래된 객체도 같음)
+    - dry_run이면 삭제하지 않고 대상 수만 반환
+    """
+    started = time.monotonic()
+    grace = settings.STORAGE_ORPHAN_GRACE_SECONDS if grace_seconds is None else grace_seconds
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=grace)
+    result = OrphanSweepResult()
+
+    candidates = []
+    for prefix in ORPHAN_PREFIXES:
+        for key, last_modified in await storage.list_objects(prefix):
+            if is_sweepable(key):
+                result.scanned += 1
+                candidates.append((key, last_modified))
+
+    references = await referenced_keys()
+    orphans = []
+    for key, last_modified in candidates:
+        if key in references:
+            result.referenced += 1
+        elif last_modified > cutoff:
+            result.recent += 1
+        else:
+            orphans.append(key)
+
+    if dry_run:
+        result.deleted = len(orphans)
+    elif orphans:
+        result.deleted = await storage.delete_many(orphans)
+    result.elapsed = time.monotonic() - started
+    logger.info(f"참조 없는 객체 정리{' (dry run)' if dry_run else ''}: {result.model_dump()}")
+    return result
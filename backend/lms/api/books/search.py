@@ -0,0 +1,275 @@
+import logging
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from lms.api.authors.model import Author
+from lms.api.books.model import Book
+from lms.config import settings
+from lms.database import AsyncSessionLocal
+from opensearchpy import AsyncOpenSearch, NotFoundError
+from opensearchpy.helpers import async_bulk
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# 검색 API는 alias(settings.OPENSEARCH_BOOK_INDEX)만 사용하고,
+# 실제 인덱스는 재색인할 때마다 `<alias>_<timestamp>`로 새로 만든 뒤 alias를 교체
+BOOK_INDEX_BODY = {
+    "settings": {
+        "analysis": {
+            "tokenizer": {
+                "nori_mixed": {"type": "nori_tokenizer", "decompound_mode": "mixed"},
+            },
+            "analyzer": {
+                "korean": {
+                    "type": "custom",
+                    "tokenizer": "nori_mixed",
+                    "filter": ["nori_readingform", "lowercase", "nori_part_of_speech"],
+                },
+            },
+        },
+    },
+    "mappings": {
+        "properties": {
+            "book_manage_id": {"type": "keyword"},
+            "isbn": {"type": "keyword"},
+            "title": {
+                "type": "text",
+                "analyzer": "korean",
+                "fields": {"keyword": {"type": "keyword", "ignore_above": 256}},
+            },
+            "author_id": {"type": "keyword"},
+            "author_name": {
+                "type": "text",
+                "analyzer": "korean",
+                "fields": {"keyword": {"type": "keyword", "ignore_above": 256}},
+            },
+            "description": {"type": "text", "analyzer": "korean"},
+            "introduction": {"type": "text", "analyzer": "korean"},
+            "table_of_contents": {"type": "text", "analyzer": "korean"},
+            "cover_image": {"type": "keyword", "index": False},
+            "price": {"type": "float"},
+            "quantity": {"type": "integer"},
+            "created": {"type": "date"},
+            "modified": {"type": "date"},
+        }
+    },
+}
+
+SEARCH_FIELDS = ["title^3", "author_name^2", "description", "introduction", "table_of_contents"]
+
+# 목록 응답에 필요 없는 본문 필드는 _source에서 제외
+SOURCE_EXCLUDES = ["description", "introduction", "table_of_contents"]
+
+_client: Optional[AsyncOpenSearch] = None
+
+
+def get_search_client() -> AsyncOpenSearch:
+    global _client
+    if _client is None:
+        _client = AsyncOpenSearch(hosts=settings.OPENSEARCH_HOSTS)
+    return _client
+
+
+async def close_search_client():
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+########################################################
+# Document
+########################################################
+
+
+def book_to_document(book: Book, author_name: str) -> Dict[str, Any]:
+    return {
+        "book_manage_id": book.book_manage_id,
+        "isbn": book.isbn,
+        "title": book.title,
+        "author_id": book.author_id,
+        "author_name": author_name,
+        "description": book.description,
+        "introduction": book.introduction,
+        "table_of_contents": book.table_of_contents,
+        "cover_image": book.cover_image,
+        "price": book.price,
+        "quantity": book.quantity,
+        "created": book.created.isoformat() if book.created else None,
+        "modified": book.modified.isoformat() if book.modified else None,
+    }
+
+
+########################################################
+# Index
+########################################################
+
+
+async def ensure_book_index(client: AsyncOpenSearch) -> str:
+    """alias가 없으면 새 인덱스를 만들어 연결하고 alias 이름 반환"""
+    alias = settings.OPENSEARCH_BOOK_INDEX
+    if not await client.indices.exists_alias(name=alias):
+        index_name = f"{alias}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        await client.indices.create(index=index_name, body={**BOOK_INDEX_BODY, "aliases": {alias: {}}})
+        logger.info(f"검색 인덱스 생성: {index_name} (alias: {alias})")
+    return alias
+
+
+async def index_book_document(book_id: str, document: Dict[str, Any]) -> bool:
+    """
+    도서 한 건 색인 (생성/수정 공통)
+
+    색인 실패가 도서 저장을 실패시키지 않도록 예외는 로그만 남김
+    """
+    try:
+        client = get_search_client()
+        alias = await ensure_book_index(client)
+        await client.index(index=alias, id=book_id, body=document)
+        return True
+    except Exception as e:
+        logger.error(f"도서 색인 오류: {book_id} {str(e)}")
+        return False
+
+
+async def delete_book_document(book_id: str) -> bool:
+    try:
+        client = get_search_client()
+        await client.delete(index=settings.OPENSEARCH_BOOK_INDEX, id=book_id)
+        return True
+    except NotFoundError:
+        return True
+    except Exception as e:
+        logger.error(f"도서 색인 삭제 오류: {book_id} {str(e)}")
+        return False
+
+
+async def index_book(book: Book, author_name: str) -> bool:
+    """ORM 객체 색인 - 문서 변환 실패(만료된 속성 lazy load 등)도 색인 실패로만 처리"""
+    try:
+        document = book_to_document(book, author_name)
+    except Exception as e:
+        logger.error(f"도서 색인 문서 생성 오류: {book.id} {str(e)}")
+        return False
+    return await index_book_document(book.id, document)
+
+
+async def index_books_by_id(book_ids: List[str], batch_size: int = 500) -> int:
+    """
+    여러 도서를 bulk 색인 (대량 등록/수정 후 BackgroundTasks에서 호출)
+
+    요청 세션은 이미 닫혔으므로 별도 세션으로 조회하고, 예외는 로그만 남김
+    """
+    if not book_ids:
+        return 0
+    try:
+        client = get_search_client()
+        alias = await ensure_book_index(client)
+        indexed = 0
+        async with AsyncSessionLocal() as session:
+            for start in range(0, len(book_ids), batch_size):
+                query = (
+                    select(Book, Author.name)
+                    .join(Author, Author.id == Book.author_id)
+                    .where(Book.id.in_(book_ids[start : start + batch_size]))
+                )
+                actions = [
+                    {"_index": alias, "_id": book.id, "_source": book_to_document(book, author_name)}
+                    for book, author_name in (await session.execute(query)).all()
+                ]
+                count, __ = await async_bulk(client, actions, raise_on_error=False)
+                indexed += count
+        return indexed
+    except Exception as e:
+        logger.error(f"도서 bulk 색인 오류: {len(book_ids)}건 {str(e)}")
+        return 0
+
+
+async def _iter_book_actions(session: AsyncSession, index_name: str, batch_size: int) -> AsyncIterator[Dict[str, Any]]:
+    query = (
+        select(Book, Author.name)
+        .join(Author, Author.id == Book.author_id)
+        .order_by(Book.id)
+        .execution_options(yield_per=batch_size)
+    )
+    result = await session.stream(query)
+    async for book, author_name in result:
+        yield {"_index": index_name, "_id": book.id, "_source": book_to_document(book, author_name)}
+
+
+async def reindex_books(session: AsyncSession, batch_size: int = 500) -> Dict[str, Any]:
+    """
+    전체 도서 재색인
+
+    새 인덱스에 bulk 색인을 마친 뒤 alias를 원자적으로 교체하므로 재색인 중에도 검색 가능
+    """
+    client = get_search_client()
+    alias = settings.OPENSEARCH_BOOK_INDEX
+    index_name = f"{alias}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+
+    # bulk 색인 중에는 refresh/replica 비활성화
+    body = {**BOOK_INDEX_BODY, "settings": {**BOOK_INDEX_BODY["settings"], "refresh_interval": "-1"}}
+    await client.indices.create(index=index_name, body=body)
+
+    indexed, errors = await async_bulk(
+        client,
+        _iter_book_actions(session, index_name, batch_size),
+        chunk_size=batch_size,
+        raise_on_error=False,
+    )
+    await client.indices.put_settings(index=index_name, body={"index": {"refresh_interval": "1s"}})
+    await client.indices.refresh(index=index_name)
+
+    old_indices: List[str] = []
+    if await client.indices.exists_alias(name=alias):
+        old_indices = list((await client.indices.get_alias(name=alias)).keys())
+
+    actions = [{"remove": {"index": old, "alias": alias}} for old in old_indices]
+    actions.append({"add": {"index": index_name, "alias": alias}})
+    await client.indices.update_aliases(body={"actions": actions})
+
+    for old in old_indices:
+        await client.indices.delete(index=old)
+
+    logger.info(f"도서 재색인 완료: {index_name} indexed={indexed} errors={len(errors)}")
+    return {"index": index_name, "indexed": indexed, "errors": len(errors)}
+
+
+########################################################
+# Search
+########################################################
+
+
+async def search_books(query: str, author_name: Optional[str] = None, page: int = 1, size: int = 10) -> Dict[str, Any]:
+    must: List[Dict[str, Any]] = [{"multi_match": {"query": query, "fields": SEARCH_FIELDS, "type": "best_fields"}}]
+    if author_name:
+        must.append({"match": {"author_name": author_name}})
+
+    body = {
+        "query": {"bool": {"must": must}},
+        "highlight": {
+            "pre_tags": ["<em>"],
+            "post_tags": ["</em>"],
+            "fields": {
+                "title": {"number_of_fragments": 0},
+                "author_name": {"number_of_fragments": 0},
+                "description": {"fragment_size": 150, "number_of_fragments": 1},
+                "introduction": {"fragment_size": 150, "number_of_fragments": 1},
+            },
+        },
+        "_source": {"excludes": SOURCE_EXCLUDES},
+        "from": (page - 1) * size,
+        "size": size,
+    }
+
+    client = get_search_client()
+    result = await client.search(index=settings.OPENSEARCH_BOOK_INDEX, body=body)
+
+    hits = result["hits"]
+    items = []
+    for hit in hits["hits"]:
+        items.append(
+            {"id": hit["_id"], **hit["_source"], "score": hit["_score"], "highlight": hit.get("highlight", {})}
+        )
+    return {"total": hits["total"]["value"], "took": result["took"], "items": items}
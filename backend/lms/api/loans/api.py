@@ -0,0 +1,149 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException
+from lms.api.books.cache import invalidate_book
+from lms.api.books.model import Book
+from lms.api.loans.model import Loan
+from lms.base.model import generate_id
+from lms.deps import SessionDep
+from pydantic import BaseModel, Field
+from sqlalchemy import func, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# 도서 하위 경로(/api/books/{id}/checkout)지만 도서 CRUD와 분리
+router = APIRouter(prefix="/api/books", tags=["loans"])
+
+books = Book.__table__
+loans = Loan.__table__
+
+########################################################
+# Schemas
+########################################################
+
+
+class CheckoutRequest(BaseModel):
+    borrower: Optional[str] = Field(None, max_length=255)
+
+
+class ReturnRequest(BaseModel):
+    loan_id: str
+
+
+class LoanResponse(BaseModel):
+    id: str
+    book_id: str
+    book_manage_id: str
+    borrower: Optional[str] = None
+    created: datetime
+    returned: Optional[datetime] = None
+    # 처리 후 남은 재고
+    quantity: int
+
+
+########################################################
+# Queries
+# 재고 변경은 조건부 UPDATE 한 문장으로 처리 - 읽고 쓰는 사이에 다른 요청이 끼어들어 갱신이 유실되지 않도록
+########################################################
+
+
+def checkout_query(book_manage_id: str, borrower: Optional[str] = None):
+    """
+    WITH updated AS (UPDATE books SET quantity = quantity - 1 WHERE ... AND quantity > 0 RETURNING ...),
+         loan AS (INSERT INTO loans SELECT ... FROM updated RETURNING ...)
+    SELECT ... FROM loan JOIN updated
+
+    재고가 없으면 UPDATE 대상이 없으므로 대출 기록도 생기지 않고 결과가 비어 있음
+    """
+    updated = (
+        update(books)
+        .where(books.c.book_manage_id == book_manage_id, books.c.quantity > 0)
+        .values(quantity=books.c.quantity - 1, modified=func.now())
+        .returning(books.c.id, books.c.book_manage_id, books.c.quantity)
+        .cte("updated")
+    )
+    # id 기본값은 CTE 안의 INSERT에는 적용되지 않으므로 직접 생성
+    loan = (
+        insert(loans)
+        .from_select(
+            ["id", "book_id", "borrower"],
+            select(literal(generate_id(), loans.c.id.type), updated.c.id, literal(borrower, loans.c.borrower.type)),
+        )
+        .returning(*loans.c)
+        .cte("loan")
+    )
+    return select(loan, updated.c.book_manage_id, updated.c.quantity).join(updated, updated.c.id == loan.c.book_id)
+
+
+def return_query(book_manage_id: str, loan_id: str):
+    """
+    WITH returned AS (UPDATE loans SET returned = now() WHERE ... AND returned IS NULL RETURNING ...),
+         updated AS (UPDATE books SET quantity = quantity + 1 FROM returned WHERE ... RETURNING ...)
+    SELECT ... FROM returned JOIN updated
+
+    미반납 조건이 UPDATE에 포함되어 있어서 같은 대출을 동시에 두 번 반납해도 재고는 한 번만 증가
+    """
+    book_id = select(books.c.id).where(books.c.book_manage_id == book_manage_id).scalar_subquery()
+    returned = (
+        update(loans)
+        .where(loans.c.id == loan_id, loans.c.book_id == book_id, loans.c.returned.is_(None))
+        .values(returned=func.now(), modified=func.now())
+        .returning(*loans.c)
+        .cte("returned")
+    )
+    updated = (
+        update(books)
+        .where(books.c.id == returned.c.book_id)
+        .values(quantity=books.c.quantity + 1, modified=func.now())
+        .returning(books.c.id, books.c.book_manage_id, books.c.quantity)
+        .cte("updated")
+    )
+    return select(returned, updated.c.book_manage_id, updated.c.quantity).join(
+        updated, updated.c.id == returned.c.book_id
+    )
+
+
+async def _execute_loan_write(session: AsyncSession, query) -> Optional[LoanResponse]:
+    row = (await session.execute(query)).one_or_none()
+    await session.commit()
+    if row is None:
+        return None
+
+    # 재고가 응답에 포함되므로 도서 상세/목록 캐시 무효화
+    await invalidate_book(row.book_manage_id)
+    return LoanResponse(**row._mapping)
+
+
+########################################################
+# Checkout / Return
+########################################################
+
+
+@router.post("/{id}/checkout", response_model=LoanResponse)
+async def checkout_book(id: str, session: SessionDep, checkout: Optional[CheckoutRequest] = None):
+    loan = await _execute_loan_write(session, checkout_query(id, checkout.borrower if checkout else None))
+    if loan is not None:
+        return loan
+
+    # 실패한 경우에만 원인 확인
+    exists = await session.scalar(select(books.c.id).where(books.c.book_manage_id == id))
+    if exists is None:
+        raise HTTPException(status_code=404, detail="Book not found")
+    raise HTTPException(status_code=409, detail="Book is out of stock")
+
+
+@router.post("/{id}/return", response_model=LoanResponse)
+async def return_book(id: str, body: ReturnRequest, session: SessionDep):
+    loan = await _execute_loan_write(session, return_query(id, body.loan_id))
+    if loan is not None:
+        return loan
+
+    query = (
+        select(loans.c.returned)
+        .join(books, books.c.id == loans.c.book_id)
+        .where(loans.c.id == body.loan_id, books.c.book_manage_id == id)
+    )
+    row = (await session.execute(query)).one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Loan not found")
+    raise HTTPException(status_code=409, detail="Loan already returned")
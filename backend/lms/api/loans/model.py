@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from lms.base.model import IdBase, TimestampedMixin
+from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class Loan(TimestampedMixin, IdBase):
+    """대출 기록 - created가 대출 시각, returned가 반납 시각(미반납이면 NULL)"""
+
+    __tablename__ = "loans"
+
+    # 반납된 대출 기록은 도서 삭제 시 함께 삭제 (미반납 대출이 있으면 삭제 API에서 거부)
+    book_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("books.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    borrower: Mapped[str] = mapped_column(String(255), nullable=True)
+    returned: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
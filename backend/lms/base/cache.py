@@ -0,0 +1,446 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import redis.asyncio as redis
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# 다른 API 레플리카에 무효화를 전파하는 pub/sub 채널
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+# 무효화 세대(cache:gen:*) 보관 시간 - 조회 한 번(begin_fill -> set)보다 충분히 길면 됨
+GENERATION_TTL = 3600
+
+# Redis 오류 후 재시도까지 Redis를 건너뛰는 시간(초) - 장애 시 요청마다 타임아웃을 기다리지 않도록
+REDIS_RETRY_INTERVAL = 5
+
+
+def make_cache_key(prefix: str, params: Dict[str, Any]) -> str:
+    """
+    조회 파라미터를 정규화해서 캐시 키 생성
+
+    None/빈 문자열은 제외하고 키 순서를 고정해서 같은 조건이면 같은 키가 되도록 함
+    """
+    normalized = {}
+    for key, value in params.items():
+        if isinstance(value, str):
+            value = value.strip()
+        if value is None or value == "":
+            continue
+        normalized[key] = value.value if hasattr(value, "value") else value
+    digest = hashlib.sha1(json.dumps(normalized, sort_keys=True, default=str).encode()).hexdigest()
+    return f"{prefix}:{digest}"
+
+
+class LocalLRUCache:
+    """
+    프로세스 내 LRU 캐시 (항목별 TTL)
+
+    태그 -> 키 색인도 항목과 함께 관리해서 만료/용량 초과로 제거된 항목의 태그가 남지 않도록 함
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, Any, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value, __ = entry
+        if expires_at < time.monotonic():
+            self.delete(key)
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, tags: Iterable[str] = ()):
+        self.delete(key)
+        tags = tuple(tags)
+        self._data[key] = (time.monotonic() + self.ttl, value, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._data) > self.max_size:
+            self.delete(next(iter(self._data)))
+
+    def delete(self, key: str):
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def delete_tag(self, tag: str):
+        for key in list(self._tags.get(tag, ())):
+            self.delete(key)
+
+    def clear(self):
+        self._data.clear()
+        self._tags.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+@dataclass(eq=False)
+class CacheFill:
+    """
+    캐시 미스 후 조회 -> set 사이에 들어온 무효화를 확인하기 위한 표
+
+    - invalidated: 조회하는 동안 이 프로세스에 도착한(로컬 또는 pub/sub) 무효화 이름
+    - generations: 시작 시점의 Redis 무효화 세대 (키, begin_fill에 준 태그 순) - 다른 레플리카의 무효화 확인
+    """
+
+    key: str
+    tags: List[str]
+    # 복제본에서 읽은 값 - 최근(recent_window) 무효화된 키/태그는 복제 지연으로 쓰기 이전 값일 수 있어서 저장하지 않음
+    replica: bool = False
+    generations: Optional[List[Optional[str]]] = None
+    invalidated: Set[str] = field(default_factory=set)
+    recently_invalidated: bool = False
+
+
+def _names_of(keys: Iterable[str], tags: Iterable[str]) -> List[str]:
+    """무효화 세대를 기록하는 이름 (키와 태그의 이름 공간 분리)"""
+    return [*[f"key:{key}" for key in keys], *[f"tag:{tag}" for tag in tags]]
+
+
+def _names(key: str, tags: Iterable[str]) -> List[str]:
+    return _names_of([key], tags)
+
+
+class ResponseCache:
+    """
+    2단계 응답 캐시 (프로세스 내 LRU -> Redis)
+
+    - 항목은 키 또는 태그(예: author:<id>, books:list) 단위로 무효화
+    - 무효화는 Redis 항목 삭제 후 pub/sub으로 모든 레플리카의 로컬 캐시에 전파
+    - 조회 중에 무효화된 항목은 저장하지 않음 (begin_fill -> set(fill=...))
+    - 복제본에서 읽은 값은 무효화 후 recent_window(복제 지연 허용 시간) 동안 저장하지 않음
+    - Redis 장애 시에는 로컬 캐시만으로 동작
+    """
+
+    def __init__(
+        self,
+        local_max_size: int = settings.CACHE_LOCAL_MAX_SIZE,
+        local_ttl: float = settings.CACHE_LOCAL_TTL,
+        redis_ttl: int = settings.CACHE_REDIS_TTL,
+        enabled: bool = settings.CACHE_ENABLED and not settings.TEST_MODE,
+        # 복제본이 없으면 모든 조회가 primary에서 실행되므로 최근 무효화를 기록하지 않음
+        recent_window: float = settings.DATABASE_PRIMARY_PIN_SECONDS if settings.DATABASE_REPLICA_URLS else 0,
+    ):
+        self.enabled = enabled
+        self.redis_ttl = redis_ttl
+        self.recent_window = recent_window
+        # 이 프로세스에 도착한 무효화 시각 (이름 -> monotonic, 오래된 순) - recent_window가 지나면 제거
+        self._recent: "OrderedDict[str, float]" = OrderedDict()
+        self.local = LocalLRUCache(local_max_size, local_ttl)
+        # 조회 중인 fill - 무효화가 들어오면 이름을 기록 (set 없이 끝난 요청(404 등)의 fill은 참조가 없어지면 제거)
+        self._fills: "weakref.WeakSet[CacheFill]" = weakref.WeakSet()
+        self._redis: Optional[redis.Redis] = None
+        self._pubsub_redis: Optional[redis.Redis] = None
+        self._listener: Optional[asyncio.Task] = None
+        self._origin = uuid.uuid4().hex
+        self._redis_down_until = 0.0
+        self.counters = {
+            "local_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "invalidations": 0,
+            "stale_fills": 0,
+            "redis_errors": 0,
+        }
+
+    def _redis_available(self) -> bool:
+        return time.monotonic() >= self._redis_down_until
+
+    def _get_redis(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.from_url(
+                settings.REDIS_URL,
+                encoding="utf-8",
+                decode_responses=True,
+                socket_connect_timeout=1,
+                socket_timeout=1,
+            )
+        return self._redis
+
+    ########################################################
+    # Read / Write
+    ########################################################
+
+    async def get(self, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        self._ensure_listener()
+
+        value = self.local.get(key)
+        if value is not None:
+            self.counters["local_hits"] += 1
+            return value
+
+        raw = raw_tags = None
+        # Redis 조회 중에 도착한 무효화 확인 (태그는 조회 후에 알 수 있음)
+        fill = CacheFill(key=key, tags=[])
+        self._fills.add(fill)
+        if self._redis_available():
+            try:
+                raw, raw_tags = await self._get_redis().mget([f"cache:{key}", f"cache:keytags:{key}"])
+            except Exception as e:
+                self._redis_error("get", e)
+        self._fills.discard(fill)
+
+        if raw is None:
+            self.counters["misses"] += 1
+            return None
+
+        value = json.loads(raw)
+        # 로컬 캐시에도 태그와 함께 저장 - 태그를 모르는 항목(태그 기록 이전 값)은 태그 무효화를 놓치므로 저장하지 않음
+        if raw_tags is not None:
+            tags = json.loads(raw_tags)
+            if not fill.invalidated.intersection(_names(key, tags)):
+                self.local.set(key, value, tags)
+        self.counters["redis_hits"] += 1
+        return value
+
+    async def begin_fill(self, key: str, tags: Iterable[str] = (), replica: bool = False) -> CacheFill:
+        """
+        캐시 미스 후 DB 조회 전에 호출 - 반환값을 set(fill=...)에 넘기면 그 사이 무효화된 항목은 저장하지 않음
+
+        - 태그를 조회 후에야 알 수 있으면(도서 상세의 저자 태그 등) set에만 넘겨도 됨
+          (이 프로세스에 도착한 무효화와 저장 시점의 최근 무효화 표시로만 확인)
+        - replica: 복제본 세션에서 조회하는 경우 - 최근 무효화된 키/태그면 저장하지 않음
+        """
+        fill = CacheFill(key=key, tags=list(tags), replica=replica)
+        if not self.enabled:
+            return fill
+        self._fills.add(fill)
+        names = _names(key, fill.tags)
+        if replica and self._recently_invalidated_local(names):
+            fill.recently_invalidated = True
+        if self._redis_available():
+            try:
+                values = await self._get_redis().mget(
+                    [f"cache:gen:{name}" for name in names] + [f"cache:recent:{name}" for name in names if replica]
+                )
+                fill.generations = values[: len(names)]
+                if any(values[len(names) :]):
+                    fill.recently_invalidated = True
+            except Exception as e:
+                self._redis_error("begin_fill", e)
+        return fill
+
+    def _recently_invalidated_local(self, names: Iterable[str]) -> bool:
+        threshold = time.monotonic() - self.recent_window
+        while self._recent and next(iter(self._recent.values())) < threshold:
+            self._recent.popitem(last=False)
+        return any(name in self._recent for name in names)
+
+    def _stale_fill(self, fill: CacheFill, key: str, tags: List[str]) -> bool:
+        self._fills.discard(fill)
+        names = _names(key, tags)
+        if (
+            fill.invalidated.intersection(names)
+            or fill.recently_invalidated
+            or (fill.replica and self._recently_invalidated_local(names))
+        ):
+            self.counters["stale_fills"] += 1
+            return True
+        return False
+
+    async def set(self, key: str, value: Any, tags: Iterable[str] = (), fill: Optional[CacheFill] = None):
+        if not self.enabled:
+            return
+        self._ensure_listener()
+
+        tags = list(tags)
+        if fill is not None and self._stale_fill(fill, key, tags):
+            return
+
+        if self._redis_available():
+            try:
+                if not await self._set_redis(key, value, tags, fill):
+                    self.counters["stale_fills"] += 1
+                    return
+            except Exception as e:
+                self._redis_error("set", e)
+        self.local.set(key, value, tags)
+
+    async def _set_redis(self, key: str, value: Any, tags: List[str], fill: Optional[CacheFill]) -> bool:
+        """Redis에 저장 - fill의 시작 이후 다른 레플리카가 무효화했으면 저장하지 않고 False"""
+        generation_keys = []
+        if fill is not None and fill.generations is not None:
+            generation_keys = [f"cache:gen:{name}" for name in _names(key, fill.tags)]
+
+        async with self._get_redis().pipeline(transaction=bool(generation_keys)) as pipe:
+            if generation_keys:
+                # 세대 확인과 저장 사이의 무효화는 WATCH로 감지 (MULTI 실행 실패)
+                await pipe.watch(*generation_keys)
+                if await pipe.mget(generation_keys) != fill.generations:
+                    await pipe.reset()
+                    return False
+                # 조회 후에 알게 된 태그도 최근 무효화 표시 확인
+                if fill.replica and any(await pipe.mget([f"cache:recent:{name}" for name in _names(key, tags)])):
+                    await pipe.reset()
+                    return False
+                pipe.multi()
+            pipe.set(f"cache:{key}", json.dumps(value), ex=self.redis_ttl)
+            # 다른 레플리카가 Redis에서 읽어서 로컬 캐시에 넣을 때 같은 태그로 저장하도록
+            pipe.set(f"cache:keytags:{key}", json.dumps(tags), ex=self.redis_ttl)
+            for tag in tags:
+                pipe.sadd(f"cache:tag:{tag}", key)
+                pipe.expire(f"cache:tag:{tag}", self.redis_ttl)
+            try:
+                await pipe.execute()
+            except redis.WatchError:
+                return False
+        return True
+
+    ########################################################
+    # Invalidation
+    ########################################################
+
+    def _invalidate_local(self, keys: Iterable[str], tags: Iterable[str]):
+        keys, tags = list(keys), list(tags)
+        for key in keys:
+            self.local.delete(key)
+        for tag in tags:
+            self.local.delete_tag(tag)
+        names = _names_of(keys, tags)
+        if self.recent_window > 0:
+            self._recently_invalidated_local(())
+            now = time.monotonic()
+            for name in names:
+                self._recent[name] = now
+                self._recent.move_to_end(name)
+        for fill in self._fills:
+            fill.invalidated.update(names)
+
+    async def invalidate(self, keys: Iterable[str] = (), tags: Iterable[str] = ()):
+        """쓰기 작업 커밋 이후 호출"""
+        if not self.enabled:
+            return
+        keys, tags = list(keys), list(tags)
+        self.counters["invalidations"] += 1
+        self._invalidate_local(keys, tags)
+
+        try:
+            client = self._get_redis()
+            tagged_keys: Set[str] = set()
+            for tag in tags:
+                tagged_keys.update(await client.smembers(f"cache:tag:{tag}"))
+
+            redis_keys = []
+            for key in set(keys) | tagged_keys:
+                redis_keys += [f"cache:{key}", f"cache:keytags:{key}"]
+            redis_keys += [f"cache:tag:{tag}" for tag in tags]
+            async with client.pipeline(transaction=False) as pipe:
+                # 세대를 올린 뒤 삭제 - 이미 조회를 시작한 fill이 삭제 후에 이전 값을 다시 저장하지 않도록
+                for name in _names_of(keys, tags):
+                    pipe.incr(f"cache:gen:{name}")
+                    pipe.expire(f"cache:gen:{name}", GENERATION_TTL)
+                    if self.recent_window > 0:
+                        pipe.set(f"cache:recent:{name}", 1, px=int(self.recent_window * 1000))
+                if redis_keys:
+                    pipe.delete(*redis_keys)
+                await pipe.execute()
+
+            message = {"origin": self._origin, "keys": keys, "tags": tags}
+            await client.publish(INVALIDATION_CHANNEL, json.dumps(message))
+        except Exception as e:
+            self._redis_error("invalidate", e)
+
+    ########################################################
+    # Pub/Sub listener
+    ########################################################
+
+    def _ensure_listener(self):
+        if self._listener is None or self._listener.done():
+            try:
+                self._listener = asyncio.get_running_loop().create_task(self._listen())
+            except RuntimeError:
+                # 실행 중인 이벤트 루프가 없는 경우 (스크립트 등)
+                self._listener = None
+
+    async def _listen(self):
+        while True:
+            try:
+                # 구독 연결은 메시지가 없어도 끊기지 않도록 socket_timeout 없는 별도 클라이언트 사용
+                if self._pubsub_redis is None:
+                    self._pubsub_redis = redis.from_url(
+                        settings.REDIS_URL, encoding="utf-8", decode_responses=True, health_check_interval=30
+                    )
+                pubsub = self._pubsub_redis.pubsub()
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                # 구독이 끊겨 있던 동안의 무효화를 놓쳤을 수 있으므로 로컬 캐시 비움
+                self.local.clear()
+                try:
+                    async for message in pubsub.listen():
+                        if message.get("type") != "message":
+                            continue
+                        data = json.loads(message["data"])
+                        if data.get("origin") == self._origin:
+                            continue
+                        self._invalidate_local(data.get("keys", []), data.get("tags", []))
+                finally:
+                    await pubsub.aclose()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._redis_error("listen", e)
+                await asyncio.sleep(REDIS_RETRY_INTERVAL)
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener = None
+        for client in (self._redis, self._pubsub_redis):
+            if client is not None:
+                await client.aclose()
+        self._redis = None
+        self._pubsub_redis = None
+
+    ########################################################
+    # Stats
+    ########################################################
+
+    def _redis_error(self, operation: str, error: Exception):
+        self.counters["redis_errors"] += 1
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_INTERVAL
+        logger.warning(f"캐시 Redis {operation} 오류: {str(error)}")
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.counters["local_hits"] + self.counters["redis_hits"]
+        lookups = hits + self.counters["misses"]
+        return {
+            **self.counters,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "local_size": len(self.local),
+        }
+
+
+cache = ResponseCache()
+
+
+def get_cache():
+    return cache
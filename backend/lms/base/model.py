@@ -1,7 +1,7 @@
 from datetime import datetime
 
 from nanoid import generate
-from sqlalchemy import DateTime, String, func
+from sqlalchemy import DDL, DateTime, String, event, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -10,6 +10,11 @@ class TimestampedMixin:
     modified: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
 
+def generate_id() -> str:
+    """기본 키 값 - INSERT를 CTE 안에서 실행하는 경우 등 컬럼 기본값이 적용되지 않을 때 직접 호출"""
+    return generate(size=12)
+
+
 class Base(DeclarativeBase):
     __abstract__ = True
 
@@ -17,4 +22,8 @@ class Base(DeclarativeBase):
 class IdBase(Base):
     __abstract__ = True
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: generate(size=12))
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=generate_id)
+
+
+# trigram(GIN) 인덱스에 필요한 확장 - alembic 마이그레이션 없이 create_all 하는 경우 대비
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
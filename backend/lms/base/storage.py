@@ -1,13 +1,48 @@
+import asyncio
+import functools
+import hashlib
+import io
+import logging
+import mimetypes
 import os
+import re
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import AsyncIterator, Iterator, List, Optional, Sequence, Tuple
 
+import aiohttp
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.client import Config
 from botocore.exceptions import ClientError
 from fastapi import UploadFile
 
 from ..config import settings
 
+logger = logging.getLogger(__name__)
+
+# 내용 해시 키 - media/cover/<sha256>.<ext>
+CONTENT_KEY_PATTERN = re.compile(r"(^|/)[0-9a-f]{64}(\.[a-z0-9]+)?$")
+HASH_BLOCK_SIZE = 1024 * 1024
+# 이미 있는 객체를 touch 할 때 Content-Type을 알 수 없는 경우 (S3 기본값)
+DEFAULT_CONTENT_TYPE = "binary/octet-stream"
+# DeleteObjects 한 번에 지울 수 있는 최대 키 수
+DELETE_BATCH_SIZE = 1000
+
+
+def content_key(path_prefix: str, digest: str, extension: str = "") -> str:
+    return f"{path_prefix}/{digest}{extension}"
+
+
+def is_content_addressed(key: str) -> bool:
+    """
+    내용 해시 키인지 - 같은 객체를 여러 도서가 참조할 수 있으므로 도서 쪽에서 지우지 않음
+
+    (참조가 없어진 객체는 lms.api.books.orphans.sweep_orphan_objects가 정리)
+    """
+    return bool(CONTENT_KEY_PATTERN.search(key))
+
 
 class S3Client:
     def __init__(self):
@@ -16,9 +51,19 @@ class S3Client:
             aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
             aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
             endpoint_url=settings.AWS_S3_ENDPOINT_URL,
-            config=Config(signature_version="s3v4"),
+            # 스레드 풀(AsyncS3Client)의 동시 전송 수 x multipart part 동시 전송 수만큼 HTTP 연결 유지
+            config=Config(
+                signature_version="s3v4",
+                max_pool_connections=settings.STORAGE_MAX_WORKERS * settings.STORAGE_MULTIPART_CONCURRENCY,
+            ),
         )
         self.bucket_name = settings.AWS_STORAGE_BUCKET_NAME
+        # 임계값 이상인 파일은 part로 나눠서 병렬 전송 (실패한 part만 재시도)
+        self.transfer_config = TransferConfig(
+            multipart_threshold=settings.STORAGE_MULTIPART_THRESHOLD,
+            multipart_chunksize=settings.STORAGE_MULTIPART_CHUNKSIZE,
+            max_concurrency=settings.STORAGE_MULTIPART_CONCURRENCY,
+        )
 
     def generate_unique_filename(self, filename: str) -> str:
         name, ext = os.path.splitext(filename)
@@ -32,12 +77,98 @@ class S3Client:
         full_path = os.path.join(path_prefix, object_name)
 
         try:
-            self.client.upload_fileobj(file_obj.file, self.bucket_name, full_path, ExtraArgs={})
+            self.client.upload_fileobj(
+                file_obj.file, self.bucket_name, full_path, ExtraArgs={}, Config=self.transfer_config
+            )
         except Exception:
             return None
 
         return f"{settings.AWS_S3_CLIENT_URL_BASE}/{full_path}"
 
+    def object_exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket_name, Key=key)
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def touch_object(self, key: str, content_type: str):
+        """
+        같은 키로 서버 측 복사해서 LastModified만 갱신 (내용은 그대로)
+
+        이미 있는 내용 해시 객체를 다시 사용할 때 호출 - 참조 정리 작업이 유예 기간 안에 다시 쓰인 객체를 지우지 않도록
+        """
+        self.client.copy_object(
+            Bucket=self.bucket_name,
+            Key=key,
+            CopySource={"Bucket": self.bucket_name, "Key": key},
+            ContentType=content_type,
+            MetadataDirective="REPLACE",
+        )
+
+    def list_objects(self, prefix: str) -> Iterator[Tuple[str, datetime]]:
+        """prefix 아래의 (키, LastModified) 전체 (페이지 단위로 조회)"""
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            for item in page.get("Contents", []):
+                yield item["Key"], item["LastModified"]
+
+    def delete_files(self, keys: Sequence[str]) -> int:
+        """DeleteObjects로 DELETE_BATCH_SIZE개씩 삭제하고 삭제된 수를 반환 (실패한 키는 로그만 남김)"""
+        deleted = 0
+        for start in range(0, len(keys), DELETE_BATCH_SIZE):
+            batch = keys[start : start + DELETE_BATCH_SIZE]
+            response = self.client.delete_objects(
+                Bucket=self.bucket_name, Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True}
+            )
+            errors = response.get("Errors", [])
+            for error in errors:
+                logger.error(f"객체 삭제 오류: {error.get('Key')} {error.get('Message')}")
+            deleted += len(batch) - len(errors)
+        return deleted
+
+    def upload_content_addressed(self, file_obj, path_prefix) -> Optional[str]:
+        """
+        파일 내용의 sha256을 키로 업로드 (HEAD 한 번으로 같은 내용이 이미 있으면 업로드 생략)
+
+        확장자는 원래 파일명을 따름, 이미 있으면 LastModified만 갱신 (touch_object)
+        """
+        file = file_obj.file
+        digest = hashlib.sha256()
+        file.seek(0)
+        for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+        file.seek(0)
+
+        __, extension = os.path.splitext(file_obj.filename or "")
+        key = content_key(path_prefix, digest.hexdigest(), extension.lower())
+        try:
+            if self.object_exists(key):
+                self.touch_object(key, file_obj.content_type or mimetypes.guess_type(key)[0] or DEFAULT_CONTENT_TYPE)
+            else:
+                extra_args = {"ContentType": file_obj.content_type} if file_obj.content_type else {}
+                self.client.upload_fileobj(
+                    file, self.bucket_name, key, ExtraArgs=extra_args, Config=self.transfer_config
+                )
+        except Exception:
+            return None
+        return f"{settings.AWS_S3_CLIENT_URL_BASE}/{key}"
+
+    def put_bytes(self, key: str, body: bytes, content_type: str, cache_control: Optional[str] = None) -> str:
+        extra_args = {"CacheControl": cache_control} if cache_control else {}
+        self.client.put_object(Bucket=self.bucket_name, Key=key, Body=body, ContentType=content_type, **extra_args)
+        return f"{settings.AWS_S3_CLIENT_URL_BASE}/{key}"
+
+    def read_file(self, key: str, max_size: int) -> bytes:
+        """객체 전체를 bytes로 (max_size를 넘으면 받지 않고 ValueError)"""
+        response = self.get_file(key)
+        if response["ContentLength"] > max_size:
+            response["Body"].close()
+            raise ValueError(f"File size exceeds {max_size} bytes")
+        return response["Body"].read()
+
     def delete_file(self, path: str) -> bool:
         try:
             self.client.delete_object(Bucket=self.bucket_name, Key=path)
@@ -50,8 +181,6 @@ class S3Client:
     ) -> str:
         # URL 문자열인 경우 동기적으로 이미지 다운로드
         if isinstance(new_file, str) and new_file.startswith(("http://", "https://")):
-            import io
-
             import requests
 
             try:
@@ -70,7 +199,7 @@ class S3Client:
 
         if current_url:
             key_prefix = f"{settings.AWS_S3_CLIENT_URL_BASE}"
-            if key_prefix in current_url:
+            if key_prefix in current_url and not is_content_addressed(current_url):
                 old_key = current_url.split(key_prefix)[1]
                 self.delete_file(old_key)
 
@@ -81,8 +210,6 @@ class S3Client:
                 and new_file.content_type
                 and new_file.content_type.startswith("image/")
             ):
-                import io
-
                 from PIL import Image
 
                 image = Image.open(new_file.file)
@@ -123,11 +250,6 @@ class S3Client:
             return False
 
     async def download_image_from_url(self, url: str, path_prefix: str) -> str:
-        import io
-
-        import aiohttp
-        from fastapi import UploadFile
-
         async with aiohttp.ClientSession() as session:
             async with session.get(url) as response:
                 if response.status == 200:
@@ -151,3 +273,233 @@ s3_client = S3Client()
 
 def get_s3_client():
     return s3_client
+
+
+########################################################
+# Async
+# boto3는 동기 클라이언트이므로 이벤트 루프에서 직접 호출하지 않고 전용 스레드 풀에서 실행
+########################################################
+
+DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=60)
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# 형식 판별에 사용하는 앞부분 길이
+SNIFF_BYTES = 512
+
+# (시그니처 검사, Content-Type, 확장자)
+# SVG는 받지 않음 - 스크립트를 담을 수 있는 문서를 외부 URL에서 공개 버킷에 올리지 않고, 썸네일(Pillow)도 만들 수 없음
+IMAGE_SIGNATURES = [
+    (lambda head: head.startswith(b"\xff\xd8\xff"), "image/jpeg", ".jpg"),
+    (lambda head: head.startswith(b"\x89PNG\r\n\x1a\n"), "image/png", ".png"),
+    (lambda head: head.startswith((b"GIF87a", b"GIF89a")), "image/gif", ".gif"),
+    (lambda head: head[:4] == b"RIFF" and head[8:12] == b"WEBP", "image/webp", ".webp"),
+]
+
+
+def _sniff_image(head: bytes) -> Tuple[str, str]:
+    """첫 바이트로 이미지 형식 판별 - 응답 헤더의 Content-Type은 믿지 않음"""
+    head = bytes(head[:SNIFF_BYTES])
+    for matches, content_type, extension in IMAGE_SIGNATURES:
+        if matches(head):
+            return content_type, extension
+    raise ValueError("Unsupported image format")
+
+
+class AsyncS3Client:
+    """
+    S3Client의 await 가능한 인터페이스 (업로드 하나가 느려도 같은 워커의 다른 요청이 멈추지 않도록)
+
+    - 스레드 수(STORAGE_MAX_WORKERS)로 동시 전송 수를 제한하고 초과분은 대기
+    - FastAPI 기본 스레드 풀(run_in_threadpool)과 분리해서 업로드가 몰려도 다른 동기 작업이 밀리지 않음
+    """
+
+    def __init__(self, client: Optional[S3Client] = None, max_workers: Optional[int] = None):
+        self._client = client
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.STORAGE_MAX_WORKERS, thread_name_prefix="storage"
+        )
+
+    @property
+    def sync(self) -> S3Client:
+        # 지정하지 않으면 모듈의 s3_client 사용 (테스트에서 교체 가능)
+        return self._client or s3_client
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def upload(self, file_obj, path_prefix, object_name=None) -> Optional[str]:
+        return await self._run(self.sync.upload_file, file_obj, path_prefix, object_name)
+
+    async def upload_content_addressed(self, file_obj, path_prefix) -> Optional[str]:
+        return await self._run(self.sync.upload_content_addressed, file_obj, path_prefix)
+
+    async def exists(self, key: str) -> bool:
+        return await self._run(self.sync.object_exists, key)
+
+    async def delete(self, path: str) -> bool:
+        return await self._run(self.sync.delete_file, path)
+
+    async def delete_many(self, keys: Sequence[str]) -> int:
+        return await self._run(self.sync.delete_files, keys)
+
+    async def list_objects(self, prefix: str) -> List[Tuple[str, datetime]]:
+        return await self._run(lambda: list(self.sync.list_objects(prefix)))
+
+    async def head(self, url: str) -> bool:
+        return await self._run(self.sync.check_upload, url)
+
+    async def get(self, key: str):
+        return await self._run(self.sync.get_file, key)
+
+    async def put(self, key: str, body: bytes, content_type: str, cache_control: Optional[str] = None) -> str:
+        return await self._run(self.sync.put_bytes, key, body, content_type, cache_control)
+
+    async def read(self, key: str, max_size: int) -> bytes:
+        return await self._run(self.sync.read_file, key, max_size)
+
+    async def head_bucket(self):
+        client = self.sync
+        return await self._run(client.client.head_bucket, Bucket=client.bucket_name)
+
+    async def set_file(
+        self, current_url: str, new_file: UploadFile | str | None, path_prefix: str, optimize: bool = False
+    ) -> str:
+        if isinstance(new_file, str) and new_file.startswith(("http://", "https://")):
+            # URL은 전체를 메모리에 받지 않고 스트리밍으로 저장 (실패하면 원래 URL 유지)
+            return await self.download_image_from_url(new_file, path_prefix)
+        # 이전 파일 삭제, 이미지 최적화(PIL)까지 모두 스레드에서 실행
+        return await self._run(self.sync.set_file, current_url, new_file, path_prefix, optimize)
+
+    async def upload_stream(
+        self, chunks: AsyncIterator[bytes], path_prefix: str, max_size: Optional[int] = None
+    ) -> str:
+        """
+        청크를 STORAGE_STREAM_PART_SIZE만큼 모아서 multipart upload의 part로 전송, 내용 해시 키(<sha256>.<ext>)로 저장
+
+        - 메모리에는 part 하나(+ 청크 하나)만 유지, 한 part에 들어가는 작은 파일은 PutObject 한 번
+        - 같은 내용이 이미 있으면(HEAD) 업로드하지 않고 LastModified만 갱신 - multipart는 끝까지 받아야 해시를 알 수 있으므로
+          임시 키에 올린 뒤 서버 측 복사
+        - 첫 바이트로 이미지 형식을 판별해서 Content-Type과 확장자 결정 (이미지가 아니면 업로드 전에 ValueError)
+        - max_size를 넘으면 ValueError, 실패하면 진행 중인 multipart upload는 abort
+        """
+        client = self.sync
+        bucket = client.bucket_name
+        part_size = settings.STORAGE_STREAM_PART_SIZE
+        max_size = max_size or settings.STORAGE_STREAM_MAX_SIZE
+
+        buffer = bytearray()
+        digest = hashlib.sha256()
+        size = 0
+        image_type = None
+        temp_key = None
+        upload_id = None
+        parts = []
+
+        async def upload_part(body: bytes):
+            nonlocal temp_key, upload_id
+            if upload_id is None:
+                temp_key = f"{path_prefix}/tmp/{uuid.uuid4().hex}{image_type[1]}"
+                response = await self._run(
+                    client.client.create_multipart_upload, Bucket=bucket, Key=temp_key, ContentType=image_type[0]
+                )
+                upload_id = response["UploadId"]
+            number = len(parts) + 1
+            response = await self._run(
+                client.client.upload_part,
+                Bucket=bucket,
+                Key=temp_key,
+                PartNumber=number,
+                UploadId=upload_id,
+                Body=body,
+            )
+            parts.append({"PartNumber": number, "ETag": response["ETag"]})
+
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_size:
+                    raise ValueError(f"File size exceeds {max_size} bytes")
+                digest.update(chunk)
+                buffer += chunk
+                if image_type is None and len(buffer) >= SNIFF_BYTES:
+                    image_type = _sniff_image(buffer)
+                while len(buffer) >= part_size:
+                    body = bytes(buffer[:part_size])
+                    del buffer[:part_size]
+                    await upload_part(body)
+
+            if image_type is None:
+                # SNIFF_BYTES보다 작은 파일
+                image_type = _sniff_image(buffer)
+            if upload_id is not None:
+                if buffer:
+                    await upload_part(bytes(buffer))
+                await self._run(
+                    client.client.complete_multipart_upload,
+                    Bucket=bucket,
+                    Key=temp_key,
+                    UploadId=upload_id,
+                    MultipartUpload={"Parts": parts},
+                )
+                upload_id = None
+        except BaseException:
+            if upload_id is not None:
+                try:
+                    await self._run(
+                        client.client.abort_multipart_upload, Bucket=bucket, Key=temp_key, UploadId=upload_id
+                    )
+                except Exception as e:
+                    logger.error(f"multipart upload abort 오류: {temp_key} {str(e)}")
+            raise
+
+        key = content_key(path_prefix, digest.hexdigest(), image_type[1])
+        try:
+            if await self.exists(key):
+                logger.info(f"같은 내용의 파일이 이미 있어서 업로드 생략: {key}")
+                await self._run(client.touch_object, key, image_type[0])
+            elif temp_key is None:
+                await self._run(
+                    client.client.put_object, Bucket=bucket, Key=key, Body=bytes(buffer), ContentType=image_type[0]
+                )
+            else:
+                await self._run(
+                    client.client.copy_object,
+                    Bucket=bucket,
+                    Key=key,
+                    CopySource={"Bucket": bucket, "Key": temp_key},
+                    ContentType=image_type[0],
+                    MetadataDirective="REPLACE",
+                )
+        finally:
+            if temp_key is not None:
+                await self._run(client.delete_file, temp_key)
+        return f"{settings.AWS_S3_CLIENT_URL_BASE}/{key}"
+
+    async def download_image_from_url(self, url: str, path_prefix: str) -> str:
+        """
+        이미지를 aiohttp로 받으면서 바로 S3에 스트리밍 업로드
+
+        다운로드/업로드에 실패하거나 이미지가 아니면 원래 URL을 반환 (외부 이미지를 그대로 사용)
+        """
+        try:
+            async with aiohttp.ClientSession(timeout=DOWNLOAD_TIMEOUT) as session:
+                async with session.get(url) as response:
+                    if response.status != 200:
+                        return url
+                    if (response.content_length or 0) > settings.STORAGE_STREAM_MAX_SIZE:
+                        raise ValueError(f"Content-Length {response.content_length} is too large")
+                    return await self.upload_stream(response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE), path_prefix)
+        except Exception as e:
+            logger.warning(f"이미지 저장 실패, 원본 URL 사용: {url} ({str(e)})")
+            return url
+
+    async def close(self):
+        """진행 중인 전송이 끝날 때까지 기다린 뒤 스레드 풀 종료"""
+        await asyncio.get_running_loop().run_in_executor(None, functools.partial(self._executor.shutdown, wait=True))
+
+
+storage = AsyncS3Client()
+
+
+def get_storage():
+    return storage
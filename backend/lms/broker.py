@@ -3,12 +3,19 @@ from typing import Any, Dict, Optional
 
 import redis.asyncio as redis
 from lms.api.authors.model import Author
+from lms.api.books.cache import invalidate_author, invalidate_book
+from lms.api.books.derivatives import close_process_pool, generate_cover_derivatives
+from lms.api.books.facets import refresh_book_facets
 from lms.api.books.model import Book
-from lms.base.storage import S3Client
+from lms.api.books.orphans import sweep_orphan_objects
+from lms.api.books.search import index_book
+from lms.base.storage import storage
 from lms.config import settings
 from lms.database import AsyncSessionLocal
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from taskiq import TaskiqEvents, TaskiqScheduler, TaskiqState
+from taskiq.schedule_sources import LabelScheduleSource
 from taskiq_redis import RedisAsyncResultBackend, RedisStreamBroker
 
 # 로깅 설정
@@ -21,14 +28,19 @@ result_backend = RedisAsyncResultBackend(settings.REDIS_URL)
 # Redis 브로커 설정
 broker = RedisStreamBroker(url=settings.REDIS_URL).with_result_backend(result_backend)
 
+# 스케줄러 - 태스크의 schedule 라벨(cron)을 읽어서 실행 (taskiq scheduler lms.broker:scheduler)
+scheduler = TaskiqScheduler(broker=broker, sources=[LabelScheduleSource(broker)])
+
 # Redis 클라이언트
 redis_client = None
 
 # 큐 이름
 BOOK_INFO_QUEUE = "book_info_queue"
 
-# S3 클라이언트
-s3_client = S3Client()
+# 대량 쓰기 후 facets 갱신 요청 플래그 - 워커가 갱신을 시작하기 전의 요청은 한 번으로 합침
+FACETS_REFRESH_PENDING_KEY = "facets:refresh:pending"
+# 워커가 멈춰 있어도 플래그가 남아서 갱신 요청이 계속 무시되지 않도록
+FACETS_REFRESH_PENDING_TTL = 60
 
 
 async def get_redis_client():
@@ -56,6 +68,50 @@ async def process_book_info_task(author_info: Dict[str, Any], book_info: Dict[st
         raise
 
 
+@broker.task(task_name="refresh_book_facets", schedule=[{"cron": "*/5 * * * *"}])
+async def refresh_book_facets_task():
+    """도서 facets materialized view 갱신 (5분마다 + 대량 쓰기 후)"""
+    client = await get_redis_client()
+    # 갱신 시작 전에 플래그를 지워서 갱신 중에 들어온 쓰기는 다음 갱신 요청으로 반영되도록 함
+    await client.delete(FACETS_REFRESH_PENDING_KEY)
+    await refresh_book_facets()
+
+
+async def schedule_facets_refresh():
+    """대량 쓰기 후 facets 갱신 요청 - 실패해도 다음 주기 갱신에서 반영되므로 로그만 남김"""
+    try:
+        client = await get_redis_client()
+        if await client.set(FACETS_REFRESH_PENDING_KEY, "1", nx=True, ex=FACETS_REFRESH_PENDING_TTL):
+            await refresh_book_facets_task.kiq()
+    except Exception as e:
+        logger.error(f"facets 갱신 요청 오류: {str(e)}")
+
+
+@broker.task(task_name="generate_cover_derivatives")
+async def generate_cover_derivatives_task(book_id: str):
+    """표지 썸네일/WebP/미리보기 생성 (표지 저장 후)"""
+    await generate_cover_derivatives(book_id)
+
+
+async def schedule_cover_derivatives(book_id: str):
+    """표지 파생 이미지 생성 요청 - 실패해도 backfill-covers 명령으로 다시 만들 수 있으므로 로그만 남김"""
+    try:
+        await generate_cover_derivatives_task.kiq(book_id)
+    except Exception as e:
+        logger.error(f"표지 파생 이미지 생성 요청 오류: {book_id} {str(e)}")
+
+
+@broker.task(task_name="sweep_orphan_objects", schedule=[{"cron": "30 4 * * *"}])
+async def sweep_orphan_objects_task():
+    """도서가 참조하지 않는 업로드 객체 정리 (매일 04:30, 유예 기간이 지난 객체만)"""
+    return (await sweep_orphan_objects()).model_dump()
+
+
+@broker.on_event(TaskiqEvents.WORKER_SHUTDOWN)
+async def shutdown_worker(state: TaskiqState):
+    await close_process_pool()
+
+
 async def save_book_info(
     author_info: Dict[str, Any], book_info: Dict[str, Any], session: AsyncSession
 ) -> Optional[Dict[str, Any]]:
@@ -74,19 +130,22 @@ async def save_book_info(
             return None
 
         # 이미지 URL 처리 - cover_image는 모델의 setter를 사용하지 않고 직접 _cover_image 설정
-        if "_cover_image" in book_info and book_info["_cover_image"].startswith(("http://", "https://")):
-            downloaded_url = await s3_client.download_image_from_url(book_info["_cover_image"], "media/cover")
-            logger.info(f"downloaded_url: {downloaded_url}")
-            book_info["_cover_image"] = downloaded_url
-
-        if "publisher_image" in book_info and book_info["publisher_image"].startswith(("http://", "https://")):
-            downloaded_url = await s3_client.download_image_from_url(book_info["publisher_image"], "media/publisher")
-            book_info["publisher_image"] = downloaded_url
+        # 표지와 출판사 이미지가 같은 URL이면 한 번만 받아서 같은 객체(내용 해시 키)를 사용
+        stored_images: Dict[str, str] = {}
+        for field, path_prefix in (("_cover_image", "media/cover"), ("publisher_image", "media/publisher")):
+            source = book_info.get(field)
+            if not source or not source.startswith(("http://", "https://")):
+                continue
+            if source not in stored_images:
+                stored_images[source] = await storage.download_image_from_url(source, path_prefix)
+                logger.info(f"downloaded_url: {stored_images[source]}")
+            book_info[field] = stored_images[source]
 
         # 저자 조회
         author_query = select(Author).where(Author.name == author_name)
         result = await session.execute(author_query)
         author = result.scalar_one_or_none()
+        author_updated = author is not None
 
         if not author:
             # 새 저자 생성
@@ -104,6 +163,7 @@ async def save_book_info(
         existing_book = result.scalar_one_or_none()
 
         if existing_book:
+            previous_cover_image = existing_book._cover_image
             # 기존 도서 정보 업데이트
             for key, value in book_info.items():
                 if hasattr(existing_book, key) and value is not None:
@@ -112,12 +172,29 @@ async def save_book_info(
             existing_book.author_id = str(author.id)
             book = existing_book
         else:
+            previous_cover_image = None
             # 새 도서 생성
             book_info["author_id"] = str(author.id)
             book = Book(**book_info)
             session.add(book)
 
+        cover_changed = bool(book._cover_image) and book._cover_image != previous_cover_image
+        if cover_changed:
+            book.cover_derivatives = None
+
         await session.commit()
+        # 커밋으로 만료된 서버 생성 값(modified 등)을 다시 읽음 - 이후 색인에서 lazy load 하지 않도록
+        await session.refresh(book)
+
+        # 다른 API 레플리카까지 캐시 무효화 전파 (기존 저자 정보가 갱신됐으면 해당 저자의 도서 상세도 무효화)
+        if author_updated:
+            await invalidate_author(str(author.id))
+        await invalidate_book(book.book_manage_id)
+        if cover_changed:
+            await schedule_cover_derivatives(str(book.id))
+
+        # 검색 인덱스 반영 (실패해도 저장 결과에는 영향 없음)
+        await index_book(book, author.name)
 
         logger.info(f"도서 정보와 저자 정보 저장 완료. ISBN: {isbn}, 저자: {author_name}")
         return {
@@ -1,10 +1,37 @@
-from typing import AsyncGenerator
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncGenerator, AsyncIterator, Dict, List, Optional
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from .config import settings
+from .util.instrumentation import instrument_engine
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True, future=True)
+logger = logging.getLogger(__name__)
+
+engine = create_async_engine(
+    settings.DATABASE_URL,
+    echo=settings.SQL_ECHO,
+    future=True,
+    pool_size=settings.DATABASE_POOL_SIZE,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+)
+instrument_engine(engine)
 
 AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
@@ -18,3 +45,194 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             raise
         finally:
             await session.close()
+
+
+########################################################
+# Read replicas
+# 읽기 전용 라우트는 복제본으로 분산 - 복제본이 없거나 모두 응답하지 않으면 primary 사용
+########################################################
+
+
+def create_replica_engine(url: str) -> AsyncEngine:
+    connect_args = {}
+    if make_url(url).get_driver_name() == "asyncpg":
+        # 응답 없는 복제본에서 asyncpg 기본값(60초)만큼 요청이 묶이지 않도록
+        connect_args["timeout"] = settings.DATABASE_REPLICA_CONNECT_TIMEOUT
+    replica = create_async_engine(
+        url,
+        echo=settings.SQL_ECHO,
+        future=True,
+        pool_size=settings.DATABASE_REPLICA_POOL_SIZE,
+        max_overflow=settings.DATABASE_REPLICA_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        # 복제본 재시작/장애 조치 후 끊긴 연결을 꺼내 쓰지 않도록 checkout 시 확인
+        pool_pre_ping=True,
+        connect_args=connect_args,
+    )
+    instrument_engine(replica)
+    return replica
+
+
+class ReplicaSet:
+    """
+    복제본 엔진 라운드 로빈 + 상태 확인
+
+    연결(pre-ping 포함)에 실패한 복제본은 retry_interval 동안 건너뛰고, 그 뒤 다시 차례가 오면 연결을 시도
+    """
+
+    def __init__(self, engines: List[AsyncEngine], retry_interval: float):
+        self.engines = engines
+        self.retry_interval = retry_interval
+        self._counter = itertools.count()
+        self._down_until: Dict[int, float] = {}
+
+    def __len__(self):
+        return len(self.engines)
+
+    def candidates(self) -> List[AsyncEngine]:
+        """이번 요청에서 시도할 순서 - 라운드 로빈 시작점부터, 내려간 복제본은 제외"""
+        now = time.monotonic()
+        healthy = [replica for replica in self.engines if self._down_until.get(id(replica), 0) <= now]
+        if not healthy:
+            return []
+        start = next(self._counter) % len(healthy)
+        return healthy[start:] + healthy[:start]
+
+    def mark_down(self, replica: AsyncEngine, error: Exception):
+        if id(replica) not in self._down_until:
+            logger.warning(f"복제본 연결 실패, {self.retry_interval}초 동안 제외: {replica.url!r} ({error})")
+        self._down_until[id(replica)] = time.monotonic() + self.retry_interval
+
+    def mark_up(self, replica: AsyncEngine):
+        if self._down_until.pop(id(replica), None) is not None:
+            logger.info(f"복제본 복구: {replica.url!r}")
+
+    async def connect(self) -> Optional[AsyncSession]:
+        """연결된 복제본 세션 (모두 실패하면 None)"""
+        for replica in self.candidates():
+            session = AsyncSessionLocal(bind=replica)
+            try:
+                await session.connection()
+            except (DBAPIError, OSError, TimeoutError) as e:
+                await session.close()
+                self.mark_down(replica, e)
+                continue
+            self.mark_up(replica)
+            session.info["replica"] = True
+            return session
+        return None
+
+    async def dispose(self):
+        for replica in self.engines:
+            await replica.dispose()
+
+
+replicas = ReplicaSet(
+    [create_replica_engine(url) for url in settings.DATABASE_REPLICA_URLS],
+    retry_interval=settings.DATABASE_REPLICA_RETRY_SECONDS,
+)
+
+
+########################################################
+# Read-your-writes
+# primary에 커밋한 클라이언트는 DATABASE_PRIMARY_PIN_SECONDS 동안 읽기도 primary에서 처리
+# (쿠키 또는 응답 헤더 값을 그대로 요청 헤더로 보내는 토큰)
+########################################################
+
+PRIMARY_PIN_COOKIE = "lms_primary_until"
+PRIMARY_PIN_HEADER = "X-Primary-Until"
+
+# 요청 중 primary에 커밋했는지 여부 (ReadYourWritesMiddleware가 요청마다 설정)
+_request_wrote: ContextVar[Optional[List[bool]]] = ContextVar("request_wrote", default=None)
+
+
+@event.listens_for(engine.sync_engine, "commit")
+def _record_commit(conn):
+    wrote = _request_wrote.get()
+    if wrote is not None and not wrote:
+        wrote.append(True)
+
+
+def is_primary_pinned(connection: HTTPConnection) -> bool:
+    token = connection.headers.get(PRIMARY_PIN_HEADER) or connection.cookies.get(PRIMARY_PIN_COOKIE)
+    try:
+        return float(token) > time.time()
+    except (TypeError, ValueError):
+        return False
+
+
+def is_pinned_session(session: AsyncSession) -> bool:
+    """
+    쓰기 직후 primary로 고정된 요청의 세션인지
+
+    복제본 지연 중에 다른 요청이 다시 채운 캐시를 읽지 않도록 캐시 조회를 건너뛰는 데 사용
+    """
+    return session.info.get("primary_pinned", False)
+
+
+def is_replica_session(session: AsyncSession) -> bool:
+    """
+    복제본 세션인지 - 쓰기 직후에는 복제 지연으로 이전 값을 읽을 수 있음
+
+    응답 캐시를 채울 때 최근 무효화된 항목이면 저장하지 않도록 사용 (cache.begin_fill(replica=...))
+    """
+    return session.info.get("replica", False)
+
+
+@asynccontextmanager
+async def read_session(pinned: bool = False) -> AsyncIterator[AsyncSession]:
+    """복제본 세션 (고정되었거나 사용할 복제본이 없으면 primary 세션)"""
+    session = None if pinned else await replicas.connect()
+    if session is None:
+        session = AsyncSessionLocal()
+        session.info["primary_pinned"] = pinned
+    async with session:
+        yield session
+
+
+async def get_read_session(connection: HTTPConnection) -> AsyncGenerator[AsyncSession, None]:
+    async with read_session(pinned=bool(replicas) and is_primary_pinned(connection)) as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+
+
+class ReadYourWritesMiddleware:
+    """
+    요청 중 primary에 커밋했으면 응답에 고정 토큰(만료 시각, unix time)을 쿠키와 헤더로 추가
+
+        Set-Cookie: lms_primary_until=1760000000.0; Max-Age=5; Path=/; HttpOnly; SameSite=Lax
+        X-Primary-Until: 1760000000.0
+
+    응답 시작 이후(BackgroundTasks)의 커밋은 반영되지 않음
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        wrote: List[bool] = []
+        token = _request_wrote.set(wrote)
+
+        async def send_with_pin(message: Message):
+            if message["type"] == "http.response.start" and wrote:
+                pin_seconds = settings.DATABASE_PRIMARY_PIN_SECONDS
+                until = f"{time.time() + pin_seconds:.3f}"
+                headers = MutableHeaders(scope=message)
+                headers.append(PRIMARY_PIN_HEADER, until)
+                headers.append(
+                    "Set-Cookie",
+                    f"{PRIMARY_PIN_COOKIE}={until}; Max-Age={int(pin_seconds) + 1}; Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_pin)
+        finally:
+            _request_wrote.reset(token)
@@ -1,9 +1,12 @@
 from typing import Annotated
 
 from fastapi import Depends
-from lms.base.storage import S3Client, get_s3_client
-from lms.database import get_session
+from lms.base.storage import AsyncS3Client, S3Client, get_s3_client, get_storage
+from lms.database import get_read_session, get_session
 from sqlalchemy.ext.asyncio import AsyncSession
 
 SessionDep = Annotated[AsyncSession, Depends(get_session)]
+# 읽기 전용 라우트 - 복제본으로 분산 (쓰기 직후의 클라이언트는 primary)
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_session)]
 S3ClientDep = Annotated[S3Client, Depends(get_s3_client)]
+StorageDep = Annotated[AsyncS3Client, Depends(get_storage)]
@@ -0,0 +1,178 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Dict
+
+import redis.asyncio as redis
+from fastapi import FastAPI
+from lms import broker
+from lms.api.authors.suggest import author_suggest_index
+from lms.base.cache import cache
+from lms.base.storage import storage
+from lms.config import settings
+from lms.database import engine, replicas
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# DB가 아직 올라오지 않았을 때(docker compose 동시 기동 등) 재시도 간격
+DATABASE_RETRY_INTERVAL = 2
+
+
+@dataclass
+class Readiness:
+    """
+    워밍업 상태 - /api/ready 응답
+
+    DB 연결 풀이 준비되어야 ready, 나머지(S3/Redis/캐시)는 실패해도 각자 요청 시 다시 연결하므로 상태만 기록
+    """
+
+    ready: bool = False
+    steps: Dict[str, str] = field(default_factory=dict)
+
+
+########################################################
+# Warm-up
+########################################################
+
+
+async def warm_pool(target: AsyncEngine, connections: int) -> int:
+    """연결 N개를 동시에 열어서 풀에 넣어 둠 (첫 요청들이 asyncpg 연결/인증 비용을 내지 않도록)"""
+    pool_size = getattr(target.sync_engine.pool, "size", None)
+    if pool_size is not None:
+        connections = min(connections, pool_size())
+    opened = await asyncio.gather(*[target.connect() for __ in range(connections)], return_exceptions=True)
+    conns = [conn for conn in opened if not isinstance(conn, BaseException)]
+    try:
+        for conn in conns:
+            await conn.execute(text("SELECT 1"))
+    finally:
+        # close()는 연결을 끊지 않고 풀에 반환
+        for conn in conns:
+            await conn.close()
+    errors = [conn for conn in opened if isinstance(conn, BaseException)]
+    if errors:
+        raise errors[0]
+    return len(conns)
+
+
+async def warm_database():
+    while True:
+        try:
+            return await warm_pool(engine, settings.DATABASE_POOL_WARMUP)
+        except Exception as e:
+            logger.warning(f"DB 연결 풀 워밍업 실패, {DATABASE_RETRY_INTERVAL}초 후 재시도: {str(e)}")
+            await asyncio.sleep(DATABASE_RETRY_INTERVAL)
+
+
+async def warm_replicas():
+    counts = []
+    for replica in replicas.engines:
+        try:
+            counts.append(await warm_pool(replica, settings.DATABASE_POOL_WARMUP))
+        except Exception as e:
+            replicas.mark_down(replica, e)
+            counts.append(0)
+    return counts
+
+
+async def warm_s3():
+    # boto3 엔드포인트/자격 증명 확인과 HTTP 연결
+    await storage.head_bucket()
+
+
+async def warm_redis():
+    await broker.broker.startup()
+    # 태스크 전송에 쓰는 브로커 연결 풀, 앱 공용 클라이언트, 응답 캐시 클라이언트
+    await redis.Redis(connection_pool=broker.broker.connection_pool).ping()
+    await (await broker.get_redis_client()).ping()
+    await cache._get_redis().ping()
+
+
+async def prime_caches():
+    # 저자 자동완성 trie - 없으면 첫 요청들이 DB 접두어 검색으로 처리됨
+    await author_suggest_index.rebuild()
+
+
+async def _run_step(readiness: Readiness, name: str, step) -> bool:
+    readiness.steps[name] = "pending"
+    try:
+        result = await asyncio.wait_for(step(), settings.WARMUP_STEP_TIMEOUT)
+    except Exception as e:
+        readiness.steps[name] = f"failed: {str(e) or e.__class__.__name__}"
+        logger.warning(f"워밍업 실패 ({name}): {readiness.steps[name]}")
+        return False
+    readiness.steps[name] = "ok" if result is None else f"ok ({result})"
+    return True
+
+
+async def warm_up(readiness: Readiness):
+    """
+    DB 연결 풀이 준비될 때까지 기다리고, 나머지는 동시에 한 번씩 시도한 뒤 ready로 전환
+
+    캐시 구성은 DB를 조회하므로 연결 풀 준비 후에 실행
+    """
+    readiness.steps["database"] = "pending"
+    optional = {"s3": warm_s3, "redis": warm_redis}
+    if replicas:
+        optional["replicas"] = warm_replicas
+
+    async def database():
+        readiness.steps["database"] = f"ok ({await warm_database()})"
+
+    await asyncio.gather(database(), *[_run_step(readiness, name, step) for name, step in optional.items()])
+    if settings.WARMUP_PRIME_CACHES:
+        await _run_step(readiness, "caches", prime_caches)
+    readiness.ready = True
+    logger.info(f"워밍업 완료: {readiness.steps}")
+
+
+########################################################
+# Shutdown
+########################################################
+
+
+async def shutdown():
+    """
+    종료 순서 - 태스크 전송(브로커) -> Redis 클라이언트 -> 스토리지 스레드 풀 -> DB 연결 풀
+
+    요청 처리가 끝난 뒤 호출되므로 진행 중인 요청이 닫힌 연결을 쓰지 않음
+    """
+    steps = [
+        ("broker", broker.broker.shutdown),
+        ("redis", _close_redis_client),
+        ("cache", cache.close),
+        ("storage", storage.close),
+        ("replicas", replicas.dispose),
+        ("database", engine.dispose),
+    ]
+    for name, step in steps:
+        try:
+            await step()
+        except Exception as e:
+            logger.error(f"종료 처리 오류 ({name}): {str(e)}")
+
+
+async def _close_redis_client():
+    client, broker.redis_client = broker.redis_client, None
+    if client is not None:
+        await client.aclose()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    readiness = app.state.readiness = Readiness()
+    # 워밍업은 백그라운드에서 - 서버는 바로 요청을 받고 /api/ready가 준비 여부를 알림
+    warming = asyncio.create_task(warm_up(readiness))
+    try:
+        yield
+    finally:
+        readiness.ready = False
+        warming.cancel()
+        try:
+            await warming
+        except (asyncio.CancelledError, Exception):
+            pass
+        await shutdown()
@@ -1,12 +1,17 @@
-from fastapi import APIRouter, FastAPI
+from fastapi import APIRouter, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.routing import APIRoute
 
 from .api.authors.api import router as authors_router
 from .api.books.api import router as books_router
+from .api.loans.api import router as loans_router
+from .base.cache import cache
 from .config import settings
-
-app = FastAPI()
+from .database import PRIMARY_PIN_HEADER, ReadYourWritesMiddleware, replicas
+from .lifespan import lifespan
+from .util.instrumentation import ServerTimingMiddleware
+from .util.utils import NEXT_CURSOR_HEADER
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -35,17 +40,42 @@ app = FastAPI(
     openapi_url="/api/openapi.json",
     # openapi
     generate_unique_id_function=custom_generate_unique_id,
+    # 시작 시 연결 풀/S3/Redis 워밍업, 종료 시 브로커 -> Redis -> DB 순으로 정리
+    lifespan=lifespan,
 )
 
 api_router = APIRouter(prefix="/api")
+
+
+@api_router.get("/cache/stats", tags=["system"])
+async def cache_stats():
+    """응답 캐시 hit/miss 카운터 (프로세스 단위)"""
+    return cache.stats()
+
+
+@api_router.get("/ready", tags=["system"])
+async def ready(request: Request):
+    """준비 상태 probe - 시작 워밍업이 끝나기 전과 종료 중에는 503"""
+    readiness = request.app.state.readiness
+    return JSONResponse(
+        {"ready": readiness.ready, "steps": readiness.steps}, status_code=200 if readiness.ready else 503
+    )
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.ALLOW_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Last-Modified", "Server-Timing", PRIMARY_PIN_HEADER],
 )
+if replicas:
+    app.add_middleware(ReadYourWritesMiddleware)
+if settings.SERVER_TIMING:
+    app.add_middleware(ServerTimingMiddleware)
 
 app.include_router(api_router)
 app.include_router(books_router)
+app.include_router(loans_router)
 app.include_router(authors_router)
@@ -0,0 +1,82 @@
+"""
+표지 파생 이미지 생성 (Pillow)
+
+프로세스 풀에서 실행되는 순수 함수만 둠 - spawn으로 시작한 자식 프로세스가 이 모듈만 import 하도록
+DB/스토리지 등 다른 모듈에 의존하지 않음
+"""
+
+import base64
+import hashlib
+import io
+from typing import List, NamedTuple, Sequence
+
+from PIL import Image, ImageFilter, ImageOps
+
+JPEG_QUALITY = 82
+WEBP_QUALITY = 80
+# 미리보기는 흐리게 늘려서 보여주므로 아주 작게 (data URI로 응답에 바로 포함)
+PLACEHOLDER_WIDTH = 16
+PLACEHOLDER_QUALITY = 50
+
+
+class RenderedVariant(NamedTuple):
+    width: int
+    height: int
+    jpeg: bytes
+    webp: bytes
+
+
+class RenderedCover(NamedTuple):
+    # 원본 내용의 sha256 - 파생 이미지 키에 사용 (같은 표지를 쓰는 도서끼리 공유)
+    digest: str
+    variants: List[RenderedVariant]
+    placeholder: str
+
+
+def _to_rgb(image: Image.Image) -> Image.Image:
+    """투명 배경은 흰색으로 합성 (JPEG는 알파 채널이 없음)"""
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def _encode(image: Image.Image, format: str, **params) -> bytes:
+    output = io.BytesIO()
+    image.save(output, format=format, **params)
+    return output.getvalue()
+
+
+def render_cover_derivatives(data: bytes, widths: Sequence[int]) -> RenderedCover:
+    """
+    너비별 JPEG/WebP 썸네일과 흐린 미리보기(data URI) 생성
+
+    원본보다 큰 너비는 원본 너비 하나로 합침, 높이는 원본 비율 유지
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    with Image.open(io.BytesIO(data)) as source:
+        # JPEG는 디코딩 단계에서 1/2, 1/4, 1/8로 줄여서 읽음 (가장 큰 너비보다 작아지지 않는 범위)
+        source.draft("RGB", (max(widths), source.height * max(widths) // max(source.width, 1)))
+        image = _to_rgb(ImageOps.exif_transpose(source))
+
+    variants = []
+    for width in sorted({min(width, image.width) for width in widths}):
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.Resampling.LANCZOS)
+        variants.append(
+            RenderedVariant(
+                width=width,
+                height=height,
+                jpeg=_encode(resized, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True),
+                webp=_encode(resized, "WEBP", quality=WEBP_QUALITY, method=4),
+            )
+        )
+
+    placeholder_width = min(PLACEHOLDER_WIDTH, image.width)
+    placeholder = image.resize(
+        (placeholder_width, max(1, round(image.height * placeholder_width / image.width))), Image.Resampling.BILINEAR
+    ).filter(ImageFilter.GaussianBlur(1))
+    encoded = base64.b64encode(_encode(placeholder, "JPEG", quality=PLACEHOLDER_QUALITY)).decode("ascii")
+    return RenderedCover(digest=digest, variants=variants, placeholder=f"data:image/jpeg;base64,{encoded}")
@@ -0,0 +1,155 @@
+import logging
+import random
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+from lms.config import settings
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger("lms.sql")
+
+# 로그에 남기는 SQL/파라미터 최대 길이 (대량 INSERT 등)
+MAX_LOGGED_LENGTH = 2000
+
+# EXPLAIN을 붙일 수 있는 문장
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+# EXPLAIN 실패가 요청의 트랜잭션을 aborted 상태로 만들지 않도록 감싸는 savepoint
+EXPLAIN_SAVEPOINT = "lms_explain"
+
+
+@dataclass
+class QueryStats:
+    """요청 하나에서 실행한 쿼리 수와 DB 시간"""
+
+    count: int = 0
+    duration: float = 0.0  # seconds
+    started: float = field(default_factory=time.perf_counter)
+
+
+_request_stats: ContextVar[Optional[QueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _request_stats.get()
+
+
+def _truncate(value) -> str:
+    text = str(value)
+    return text if len(text) <= MAX_LOGGED_LENGTH else f"{text[:MAX_LOGGED_LENGTH]}... ({len(text)} chars)"
+
+
+########################################################
+# SQLAlchemy events
+########################################################
+
+
+def _explain(conn, cursor, statement: str, parameters, context) -> Optional[str]:
+    """
+    느린 쿼리의 실행 계획 (EXPLAIN, 실제로 다시 실행하지 않음)
+
+    같은 연결/트랜잭션에서 DBAPI cursor로 직접 실행해서 이벤트가 다시 발생하지 않도록 함
+    실패하면 savepoint로 되돌려서 요청의 이후 문장이 "current transaction is aborted"로 실패하지 않도록 함
+    """
+    if context is None or context.executemany or not statement.lstrip().upper().startswith(EXPLAINABLE):
+        return None
+    # 서버 측 cursor(session.stream)가 열려 있는 연결에서는 실행하지 않음
+    if context.execution_options.get("stream_results"):
+        return None
+    try:
+        explain_cursor = conn.connection.cursor()
+        try:
+            explain_cursor.execute(f"SAVEPOINT {EXPLAIN_SAVEPOINT}")
+            try:
+                explain_cursor.execute(f"EXPLAIN {statement}", parameters)
+                return "\n".join(str(row[0]) for row in explain_cursor.fetchall())
+            except Exception:
+                explain_cursor.execute(f"ROLLBACK TO SAVEPOINT {EXPLAIN_SAVEPOINT}")
+                raise
+            finally:
+                explain_cursor.execute(f"RELEASE SAVEPOINT {EXPLAIN_SAVEPOINT}")
+        finally:
+            explain_cursor.close()
+    except Exception as e:
+        return f"(EXPLAIN failed: {e})"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += elapsed
+
+    parameters_text = f" parameters={_truncate(parameters)}" if settings.SQL_LOG_PARAMETERS else ""
+    if settings.SQL_SLOW_QUERY_MS and elapsed * 1000 >= settings.SQL_SLOW_QUERY_MS:
+        plan = _explain(conn, cursor, statement, parameters, context) if settings.SQL_EXPLAIN_SLOW_QUERIES else None
+        logger.warning(
+            f"slow query {elapsed * 1000:.1f}ms: {_truncate(statement)}{parameters_text}"
+            + (f"\n{plan}" if plan else "")
+        )
+    elif settings.SQL_LOG_SAMPLE_RATE and random.random() < settings.SQL_LOG_SAMPLE_RATE:
+        logger.info(f"query {elapsed * 1000:.1f}ms: {_truncate(statement)}{parameters_text}")
+
+
+def instrument_engine(engine):
+    """엔진(AsyncEngine 포함)에 쿼리 시간 측정/느린 쿼리 로그 이벤트 등록"""
+    sync_engine: Engine = getattr(engine, "sync_engine", engine)
+    if event.contains(sync_engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+########################################################
+# Server-Timing
+########################################################
+
+
+class ServerTimingMiddleware:
+    """
+    요청별 쿼리 수와 DB 시간을 Server-Timing 헤더로 응답
+
+        Server-Timing: db;dur=12.3;desc="4 queries", app;dur=20.1
+
+    응답 시작 이후(StreamingResponse 본문, BackgroundTasks)에 실행된 쿼리는 포함되지 않음
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _request_stats.set(stats)
+
+        async def send_with_timing(message: Message):
+            if message["type"] == "http.response.start":
+                app_duration = (time.perf_counter() - stats.started) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries", app;dur={app_duration:.1f}',
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stats.reset(token)
@@ -1,11 +1,19 @@
+import base64
+import hashlib
+import json
 import os
 from datetime import datetime, timezone
-from typing import Generic, Sequence, TypeVar
+from email.utils import format_datetime, parsedate_to_datetime
+from enum import Enum
+from typing import Any, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar
 
-from fastapi import Depends, HTTPException, Query, UploadFile
+import orjson
+from fastapi import Depends, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import JSONResponse
 from lms.config import settings
 from pydantic import BaseModel
-from sqlalchemy import func, select
+from sqlalchemy import Table, func, select, text, tuple_
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -13,34 +21,167 @@ def timezone_now():
     return datetime.now(timezone.utc)
 
 
+class TotalMode(str, Enum):
+    """목록 조회 시 전체 개수 계산 방식"""
+
+    none = "none"  # 계산하지 않음 (size+1 조회로 has_more만 판단)
+    estimate = "estimate"  # Postgres 통계/플래너 추정치
+    exact = "exact"  # COUNT(*)
+
+
 class PaginationParams(BaseModel):
     page: int = Query(1, ge=1)
     size: int = Query(settings.PAGINATION_SIZE, ge=1, le=100)
+    # 이전 응답의 next_cursor 값. 지정하면 page 대신 keyset 방식으로 조회
+    cursor: Optional[str] = Query(None)
+    total: TotalMode = Query(TotalMode.none)
 
 
 T = TypeVar("T")
 
+# 목록 응답 본문(List)을 유지한 채 다음 페이지 cursor를 전달하는 헤더
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 
 class Paginated(BaseModel, Generic[T]):
     items: Sequence[T]
-    total: int
+    total: Optional[int] = None
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+    has_more: bool = False
+    next_cursor: Optional[str] = None
+
+
+########################################################
+# Count
+########################################################
+
+
+async def count_exact(session: AsyncSession, query) -> int:
+    count_query = select(func.count()).select_from(query.order_by(None).subquery())
+    return await session.scalar(count_query) or 0
+
+
+def _unfiltered_table(query) -> Optional[Table]:
+    """조건 없이 단일 테이블 전체를 조회하는 쿼리면 해당 테이블 반환"""
+    if query.whereclause is not None:
+        return None
+    # get_final_froms()는 joinedload의 eager join까지 포함하므로 columns 기준으로 판단
+    froms = query.columns_clause_froms
+    if len(froms) == 1 and isinstance(froms[0], Table):
+        return froms[0]
+    return None
+
+
+async def count_estimate(session: AsyncSession, query) -> int:
+    """
+    전체 개수 추정치
+
+    조건이 없는 쿼리는 pg_class.reltuples, 그 외에는 EXPLAIN의 Plan Rows를 사용
+    """
+    query = query.order_by(None)
+
+    table = _unfiltered_table(query)
+    if table is not None:
+        reltuples = await session.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:name)"), {"name": table.name}
+        )
+        # ANALYZE 전의 테이블은 -1
+        if reltuples is not None and reltuples >= 0:
+            return reltuples
+
+    conn = await session.connection()
+    compiled = query.compile(dialect=conn.dialect)
+    if compiled.positiontup:
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+    else:
+        params = compiled.params
+    plan = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params)).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+########################################################
+# Keyset cursor
+########################################################
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """keyset 컬럼 값들을 불투명한 cursor 문자열로 변환"""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> List[Any]:
+    """cursor 문자열을 keyset 컬럼 타입에 맞는 값 목록으로 복원"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(columns):
+            raise ValueError("cursor length mismatch")
 
+        values = []
+        for column, value in zip(columns, payload):
+            if value is not None and column.type.python_type is datetime:
+                value = datetime.fromisoformat(value)
+            values.append(value)
+        return values
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
-async def paginate(session: AsyncSession, query, params: PaginationParams = Depends()) -> Paginated:
+
+def page_query(query, params: PaginationParams, keyset: Optional[Sequence[Any]] = None, descending: bool = False):
+    """
+    페이지 조건(cursor 또는 offset)과 LIMIT size+1을 적용한 쿼리
+
+    다음 페이지 존재 여부 판단을 위해 한 건 더 조회
+    """
+    cursor = getattr(params, "cursor", None)
+    if cursor and not keyset:
+        raise HTTPException(status_code=400, detail="Cursor pagination is not supported for this ordering")
+
+    if cursor:
+        # (col1, col2) < (v1, v2) 형태의 row 비교로 복합 인덱스를 그대로 사용
+        values = decode_cursor(cursor, keyset)
+        boundary = tuple_(*keyset) < tuple_(*values) if descending else tuple_(*keyset) > tuple_(*values)
+        query = query.where(boundary)
+    else:
+        query = query.offset((params.page - 1) * params.size)
+    return query.limit(params.size + 1)
+
+
+async def paginate(
+    session: AsyncSession,
+    query,
+    params: PaginationParams = Depends(),
+    keyset: Optional[Sequence[Any]] = None,
+    descending: bool = False,
+) -> Paginated:
+    """
+    쿼리 결과를 페이지 단위로 조회
+
+    Args:
+        keyset: 정렬 순서와 동일한 유일 컬럼 조합 (예: (Book.created, Book.id)).
+            지정하면 응답에 next_cursor가 포함되고, params.cursor로 OFFSET 없이 다음 페이지를 조회
+        descending: keyset 정렬 방향
+    """
     page = params.page
     size = params.size
+    total_mode = getattr(params, "total", TotalMode.exact)
 
-    count_query = query.order_by(None)
-    count_query = select(func.count()).select_from(count_query.subquery())
+    total = None
+    pages = None
+    if total_mode == TotalMode.exact:
+        total = await count_exact(session, query)
+    elif total_mode == TotalMode.estimate:
+        total = await count_estimate(session, query)
+    if total is not None:
+        pages = (total + size - 1) // size
 
-    total = await session.scalar(count_query) or 0
-    pages = (total + size - 1) // size
-
-    query = query.offset((page - 1) * size).limit(size)
-    result = (await session.execute(query)).unique()
+    result = (await session.execute(page_query(query, params, keyset, descending))).unique()
 
     items = []
     for row in result:
@@ -49,15 +190,214 @@ async def paginate(session: AsyncSession, query, params: PaginationParams = Depe
             item._row = row
         items.append(row[0])
 
+    has_more = len(items) > size
+    items = items[:size]
+
+    next_cursor = None
+    if keyset and has_more:
+        next_cursor = encode_cursor([getattr(items[-1], column.key) for column in keyset])
+
     return Paginated(
         items=items,
         total=total,
         page=page,
         size=size,
         pages=pages,
+        has_more=has_more,
+        next_cursor=next_cursor,
     )
 
 
+########################################################
+# Batch lookup
+########################################################
+
+# 한 번에 조회할 수 있는 키 개수 (= ANY(:keys) 배열 크기)
+LOOKUP_MAX_KEYS = 1000
+
+
+class Lookup(BaseModel, Generic[T]):
+    """입력 키별 조회 결과 - 없는 키는 값이 null이고 missing에도 포함"""
+
+    items: Dict[str, Optional[T]]
+    missing: List[str]
+
+
+def keyed_lookup(keys: Sequence[str], found: Dict[str, Any], normalized: Optional[Dict[str, str]] = None) -> dict:
+    """
+    입력 순서를 유지한 {입력 키: 결과} 응답
+
+    Args:
+        found: 정규화된 키 -> 결과
+        normalized: 입력 키 -> 정규화된 키 (예: ISBN-10 -> ISBN-13). 없는 입력은 그대로 사용
+    """
+    items = {}
+    missing = []
+    for key in keys:
+        value = found.get(normalized.get(key, key) if normalized else key)
+        items[key] = value
+        if value is None:
+            missing.append(key)
+    return {"items": items, "missing": missing}
+
+
+def _isbn13_check_digit(body: str) -> str:
+    total = sum(int(digit) * (1 if i % 2 == 0 else 3) for i, digit in enumerate(body))
+    return str((10 - total % 10) % 10)
+
+
+def _isbn10_check_digit(body: str) -> str:
+    check = (11 - sum(int(digit) * (10 - i) for i, digit in enumerate(body)) % 11) % 11
+    return "X" if check == 10 else str(check)
+
+
+def normalize_isbn(value: str) -> Optional[str]:
+    """
+    ISBN을 하이픈 없는 ISBN-13으로 변환 (형식이나 체크 숫자가 맞지 않으면 None)
+
+    ISBN-10은 978 접두어를 붙이고 체크 숫자를 다시 계산
+    """
+    value = value.strip().replace("-", "").replace(" ", "").upper()
+    if len(value) == 13 and value.isdigit():
+        return value if value[12] == _isbn13_check_digit(value[:12]) else None
+    if len(value) == 10 and value[:9].isdigit() and value[9] == _isbn10_check_digit(value[:9]):
+        body = "978" + value[:9]
+        return body + _isbn13_check_digit(body)
+    return None
+
+
+def isbn13_to_isbn10(isbn13: str) -> Optional[str]:
+    """정규화된 ISBN-13의 ISBN-10 표기 (978 접두어만 ISBN-10이 있음)"""
+    if not isbn13.startswith("978"):
+        return None
+    return isbn13[3:12] + _isbn10_check_digit(isbn13[3:12])
+
+
+########################################################
+# Conditional GET (ETag / Last-Modified)
+########################################################
+
+
+def to_aware_datetime(value: datetime | str) -> datetime:
+    """DB 값(datetime)과 캐시된 JSON 값(ISO 문자열)을 같은 datetime으로 맞춤"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    weak ETag 생성
+
+    datetime은 timestamp로 변환 - 캐시된 JSON의 ISO 문자열은 to_aware_datetime으로 변환해서 전달
+    """
+    normalized = []
+    for part in parts:
+        if isinstance(part, datetime):
+            part = f"{to_aware_datetime(part).timestamp():.6f}"
+        normalized.append(str(part))
+    digest = hashlib.sha1("|".join(normalized).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def http_date(value: datetime | str) -> str:
+    return format_datetime(to_aware_datetime(value).astimezone(timezone.utc), usegmt=True)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime | str] = None) -> bool:
+    """If-None-Match가 있으면 ETag로, 없으면 If-Modified-Since로 판단"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        if if_none_match.strip() == "*":
+            return True
+        # weak 비교: W/ 접두어 무시
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag.removeprefix("W/") in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP-date는 초 단위
+        return to_aware_datetime(last_modified).replace(microsecond=0) <= since
+    return False
+
+
+def has_conditional_headers(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime | str] = None) -> dict:
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime | str] = None) -> Response:
+    return Response(status_code=304, headers=validator_headers(etag, last_modified))
+
+
+########################################################
+# JSON
+########################################################
+
+
+def json_dumps(content: Any) -> bytes:
+    """
+    orjson 인코딩
+
+    UTC datetime은 pydantic(model_dump(mode="json"))과 같은 "Z" 표기로 출력
+    """
+    return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson 기반 JSONResponse - datetime 등을 그대로 받아서 한 번에 인코딩"""
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
+
+
+def raw_json_response(body: bytes | str, headers: Optional[dict] = None) -> Response:
+    """이미 인코딩된 JSON 본문(캐시 등)을 재인코딩 없이 응답"""
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+########################################################
+# DB errors
+########################################################
+
+
+def db_error_info(error: DBAPIError) -> Tuple[Optional[str], Optional[str]]:
+    """
+    DB 예외의 (sqlstate, constraint_name)
+
+    asyncpg 예외는 SQLAlchemy 어댑터 예외(error.orig)의 __cause__로 감싸져 있음
+    """
+    orig = getattr(error, "orig", None)
+    cause = getattr(orig, "__cause__", None) or orig
+    sqlstate = getattr(cause, "sqlstate", None) or getattr(orig, "sqlstate", None)
+    return sqlstate, getattr(cause, "constraint_name", None)
+
+
+def db_error_reason(error: DBAPIError, constraint_messages: Optional[Dict[str, str]] = None) -> str:
+    """사용자에게 돌려줄 한 줄짜리 실패 사유"""
+    __, constraint = db_error_info(error)
+    if constraint and constraint_messages and constraint in constraint_messages:
+        return constraint_messages[constraint]
+    if constraint:
+        return f"Constraint violated: {constraint}"
+    cause = getattr(getattr(error, "orig", None), "__cause__", None) or getattr(error, "orig", None) or error
+    return str(cause).splitlines()[0]
+
+
 ALLOWED_EXTENSIONS = {
     ".pdf",
     ".doc",
@@ -0,0 +1,87 @@
+import argparse
+import asyncio
+import time
+
+from lms.api.books.derivatives import (
+    close_process_pool,
+    generate_cover_derivatives,
+    needs_cover_derivatives,
+)
+from lms.api.books.model import Book
+from lms.base.cache import cache
+from lms.base.storage import storage
+from lms.broker import broker, generate_cover_derivatives_task
+from lms.database import AsyncSessionLocal, engine
+from sqlalchemy import select
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="기존 도서 표지의 썸네일/WebP/미리보기 생성")
+    parser.add_argument("--batch-size", type=int, default=500, help="한 번에 조회하는 도서 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="직접 생성할 때 동시에 처리하는 도서 수")
+    parser.add_argument("--enqueue", action="store_true", help="직접 생성하지 않고 워커 태스크로 보냄")
+    parser.add_argument("--force", action="store_true", help="파생 이미지가 있는 도서도 다시 생성 (너비 설정 변경 등)")
+    return parser.parse_args()
+
+
+async def book_ids(batch_size: int, force: bool):
+    """대상 도서 id를 id 순서 keyset으로 batch_size씩"""
+    books = Book.__table__
+    condition = books.c._cover_image != "" if force else needs_cover_derivatives()
+    last_id = ""
+    while True:
+        query = select(books.c.id).where(condition, books.c.id > last_id).order_by(books.c.id).limit(batch_size)
+        async with AsyncSessionLocal() as session:
+            ids = (await session.execute(query)).scalars().all()
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+
+async def run(args):
+    counts = {"generated": 0, "skipped": 0, "failed": 0}
+    semaphore = asyncio.Semaphore(args.concurrency)
+    started = time.monotonic()
+
+    async def generate(book_id: str):
+        async with semaphore:
+            try:
+                result = await generate_cover_derivatives(book_id, force=args.force)
+            except Exception as e:
+                print(f"failed: {book_id} ({str(e)})", flush=True)
+                counts["failed"] += 1
+                return
+        counts["generated" if result else "skipped"] += 1
+
+    if args.enqueue:
+        await broker.startup()
+    try:
+        async for ids in book_ids(args.batch_size, args.force):
+            if args.enqueue:
+                for book_id in ids:
+                    await generate_cover_derivatives_task.kiq(book_id)
+                counts["generated"] += len(ids)
+            else:
+                await asyncio.gather(*[generate(book_id) for book_id in ids])
+            elapsed = time.monotonic() - started
+            print(
+                f"{'enqueued' if args.enqueue else 'generated'}={counts['generated']} skipped={counts['skipped']} "
+                f"failed={counts['failed']} ({sum(counts.values()) / elapsed if elapsed else 0:.1f} books/s)",
+                flush=True,
+            )
+    finally:
+        if args.enqueue:
+            await broker.shutdown()
+        await close_process_pool()
+        await storage.close()
+        await cache.close()
+        await engine.dispose()
+
+
+def main():
+    asyncio.run(run(parse_args()))
+
+
+if __name__ == "__main__":
+    main()
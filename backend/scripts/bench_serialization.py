@@ -0,0 +1,91 @@
+"""
+도서 목록 직렬화 마이크로벤치마크 (DB 없이 ORM 객체만 생성해서 측정)
+
+    poetry run python -m scripts.bench_serialization [--size 100] [--rounds 200]
+
+- pydantic: 기존 경로 - serialize_book(from_attributes 검증 + model_dump) 후 JSONResponse(json.dumps)
+- fast: book_to_dict(스키마 필드 직접 복사) 후 json_dumps(orjson)
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+from fastapi.responses import JSONResponse
+from lms.api.authors.model import Author
+from lms.api.books.api import (
+    BookResponse,
+    BookSummaryResponse,
+    book_to_dict,
+    serialize_book,
+)
+from lms.api.books.model import Book
+from lms.util.utils import json_dumps
+
+
+def make_books(size: int):
+    now = datetime.now(timezone.utc)
+    books = []
+    for i in range(size):
+        author = Author(id=f"author_{i}", name=f"저자 {i}", description="저자 소개 " * 20, created=now, modified=now)
+        book = Book(
+            id=f"book_{i:04d}",
+            book_manage_id=f"ALADIN_{9788900000000 + i}",
+            title=f"테스트 도서 {i}",
+            isbn=str(9788900000000 + i),
+            author_id=author.id,
+            description="책 설명 " * 200,
+            price=15000.0 + i,
+            quantity=i % 5,
+            page_count=320,
+            dimensions="152*225*20mm",
+            weight=480.0,
+            table_of_contents="1장 " * 100,
+            introduction="책 소개 " * 150,
+            publisher_image=None,
+            created=now - timedelta(minutes=i),
+            modified=now,
+        )
+        book.author_rel = author
+        books.append(book)
+    return books
+
+
+def pydantic_path(books, schema):
+    return JSONResponse(content=[serialize_book(book, schema) for book in books]).body
+
+
+def fast_path(books, schema):
+    return json_dumps([book_to_dict(book, schema) for book in books])
+
+
+def bench(func, books, schema, rounds: int) -> float:
+    func(books, schema)
+    started = time.perf_counter()
+    for __ in range(rounds):
+        func(books, schema)
+    return (time.perf_counter() - started) / rounds * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    books = make_books(args.size)
+    for schema in (BookResponse, BookSummaryResponse):
+        # 두 경로가 같은 JSON을 만드는지 먼저 확인
+        expected = json_dumps([serialize_book(book, schema) for book in books])
+        assert fast_path(books, schema) == expected, "serialization mismatch"
+
+        slow = bench(pydantic_path, books, schema, args.rounds)
+        fast = bench(fast_path, books, schema, args.rounds)
+        print(
+            f"{schema.__name__:<20} size={args.size} pydantic={slow:.2f}ms/page fast={fast:.2f}ms/page "
+            f"({slow / fast:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
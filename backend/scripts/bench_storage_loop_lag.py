@@ -0,0 +1,109 @@
+"""
+동시 업로드 중 이벤트 루프 지연(lag) 벤치마크
+
+    poetry run python -m scripts.bench_storage_loop_lag [--uploads 20] [--size-kb 512] [--simulated-latency-ms 0]
+
+- sync: 기존 경로 - 이벤트 루프에서 S3Client.upload_file(boto3) 직접 호출
+- async: AsyncS3Client.upload - 스토리지 전용 스레드 풀(STORAGE_MAX_WORKERS)에서 실행
+- 업로드하는 동안 --interval-ms 주기의 ticker가 예정보다 늦게 깨어난 시간을 측정 (다른 요청이 기다리는 시간)
+- --simulated-latency-ms를 주면 MinIO 대신 해당 시간만큼 스레드를 막는 가짜 클라이언트 사용
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import time
+import uuid
+
+from fastapi import UploadFile
+from lms.base.storage import AsyncS3Client, S3Client
+
+BENCH_PREFIX = "bench/loop-lag"
+
+
+class SimulatedS3Client:
+    """boto3 업로드처럼 호출한 스레드를 latency만큼 막는 클라이언트"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def upload_file(self, file_obj, path_prefix, object_name=None):
+        file_obj.file.read()
+        time.sleep(self.latency)
+        return f"{path_prefix}/{object_name}"
+
+    def delete_file(self, path):
+        return True
+
+
+def percentile(values, ratio: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+async def measure_lag(stop: asyncio.Event, interval: float, lags: list):
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+def make_upload(payload: bytes, index: int) -> UploadFile:
+    return UploadFile(file=io.BytesIO(payload), filename=f"{index}.bin")
+
+
+async def run(mode: str, client, args, payload: bytes):
+    storage = AsyncS3Client(client)
+    names = [f"{uuid.uuid4().hex}.bin" for __ in range(args.uploads)]
+
+    async def upload(index: int):
+        file_obj = make_upload(payload, index)
+        if mode == "sync":
+            # 코루틴이지만 내부에서 boto3를 직접 호출 - 끝날 때까지 루프가 멈춤
+            return client.upload_file(file_obj, BENCH_PREFIX, names[index])
+        return await storage.upload(file_obj, BENCH_PREFIX, names[index])
+
+    lags = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(measure_lag(stop, args.interval_ms / 1000, lags))
+    await asyncio.sleep(args.interval_ms / 1000 * 2)
+
+    started = time.perf_counter()
+    urls = await asyncio.gather(*[upload(i) for i in range(args.uploads)])
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+
+    failed = sum(url is None for url in urls)
+    print(
+        f"[{mode:5}] uploads={args.uploads} failed={failed} elapsed={elapsed:.2f}s "
+        f"loop lag p50={percentile(lags, 0.5) * 1000:.1f}ms p99={percentile(lags, 0.99) * 1000:.1f}ms "
+        f"max={max(lags) * 1000:.1f}ms"
+    )
+
+    await asyncio.gather(*[storage.delete(os.path.join(BENCH_PREFIX, name)) for name in names])
+    await storage.close()
+
+
+async def main_async(args):
+    if args.simulated_latency_ms:
+        client = SimulatedS3Client(args.simulated_latency_ms / 1000)
+    else:
+        client = S3Client()
+    payload = os.urandom(args.size_kb * 1024)
+    for mode in ("sync", "async"):
+        await run(mode, client, args, payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동시 업로드 중 이벤트 루프 지연 측정")
+    parser.add_argument("--uploads", type=int, default=20, help="동시에 시작하는 업로드 수")
+    parser.add_argument("--size-kb", type=int, default=512, help="업로드 하나의 크기")
+    parser.add_argument("--interval-ms", type=float, default=5, help="지연 측정 ticker 주기")
+    parser.add_argument("--simulated-latency-ms", type=float, default=0, help="0이 아니면 MinIO 대신 가짜 클라이언트")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import asyncio
+import os
+import time
+
+from lms.api.books.facets import refresh_book_facets
+from lms.api.books.importer import (
+    IMPORT_BATCH_ROWS,
+    ImportFormat,
+    ImportProgress,
+    import_books,
+)
+from lms.api.books.search import close_search_client
+from lms.base.cache import cache
+from lms.database import engine
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="CSV/NDJSON 파일로 도서 대량 가져오기 (ISBN 기준 upsert)")
+    parser.add_argument("path", help="가져올 파일 경로 (.csv / .ndjson / .jsonl)")
+    parser.add_argument("--format", choices=[f.value for f in ImportFormat], help="생략하면 확장자로 판단")
+    parser.add_argument("--errors", help="거부된 행을 기록할 CSV 경로 (기본: <path>.errors.csv)")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_ROWS)
+    parser.add_argument("--no-index", action="store_true", help="검색 색인 생략 (나중에 poetry run reindex)")
+    return parser.parse_args()
+
+
+async def run(args):
+    if args.format:
+        format = ImportFormat(args.format)
+    else:
+        format = ImportFormat.csv if args.path.lower().endswith(".csv") else ImportFormat.ndjson
+    error_path = args.errors or f"{args.path}.errors.csv"
+    started = time.monotonic()
+
+    async def on_progress(progress: ImportProgress):
+        elapsed = time.monotonic() - started
+        print(
+            f"processed={progress.processed} created={progress.created} updated={progress.updated} "
+            f"rejected={progress.rejected} ({progress.processed / elapsed if elapsed else 0:.0f} rows/s)",
+            flush=True,
+        )
+
+    try:
+        async with engine.connect() as conn:
+            with (
+                open(args.path, encoding="utf-8-sig", newline="") as lines,
+                open(error_path, "w", encoding="utf-8", newline="") as errors,
+            ):
+                progress = await import_books(
+                    conn,
+                    lines,
+                    format,
+                    errors=errors,
+                    on_progress=on_progress,
+                    batch_size=args.batch_size,
+                    index=not args.no_index,
+                )
+        if progress.created or progress.updated:
+            await refresh_book_facets()
+    finally:
+        await cache.close()
+        await close_search_client()
+        await engine.dispose()
+
+    if progress.rejected:
+        print(f"Rejected rows written to {error_path}")
+    else:
+        os.remove(error_path)
+    print(f"Imported {progress.created + progress.updated} books in {time.monotonic() - started:.1f}s")
+
+
+def main():
+    asyncio.run(run(parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+인기 도서 한 권에 대출 요청이 동시에 몰리는 상황의 부하 테스트 (실행 중인 API 서버 대상)
+
+    poetry run python -m scripts.load_test_checkout [--base-url http://localhost:8012] [--stock 300] [--requests 500]
+
+- 재고 --stock권인 테스트 도서를 만들고 --concurrency개씩 동시에 --requests번 대출
+- 성공 건수 == min(stock, requests), 남은 재고 == stock - 성공 건수, 대출 id 중복 없음을 확인
+- --window 건 단위 처리량(req/s)과 지연 시간 분위수를 출력해서 처리량이 유지되는지 확인
+- 대출한 책을 모두 동시에 반납해서 재고가 원래대로 돌아오는지, 같은 대출의 중복 반납이 거부되는지 확인
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+
+import httpx
+
+
+def percentile(values, ratio: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+async def timed_post(client: httpx.AsyncClient, semaphore: asyncio.Semaphore, url: str, **kwargs):
+    async with semaphore:
+        started = time.perf_counter()
+        response = await client.post(url, **kwargs)
+        finished = time.perf_counter()
+    return response, finished - started, finished
+
+
+def report(label: str, results, started: float, window: int):
+    latencies = [latency for __, latency, __ in results]
+    finished_at = sorted(finished for __, __, finished in results)
+    elapsed = finished_at[-1] - started
+    print(
+        f"[{label}] requests={len(results)} elapsed={elapsed:.2f}s throughput={len(results) / elapsed:.0f} req/s "
+        f"p50={percentile(latencies, 0.5) * 1000:.1f}ms p95={percentile(latencies, 0.95) * 1000:.1f}ms "
+        f"p99={percentile(latencies, 0.99) * 1000:.1f}ms"
+    )
+
+    # 완료 순서 기준 window 건마다의 처리량 - 경합이 심해져도 떨어지지 않아야 함
+    rates = []
+    previous = started
+    for i in range(window - 1, len(finished_at), window):
+        rates.append(window / max(finished_at[i] - previous, 1e-9))
+        previous = finished_at[i]
+    if len(rates) > 1:
+        print(
+            f"[{label}] per-{window} throughput: "
+            + " ".join(f"{rate:.0f}" for rate in rates)
+            + f" (min/max={min(rates) / max(rates):.2f}, stdev={statistics.pstdev(rates):.0f})"
+        )
+
+
+async def run(args) -> bool:
+    ok = True
+    suffix = uuid.uuid4().hex[:10]
+    semaphore = asyncio.Semaphore(args.concurrency)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60, limits=limits) as client:
+        author = (await client.post("/api/authors/", json={"name": f"부하 테스트 저자 {suffix}"})).json()
+        book = (
+            await client.post(
+                "/api/books/",
+                json={
+                    "book_manage_id": f"LOADTEST_{suffix}",
+                    "title": f"부하 테스트 도서 {suffix}",
+                    "isbn": f"9{int(suffix, 16) % 10**12:012d}",
+                    "description": "checkout load test",
+                    "quantity": args.stock,
+                    "author_id": author["id"],
+                },
+            )
+        ).json()
+        book_url = f"/api/books/{book['book_manage_id']}"
+
+        try:
+            # 대출
+            started = time.perf_counter()
+            results = await asyncio.gather(
+                *[
+                    timed_post(client, semaphore, f"{book_url}/checkout", json={"borrower": f"user{i}"})
+                    for i in range(args.requests)
+                ]
+            )
+            report("checkout", results, started, args.window)
+
+            statuses = [response.status_code for response, __, __ in results]
+            loans = [response.json() for response, __, __ in results if response.status_code == 200]
+            others = [status for status in statuses if status not in (200, 409)]
+            expected = min(args.stock, args.requests)
+            quantity = (await client.get(book_url)).json()["quantity"]
+            print(
+                f"[checkout] succeeded={len(loans)} (expected {expected}) out_of_stock={statuses.count(409)} "
+                f"errors={len(others)} remaining={quantity} (expected {args.stock - expected})"
+            )
+            ok &= len(loans) == expected and not others
+            ok &= quantity == args.stock - expected
+            ok &= len({loan["id"] for loan in loans}) == len(loans)
+
+            # 반납
+            started = time.perf_counter()
+            results = await asyncio.gather(
+                *[timed_post(client, semaphore, f"{book_url}/return", json={"loan_id": loan["id"]}) for loan in loans]
+            )
+            if results:
+                report("return", results, started, args.window)
+            returned = sum(response.status_code == 200 for response, __, __ in results)
+            quantity = (await client.get(book_url)).json()["quantity"]
+            print(f"[return] succeeded={returned} (expected {len(loans)}) quantity={quantity} (expected {args.stock})")
+            ok &= returned == len(loans) and quantity == args.stock
+
+            # 같은 대출을 동시에 다시 반납 - 모두 거부되고 재고는 그대로여야 함
+            if loans:
+                results = await asyncio.gather(
+                    *[
+                        timed_post(client, semaphore, f"{book_url}/return", json={"loan_id": loans[0]["id"]})
+                        for __ in range(10)
+                    ]
+                )
+                quantity = (await client.get(book_url)).json()["quantity"]
+                duplicated = [response.status_code for response, __, __ in results]
+                print(f"[return] duplicate returns: {sorted(set(duplicated))} quantity={quantity}")
+                ok &= all(status == 409 for status in duplicated) and quantity == args.stock
+        finally:
+            await client.delete(book_url)
+            await client.delete(f"/api/authors/{author['id']}")
+
+    print("OK" if ok else "FAILED")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동시 대출/반납 부하 테스트")
+    parser.add_argument("--base-url", default="http://localhost:8012")
+    parser.add_argument("--stock", type=int, default=300, help="테스트 도서의 재고")
+    parser.add_argument("--requests", type=int, default=500, help="대출 요청 수 (재고보다 많으면 나머지는 409)")
+    parser.add_argument("--concurrency", type=int, default=200, help="동시에 보내는 요청 수")
+    parser.add_argument("--window", type=int, default=50, help="처리량을 나눠서 계산하는 단위(건)")
+    args = parser.parse_args()
+
+    sys.exit(0 if asyncio.run(run(args)) else 1)
+
+
+if __name__ == "__main__":
+    main()
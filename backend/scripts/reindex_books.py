@@ -0,0 +1,21 @@
+import asyncio
+
+from lms.api.books.search import close_search_client, reindex_books
+from lms.database import AsyncSessionLocal, engine
+
+
+async def reindex():
+    async with AsyncSessionLocal() as session:
+        result = await reindex_books(session)
+    print(f"Reindexed {result['indexed']} books into {result['index']} ({result['errors']} errors)")
+
+    await close_search_client()
+    await engine.dispose()
+
+
+def main():
+    asyncio.run(reindex())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import argparse
+import asyncio
+
+from lms.api.books.orphans import sweep_orphan_objects
+from lms.base.storage import storage
+from lms.config import settings
+from lms.database import engine
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="도서가 참조하지 않는 업로드 객체(내용 해시 키, 파생 이미지) 정리")
+    parser.add_argument("--dry-run", action="store_true", help="삭제하지 않고 대상 수만 출력")
+    parser.add_argument(
+        "--grace-hours",
+        type=float,
+        default=settings.STORAGE_ORPHAN_GRACE_SECONDS / 3600,
+        help="최근에 올라온 객체는 지우지 않는 유예 기간 (시간)",
+    )
+    return parser.parse_args()
+
+
+async def run(args):
+    try:
+        result = await sweep_orphan_objects(grace_seconds=int(args.grace_hours * 3600), dry_run=args.dry_run)
+    finally:
+        await storage.close()
+        await engine.dispose()
+    print(
+        f"scanned={result.scanned} referenced={result.referenced} recent={result.recent} "
+        f"{'would_delete' if args.dry_run else 'deleted'}={result.deleted} ({result.elapsed:.1f}s)",
+        flush=True,
+    )
+
+
+def main():
+    asyncio.run(run(parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import lms.api.books.model  # noqa: F401 - Author.books 관계 설정에 필요
+import pytest
+from lms.api.authors import suggest
+from lms.api.authors.suggest import AuthorSuggestIndex, normalize_name, prefix_query
+from sqlalchemy.dialects import postgresql
+
+
+def _index(*authors) -> AuthorSuggestIndex:
+    index = AuthorSuggestIndex()
+    index.build(authors)
+    index._built_at = 0.0
+    return index
+
+
+def test_normalize_name():
+    """한글 음절을 자모로 분해해서 조합 중인 입력도 접두어가 되는지 테스트"""
+    full = normalize_name("김철수")
+
+    assert full == "ㄱㅣㅁㅊㅓㄹㅅㅜ"
+    for typing in ("ㄱ", "기", "김", "김ㅊ", "김처", "김철", "김철ㅅ"):
+        assert full.startswith(normalize_name(typing))
+    # 겹받침은 입력 순서대로 분해 ("닭" 입력 중에도 "달걀"이 나오도록)
+    assert normalize_name("달걀").startswith(normalize_name("닭"))
+    assert normalize_name(" Kim Young ") == "kimyoung"
+
+
+@pytest.mark.parametrize(
+    "q, expected",
+    [
+        ("김", ["a3", "a1", "a2"]),
+        ("김ㅊ", ["a1", "a2"]),
+        ("김철수", ["a1"]),
+        ("kim", ["a4"]),
+        ("박", []),
+    ],
+)
+def test_suggest_orders_by_book_count(q, expected):
+    """접두어가 일치하는 저자를 도서 수 많은 순으로 반환하는지 테스트"""
+    index = _index(("a1", "김철수", 5), ("a2", "김철민", 1), ("a3", "김영희", 9), ("a4", "Kim Young", 0))
+
+    assert [suggestion.id for suggestion in index.suggest(q, 10)] == expected
+
+
+def test_suggest_incremental_update():
+    """저자 추가/수정/삭제가 다시 구성하지 않고 바로 반영되는지 테스트"""
+    index = _index(("a1", "김철수", 5), ("a2", "김철민", 1))
+    assert index.suggest("김", 1)[0].id == "a1"
+
+    index.add("a3", "김영희", 10)
+    assert index.suggest("김", 1)[0].id == "a3"
+
+    index.add("a3", "박영희", 10)
+    assert [suggestion.id for suggestion in index.suggest("김", 10)] == ["a1", "a2"]
+    assert index.suggest("박", 10)[0].name == "박영희"
+
+    index.remove("a3")
+    assert index.suggest("박", 10) == []
+    assert len(index) == 2
+
+
+@pytest.mark.asyncio
+async def test_rebuild_replays_concurrent_writes(monkeypatch):
+    """재구성 중(조회 후 교체 전)의 저자 추가/수정/삭제가 교체된 trie에 남는지 테스트"""
+    index = _index(("a1", "김철수", 5), ("a2", "김철민", 1))
+    rows = [("a1", "김철수", 5), ("a2", "김철민", 1)]
+
+    class _Session:
+        async def execute(self, query):
+            return SimpleNamespace(all=lambda: rows)
+
+    @asynccontextmanager
+    async def read_session():
+        yield _Session()
+
+    async def run_in_threadpool(func, *args):
+        # 스레드에서 구성하는 동안 API 쓰기가 들어온 상황
+        index.add("a3", "김영희", 9)
+        index.add("a1", "박철수", 5)
+        index.remove("a2")
+        func(*args)
+
+    monkeypatch.setattr(suggest, "read_session", read_session)
+    monkeypatch.setattr(suggest, "run_in_threadpool", run_in_threadpool)
+    await index.rebuild()
+
+    assert [suggestion.id for suggestion in index.suggest("김", 10)] == ["a3"]
+    assert [suggestion.id for suggestion in index.suggest("박", 10)] == ["a1"]
+    assert len(index) == 2
+    assert index._pending_writes == []
+
+
+def test_suggest_not_ready():
+    """구성 전에는 None을 반환해서 DB 접두어 검색으로 처리"""
+    assert AuthorSuggestIndex().suggest("김", 10) is None
+
+
+def test_prefix_query():
+    """LIKE 와일드카드를 이스케이프하고 lower(name) 접두어로 검색하는지 테스트"""
+    query = prefix_query("Kim_%", 5)
+    compiled = query.compile(dialect=postgresql.dialect())
+
+    assert "lower(authors.name) LIKE %(lower_1)s ESCAPE '\\\\'" in str(compiled)
+    assert compiled.params["lower_1"] == "kim\\_\\%%"
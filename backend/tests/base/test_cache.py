@@ -0,0 +1,278 @@
+import time
+from unittest.mock import patch
+
+import pytest
+from lms.base.cache import LocalLRUCache, ResponseCache, make_cache_key
+from redis.exceptions import WatchError
+
+
+def test_make_cache_key_normalizes_params():
+    """None/공백 파라미터와 키 순서가 캐시 키에 영향을 주지 않는지 테스트"""
+    key1 = make_cache_key("books:list", {"title": " 테스트 ", "author_name": None, "page": 1})
+    key2 = make_cache_key("books:list", {"page": 1, "title": "테스트", "author_name": ""})
+    key3 = make_cache_key("books:list", {"page": 2, "title": "테스트"})
+
+    assert key1 == key2
+    assert key1 != key3
+    assert key1.startswith("books:list:")
+
+
+def test_local_lru_cache_eviction_and_ttl():
+    """LRU 용량 초과 시 가장 오래 사용하지 않은 항목이 제거되고 TTL이 지나면 만료되는지 테스트"""
+    local = LocalLRUCache(max_size=2, ttl=10)
+    local.set("a", 1)
+    local.set("b", 2)
+    assert local.get("a") == 1  # a를 최근 사용으로 갱신
+    local.set("c", 3)
+
+    assert local.get("b") is None
+    assert local.get("a") == 1
+    assert local.get("c") == 3
+
+    with patch("lms.base.cache.time.monotonic", return_value=10**9):
+        assert local.get("a") is None
+
+
+def raise_connection_error():
+    raise ConnectionError("redis down")
+
+
+@pytest.fixture
+def local_only_cache():
+    """Redis에 연결할 수 없는 상황의 캐시"""
+    response_cache = ResponseCache(local_max_size=10, local_ttl=60, redis_ttl=60, enabled=True)
+    response_cache._ensure_listener = lambda: None
+    response_cache._get_redis = raise_connection_error
+    return response_cache
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_miss_counters(local_only_cache):
+    """Redis 장애 시에도 로컬 캐시로 동작하고 hit/miss가 집계되는지 테스트"""
+    assert await local_only_cache.get("book:1") is None
+    await local_only_cache.set("book:1", {"title": "테스트 도서"})
+    assert await local_only_cache.get("book:1") == {"title": "테스트 도서"}
+
+    stats = local_only_cache.stats()
+    assert stats["misses"] == 1
+    assert stats["local_hits"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_cache_invalidate_by_key_and_tag(local_only_cache):
+    """키/태그 단위 무효화 테스트"""
+    await local_only_cache.set("book:1", {"id": 1}, tags=["author:a"])
+    await local_only_cache.set("book:2", {"id": 2}, tags=["author:b"])
+    await local_only_cache.set("books:list:x", [{"id": 1}], tags=["books:list"])
+
+    await local_only_cache.invalidate(tags=["author:a", "books:list"])
+    assert local_only_cache.local.get("book:1") is None
+    assert local_only_cache.local.get("books:list:x") is None
+    assert local_only_cache.local.get("book:2") == {"id": 2}
+
+    await local_only_cache.invalidate(keys=["book:2"])
+    assert local_only_cache.local.get("book:2") is None
+
+
+def test_local_lru_cache_prunes_tags():
+    """용량 초과/만료로 제거된 항목이 태그 색인에 남지 않는지 테스트"""
+    local = LocalLRUCache(max_size=2, ttl=10)
+    local.set("a", 1, tags=["t1"])
+    local.set("b", 2, tags=["t1", "t2"])
+    local.set("c", 3, tags=["t3"])
+
+    assert "a" not in local._tags["t1"]
+    with patch("lms.base.cache.time.monotonic", return_value=10**9):
+        assert local.get("b") is None
+    assert local._tags == {"t3": {"c"}}
+
+    local.delete_tag("t3")
+    assert local.get("c") is None
+    assert local._tags == {}
+
+
+@pytest.mark.asyncio
+async def test_cache_fill_skips_invalidated(local_only_cache):
+    """조회 중에 키/태그가 무효화되면 조회 결과를 저장하지 않는지 테스트"""
+    fill = await local_only_cache.begin_fill("books:list:x", ["books:list"])
+    await local_only_cache.invalidate(tags=["books:list"])
+    await local_only_cache.set("books:list:x", [{"id": 1}], tags=["books:list"], fill=fill)
+    assert local_only_cache.local.get("books:list:x") is None
+
+    # 조회 후에야 아는 태그 (도서 상세의 저자 태그)
+    fill = await local_only_cache.begin_fill("book:1")
+    await local_only_cache.invalidate(tags=["author:a"])
+    await local_only_cache.set("book:1", {"id": 1}, tags=["author:a"], fill=fill)
+    assert local_only_cache.local.get("book:1") is None
+
+    # 관계없는 무효화는 저장에 영향 없음
+    fill = await local_only_cache.begin_fill("book:2")
+    await local_only_cache.invalidate(keys=["book:3"])
+    await local_only_cache.set("book:2", {"id": 2}, tags=["author:b"], fill=fill)
+    assert local_only_cache.local.get("book:2") == {"id": 2}
+
+    assert local_only_cache.stats()["stale_fills"] == 2
+    assert len(local_only_cache._fills) == 0
+
+
+class _FakePipeline:
+    """ResponseCache가 쓰는 명령만 흉내내는 Redis pipeline (WATCH 포함)"""
+
+    def __init__(self, redis, transaction):
+        self.redis = redis
+        self.transaction = transaction
+        self.commands = []
+        self.watched = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def watch(self, *keys):
+        self.watched = {key: self.redis.data.get(key) for key in keys}
+
+    async def mget(self, keys):
+        return await self.redis.mget(keys)
+
+    async def reset(self):
+        self.commands, self.watched = [], None
+
+    def multi(self):
+        pass
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append((name, args))
+
+    async def execute(self):
+        if self.watched and any(self.redis.data.get(key) != value for key, value in self.watched.items()):
+            raise WatchError("watched key changed")
+        for name, args in self.commands:
+            if name == "set":
+                self.redis.data[args[0]] = args[1]
+            elif name == "sadd":
+                self.redis.sets.setdefault(args[0], set()).update(args[1:])
+            elif name == "incr":
+                self.redis.data[args[0]] = str(int(self.redis.data.get(args[0], 0)) + 1)
+            elif name == "delete":
+                for key in args:
+                    self.redis.data.pop(key, None)
+                    self.redis.sets.pop(key, None)
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.sets = {}
+
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    async def smembers(self, key):
+        return set(self.sets.get(key, ()))
+
+    async def publish(self, channel, message):
+        pass
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self, transaction)
+
+
+@pytest.mark.asyncio
+async def test_cache_fill_skips_remote_invalidation():
+    """다른 레플리카가 조회 중에 무효화하면(Redis 세대 변경) Redis에도 로컬에도 저장하지 않는지 테스트"""
+    fake_redis = _FakeRedis()
+    writer, reader = (ResponseCache(local_max_size=10, local_ttl=60, redis_ttl=60, enabled=True) for __ in range(2))
+    for response_cache in (writer, reader):
+        response_cache._ensure_listener = lambda: None
+        response_cache._get_redis = lambda: fake_redis
+
+    fill = await reader.begin_fill("books:list:x", ["books:list"])
+    await writer.invalidate(tags=["books:list"])
+    await reader.set("books:list:x", [{"id": 1}], tags=["books:list"], fill=fill)
+
+    assert "cache:books:list:x" not in fake_redis.data
+    assert reader.local.get("books:list:x") is None
+    assert reader.stats()["stale_fills"] == 1
+
+    fill = await reader.begin_fill("books:list:x", ["books:list"])
+    await reader.set("books:list:x", [{"id": 2}], tags=["books:list"], fill=fill)
+    assert "cache:books:list:x" in fake_redis.data
+
+
+@pytest.mark.asyncio
+async def test_replica_fill_skipped_after_recent_invalidation(local_only_cache):
+    """무효화 직후(recent_window) 복제본에서 읽은 값은 저장하지 않고, primary에서 읽은 값은 저장하는지 테스트"""
+    local_only_cache.recent_window = 5
+    await local_only_cache.invalidate(keys=["book:1"], tags=["books:list"])
+
+    fill = await local_only_cache.begin_fill("book:1", replica=True)
+    await local_only_cache.set("book:1", {"id": 1}, fill=fill)
+    assert local_only_cache.local.get("book:1") is None
+
+    # 조회 후에 알게 된 태그
+    fill = await local_only_cache.begin_fill("books:list:x", replica=True)
+    await local_only_cache.set("books:list:x", [], tags=["books:list"], fill=fill)
+    assert local_only_cache.local.get("books:list:x") is None
+
+    fill = await local_only_cache.begin_fill("book:1")
+    await local_only_cache.set("book:1", {"id": 1}, fill=fill)
+    assert local_only_cache.local.get("book:1") == {"id": 1}
+
+    # 복제 지연 허용 시간이 지나면 복제본 값도 저장
+    with patch("lms.base.cache.time.monotonic", return_value=time.monotonic() + 10):
+        fill = await local_only_cache.begin_fill("books:list:x", ["books:list"], replica=True)
+        await local_only_cache.set("books:list:x", [], tags=["books:list"], fill=fill)
+        assert local_only_cache._recent == {}
+    assert local_only_cache.local.get("books:list:x") == []
+
+
+@pytest.mark.asyncio
+async def test_replica_fill_skipped_after_remote_invalidation():
+    """다른 레플리카의 무효화 직후에도 Redis의 최근 무효화 표시로 복제본 값을 저장하지 않는지 테스트"""
+    fake_redis = _FakeRedis()
+    writer, reader = (
+        ResponseCache(local_max_size=10, local_ttl=60, redis_ttl=60, enabled=True, recent_window=5) for __ in range(2)
+    )
+    for response_cache in (writer, reader):
+        response_cache._ensure_listener = lambda: None
+        response_cache._get_redis = lambda: fake_redis
+
+    await writer.invalidate(tags=["books:list"])
+    fill = await reader.begin_fill("books:list:x", ["books:list"], replica=True)
+    await reader.set("books:list:x", [{"id": 1}], tags=["books:list"], fill=fill)
+
+    assert "cache:books:list:x" not in fake_redis.data
+    assert reader.local.get("books:list:x") is None
+
+
+@pytest.mark.asyncio
+async def test_redis_hit_keeps_tags_in_local_cache():
+    """Redis에서 읽어서 로컬 캐시에 넣은 항목도 태그 무효화(로컬, pub/sub)로 지워지는지 테스트"""
+    fake_redis = _FakeRedis()
+    writer, reader = (ResponseCache(local_max_size=10, local_ttl=60, redis_ttl=60, enabled=True) for __ in range(2))
+    for response_cache in (writer, reader):
+        response_cache._ensure_listener = lambda: None
+        response_cache._get_redis = lambda: fake_redis
+
+    await writer.set("books:list:x", [{"id": 1}], tags=["books:list"])
+    await writer.set("book:1", {"id": 1}, tags=["author:a1"])
+    assert await reader.get("books:list:x") == [{"id": 1}]
+    assert await reader.get("book:1") == {"id": 1}
+    assert reader.stats()["redis_hits"] == 2
+
+    # 이 레플리카의 쓰기
+    await reader.invalidate(tags=["books:list"])
+    assert reader.local.get("books:list:x") is None
+    assert await reader.get("books:list:x") is None
+
+    # 다른 레플리카의 쓰기 (pub/sub 메시지)
+    reader._invalidate_local([], ["author:a1"])
+    assert reader.local.get("book:1") is None
+
+    # 태그를 모르는 항목은 Redis 값만 반환하고 로컬 캐시에 넣지 않음
+    fake_redis.data["cache:book:2"] = '{"id": 2}'
+    assert await reader.get("book:2") == {"id": 2}
+    assert reader.local.get("book:2") is None
@@ -0,0 +1,104 @@
+import time
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from lms import database
+from lms.database import (
+    PRIMARY_PIN_COOKIE,
+    PRIMARY_PIN_HEADER,
+    ReadYourWritesMiddleware,
+    ReplicaSet,
+    get_read_session,
+    is_pinned_session,
+    is_replica_session,
+)
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+
+@pytest.fixture
+def replica_set(tmp_path):
+    engines = [
+        create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/replica1.db"),
+        create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/replica2.db"),
+        # 연결할 수 없는 복제본
+        create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/missing/replica3.db"),
+    ]
+    return ReplicaSet(engines, retry_interval=60)
+
+
+@pytest.mark.asyncio
+async def test_replica_round_robin_and_health(replica_set):
+    """라운드 로빈으로 분산하고, 연결에 실패한 복제본은 다음 복제본으로 넘어간 뒤 재시도 시간까지 제외하는지 테스트"""
+    ok1, ok2, down = replica_set.engines
+
+    used = []
+    for __ in range(6):
+        session = await replica_set.connect()
+        assert is_replica_session(session)
+        used.append(session.bind)
+        await session.close()
+
+    # 세 번째 차례에서 실패한 복제본 대신 다음 복제본을 사용하고, 이후로는 건너뜀
+    assert used == [ok1, ok2, ok1, ok2, ok1, ok2]
+    assert replica_set.candidates() in ([ok1, ok2], [ok2, ok1])
+
+    # 재시도 시간이 지나면 다시 후보에 포함
+    replica_set._down_until[id(down)] = time.monotonic() - 1
+    assert down in replica_set.candidates()
+
+    await replica_set.dispose()
+
+
+def _pin_app(monkeypatch, replica_set):
+    monkeypatch.setattr(database, "replicas", replica_set)
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    @app.post("/write")
+    def write():
+        # primary 엔진의 commit 이벤트
+        database._record_commit(None)
+        return {}
+
+    @app.post("/read-only")
+    def read_only():
+        return {}
+
+    @app.get("/read")
+    async def read(session=Depends(get_read_session)):
+        await session.execute(text("SELECT 1"))
+        return {"pinned": is_pinned_session(session), "replica": session.bind in replica_set.engines}
+
+    return TestClient(app)
+
+
+@pytest.mark.asyncio
+async def test_read_your_writes(monkeypatch, tmp_path, replica_set):
+    """커밋한 요청에만 고정 토큰을 주고, 토큰이 유효한 동안 읽기를 primary로 보내는지 테스트"""
+    replica_set.engines.pop()
+    primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/primary.db")
+    monkeypatch.setattr(database, "AsyncSessionLocal", async_sessionmaker(primary, class_=AsyncSession))
+    client = _pin_app(monkeypatch, replica_set)
+
+    response = client.post("/read-only")
+    assert PRIMARY_PIN_HEADER not in response.headers
+    assert client.get("/read").json() == {"pinned": False, "replica": True}
+
+    response = client.post("/write")
+    until = float(response.headers[PRIMARY_PIN_HEADER])
+    assert time.time() < until <= time.time() + database.settings.DATABASE_PRIMARY_PIN_SECONDS
+    assert client.cookies[PRIMARY_PIN_COOKIE] == response.headers[PRIMARY_PIN_HEADER]
+
+    # 쿠키 (브라우저)
+    assert client.get("/read").json() == {"pinned": True, "replica": False}
+
+    # 만료된 토큰, 헤더 토큰 (쿠키를 쓰지 않는 클라이언트)
+    client.cookies.clear()
+    expired = {PRIMARY_PIN_HEADER: str(time.time() - 1)}
+    assert client.get("/read", headers=expired).json() == {"pinned": False, "replica": True}
+    assert client.get("/read", headers={PRIMARY_PIN_HEADER: str(until)}).json()["pinned"] is True
+
+    await replica_set.dispose()
+    await primary.dispose()
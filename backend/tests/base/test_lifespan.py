@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from lms import lifespan
+from lms.main import app
+from sqlalchemy.ext.asyncio import create_async_engine
+
+
+@pytest.mark.asyncio
+async def test_warm_pool(tmp_path):
+    """연결을 동시에 미리 열어서 풀에 반환해 두는지 테스트 (pool_size를 넘지 않음)"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/warm.db", pool_size=3)
+
+    assert await lifespan.warm_pool(engine, 10) == 3
+    assert engine.sync_engine.pool.checkedin() == 3
+
+    await engine.dispose()
+
+
+def test_ready_probe_and_shutdown(monkeypatch):
+    """DB 워밍업이 끝나야 ready가 되고, 선택 단계의 실패는 상태에만 기록되며, 종료 처리가 순서대로 실행되는지 테스트"""
+    database_ready = asyncio.Event()
+    calls = []
+
+    async def warm_database():
+        await database_ready.wait()
+        return 5
+
+    async def warm_s3():
+        raise ConnectionError("storage unavailable")
+
+    async def noop():
+        pass
+
+    def record(name):
+        async def step():
+            calls.append(name)
+
+        return step
+
+    monkeypatch.setattr(lifespan, "warm_database", warm_database)
+    monkeypatch.setattr(lifespan, "warm_s3", warm_s3)
+    monkeypatch.setattr(lifespan, "warm_redis", noop)
+    monkeypatch.setattr(lifespan, "prime_caches", noop)
+    monkeypatch.setattr(lifespan.broker.broker, "shutdown", record("broker"))
+    monkeypatch.setattr(lifespan, "_close_redis_client", record("redis"))
+    monkeypatch.setattr(lifespan.cache, "close", record("cache"))
+    monkeypatch.setattr(lifespan.storage, "close", record("storage"))
+    monkeypatch.setattr(lifespan.replicas, "dispose", record("replicas"))
+    monkeypatch.setattr(lifespan, "engine", type("Engine", (), {"dispose": staticmethod(record("database"))}))
+
+    with TestClient(app) as client:
+        response = client.get("/api/ready")
+        assert response.status_code == 503
+        assert response.json()["steps"]["database"] == "pending"
+
+        client.portal.call(database_ready.set)
+        for __ in range(100):
+            response = client.get("/api/ready")
+            if response.status_code == 200:
+                break
+            client.portal.call(asyncio.sleep, 0.01)
+
+        assert response.status_code == 200
+        steps = response.json()["steps"]
+        assert steps["database"] == "ok (5)"
+        assert steps["s3"] == "failed: storage unavailable"
+        assert steps["redis"] == steps["caches"] == "ok"
+
+    assert calls == ["broker", "redis", "cache", "storage", "replicas", "database"]
@@ -0,0 +1,108 @@
+import asyncio
+import hashlib
+import io
+import threading
+import time
+
+import pytest
+from botocore.stub import Stubber
+from fastapi import UploadFile
+from lms.base import storage as storage_module
+from lms.base.storage import AsyncS3Client
+from starlette.datastructures import Headers
+
+
+class _BlockingS3Client:
+    """boto3처럼 호출한 스레드를 막는 가짜 동기 클라이언트"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.threads = set()
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def upload_file(self, file_obj, path_prefix, object_name=None):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return f"{path_prefix}/{object_name}"
+
+    def delete_file(self, path):
+        return True
+
+
+@pytest.mark.asyncio
+async def test_async_storage_does_not_block_event_loop():
+    """동시 업로드 중에도 이벤트 루프가 멈추지 않고, 동시 전송 수는 스레드 수로 제한되는지 테스트"""
+    client = _BlockingS3Client(delay=0.1)
+    storage = AsyncS3Client(client, max_workers=2)
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    urls = await asyncio.gather(*[storage.upload(None, "media/cover", f"{i}.jpg") for i in range(4)])
+    elapsed = time.perf_counter() - started
+    task.cancel()
+
+    assert urls == [f"media/cover/{i}.jpg" for i in range(4)]
+    assert client.max_active == 2
+    assert all(name.startswith("storage") for name in client.threads)
+    # 4건 / 2스레드 x 0.1초 - 그동안 ticker가 계속 실행됨
+    assert 0.19 < elapsed < 0.4
+    assert ticks >= 10
+    assert await storage.delete("media/cover/0.jpg") is True
+
+    await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_async_storage_uses_module_client(monkeypatch):
+    """클라이언트를 지정하지 않으면 호출 시점의 모듈 s3_client를 사용하는지 테스트 (테스트용 교체 지원)"""
+    client = _BlockingS3Client(delay=0)
+    monkeypatch.setattr(storage_module, "s3_client", client)
+    storage = AsyncS3Client()
+
+    assert await storage.upload(None, "media/import", "errors.csv") == "media/import/errors.csv"
+
+    await storage.close()
+
+
+def test_multipart_threshold_within_upload_limit():
+    """업로드 최대 크기의 파일이 multipart 경로를 타도록 임계값이 최대 크기 이하인지 테스트"""
+    from lms.api.books.api import MAX_FILE_SIZE_MEGA
+
+    assert storage_module.settings.STORAGE_MULTIPART_THRESHOLD <= MAX_FILE_SIZE_MEGA * 1024 * 1024
+    assert storage_module.settings.STORAGE_MULTIPART_CHUNKSIZE >= 5 * 1024 * 1024
+
+
+def test_upload_content_addressed_multipart():
+    """임계값 이상인 파일은 TransferConfig에 따라 multipart upload로 전송하는지 테스트 (boto3 Stubber)"""
+    data = b"\x89PNG\r\n\x1a\n" + b"\x00" * (storage_module.settings.STORAGE_MULTIPART_THRESHOLD - 8)
+    client = storage_module.S3Client()
+    key = f"media/cover/{hashlib.sha256(data).hexdigest()}.png"
+
+    with Stubber(client.client) as stubber:
+        stubber.add_client_error("head_object", "404", expected_params={"Bucket": client.bucket_name, "Key": key})
+        stubber.add_response("create_multipart_upload", {"UploadId": "upload-1"})
+        stubber.add_response("upload_part", {"ETag": '"etag-1"'})
+        stubber.add_response("complete_multipart_upload", {})
+
+        url = client.upload_content_addressed(
+            UploadFile(file=io.BytesIO(data), filename="cover.png", headers=Headers({"content-type": "image/png"})),
+            "media/cover",
+        )
+        stubber.assert_no_pending_responses()
+
+    assert url == f"{storage_module.settings.AWS_S3_CLIENT_URL_BASE}/{key}"
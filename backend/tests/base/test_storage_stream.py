@@ -0,0 +1,165 @@
+import hashlib
+import io
+
+import pytest
+from botocore.exceptions import ClientError
+from fastapi import UploadFile
+from lms.base import storage as storage_module
+from lms.base.storage import AsyncS3Client, S3Client, _sniff_image, is_content_addressed
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 600
+
+
+class _RecordingBoto:
+    """호출을 기록하는 가짜 boto3 클라이언트 - existing에 있는 키만 HEAD 성공"""
+
+    def __init__(self, existing=()):
+        self.calls = []
+        self.existing = set(existing)
+
+    def head_object(self, **kwargs):
+        self.calls.append(("head_object", None, kwargs))
+        if kwargs["Key"] not in self.existing:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {}
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            body = kwargs.get("Body")
+            self.calls.append((name, len(body) if body is not None else None, kwargs))
+            if name == "create_multipart_upload":
+                return {"UploadId": "upload-1"}
+            if name == "upload_part":
+                return {"ETag": f"etag-{kwargs['PartNumber']}"}
+            return {}
+
+        return call
+
+
+def _client(existing=()):
+    client = S3Client.__new__(S3Client)
+    client.client = _RecordingBoto(existing)
+    client.bucket_name = "lms"
+    client.transfer_config = None
+    return client
+
+
+def _key(data: bytes, extension: str) -> str:
+    return f"media/cover/{hashlib.sha256(data).hexdigest()}{extension}"
+
+
+async def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+@pytest.fixture(autouse=True)
+def small_parts(monkeypatch):
+    monkeypatch.setattr(storage_module.settings, "STORAGE_STREAM_PART_SIZE", 1000)
+    monkeypatch.setattr(storage_module.settings, "STORAGE_STREAM_MAX_SIZE", 5000)
+
+
+def _calls(storage):
+    return [(name, size) for name, size, __ in storage.sync.client.calls]
+
+
+def test_sniff_image():
+    assert _sniff_image(b"\xff\xd8\xff\xe0") == ("image/jpeg", ".jpg")
+    assert _sniff_image(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == ("image/webp", ".webp")
+    with pytest.raises(ValueError):
+        _sniff_image(b"<html>")
+    # 인라인 아이콘이 있는 HTML 오류 페이지, SVG 문서
+    for body in (b'<html><body><svg viewBox="0 0 1 1"></svg>Not Found</body></html>', b"<svg></svg>"):
+        with pytest.raises(ValueError, match="Unsupported"):
+            _sniff_image(body)
+
+
+@pytest.mark.asyncio
+async def test_upload_stream_small_file():
+    """한 part보다 작으면 내용 해시 키로 PutObject 한 번, 확장자와 Content-Type은 판별한 형식으로 정하는지 테스트"""
+    storage = AsyncS3Client(_client(), max_workers=1)
+    url = await storage.upload_stream(_chunks(PNG, 100), "media/cover")
+
+    assert url.endswith(_key(PNG, ".png"))
+    assert is_content_addressed(url)
+    assert _calls(storage) == [("head_object", None), ("put_object", len(PNG))]
+    assert storage.sync.client.calls[1][2]["ContentType"] == "image/png"
+    await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_upload_stream_multipart():
+    """part 크기만큼 모아서 임시 키로 전송하고 (메모리에는 part 하나만), 완료 후 내용 해시 키로 복사하는지 테스트"""
+    storage = AsyncS3Client(_client(), max_workers=1)
+    data = PNG + b"\x01" * 1900
+    url = await storage.upload_stream(_chunks(data, 300), "media/cover")
+
+    calls = storage.sync.client.calls
+    assert url.endswith(_key(data, ".png"))
+    assert _calls(storage) == [
+        ("create_multipart_upload", None),
+        ("upload_part", 1000),
+        ("upload_part", 1000),
+        ("upload_part", len(data) - 2000),
+        ("complete_multipart_upload", None),
+        ("head_object", None),
+        ("copy_object", None),
+        ("delete_object", None),
+    ]
+    temp_key = calls[0][2]["Key"]
+    assert temp_key.startswith("media/cover/tmp/")
+    assert calls[4][2]["MultipartUpload"]["Parts"][2] == {"PartNumber": 3, "ETag": "etag-3"}
+    assert calls[6][2]["CopySource"]["Key"] == calls[7][2]["Key"] == temp_key
+    await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_upload_stream_deduplicates():
+    """같은 내용이 이미 있으면 업로드하지 않고 기존 키를 반환하고, LastModified만 갱신(자기 자신으로 복사)하는지 테스트"""
+    data = PNG + b"\x01" * 1900
+    storage = AsyncS3Client(_client(existing=[_key(PNG, ".png"), _key(data, ".png")]), max_workers=1)
+
+    assert (await storage.upload_stream(_chunks(PNG, 100), "media/cover")).endswith(_key(PNG, ".png"))
+    assert _calls(storage) == [("head_object", None), ("copy_object", None)]
+    touch = storage.sync.client.calls[1][2]
+    assert touch["Key"] == touch["CopySource"]["Key"] == _key(PNG, ".png")
+    assert (touch["ContentType"], touch["MetadataDirective"]) == ("image/png", "REPLACE")
+
+    await storage.upload_stream(_chunks(data, 300), "media/cover")
+    assert [name for name, __ in _calls(storage)][-4:] == [
+        "complete_multipart_upload",
+        "head_object",
+        "copy_object",
+        "delete_object",
+    ]
+    await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_upload_stream_rejects():
+    """이미지가 아니면 업로드 전에, 최대 크기를 넘으면 진행 중인 multipart upload를 abort 하고 실패하는지 테스트"""
+    storage = AsyncS3Client(_client(), max_workers=1)
+    with pytest.raises(ValueError, match="Unsupported"):
+        await storage.upload_stream(_chunks(b"<html>" + b" " * 600, 100), "media/cover")
+    assert storage.sync.client.calls == []
+
+    with pytest.raises(ValueError, match="exceeds"):
+        await storage.upload_stream(_chunks(PNG + b"\x01" * 6000, 500), "media/cover")
+    assert _calls(storage)[-1] == ("abort_multipart_upload", None)
+    await storage.close()
+
+
+def test_upload_content_addressed():
+    """업로드 파일도 내용 해시 키로 저장하고, 이미 있으면 업로드 없이 LastModified만 갱신하는지, 해시 키 객체는 교체 시 지우지 않는지 테스트"""
+    client = _client()
+    url = client.upload_content_addressed(UploadFile(file=io.BytesIO(PNG), filename="Cover.PNG"), "media/cover")
+    assert url.endswith(_key(PNG, ".png"))
+    assert [name for name, __, __ in client.client.calls] == ["head_object", "upload_fileobj"]
+
+    client.client.existing.add(_key(PNG, ".png"))
+    assert client.upload_content_addressed(UploadFile(file=io.BytesIO(PNG), filename="a.png"), "media/cover") == url
+    assert [name for name, __, __ in client.client.calls][-2:] == ["head_object", "copy_object"]
+    assert client.client.calls[-1][2]["ContentType"] == "image/png"
+
+    client.set_file(url, None, "media/cover")
+    assert "delete_object" not in [name for name, __, __ in client.client.calls]
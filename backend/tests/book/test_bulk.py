@@ -0,0 +1,47 @@
+from lms.api.books.api import (
+    BOOK_CONSTRAINT_MESSAGES,
+    BULK_UPDATE_COLUMNS,
+    _upsert_books_query,
+)
+from lms.util.utils import db_error_reason
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+
+
+def _row(isbn: str, book_manage_id: str):
+    return {
+        "book_manage_id": book_manage_id,
+        "title": "테스트 도서",
+        "isbn": isbn,
+        "author_id": "author_1",
+        "description": None,
+        "quantity": 1,
+    }
+
+
+def test_upsert_books_query():
+    """ISBN 충돌 시 관리번호를 제외한 컬럼만 갱신하고 생성 여부를 RETURNING 하는지 테스트"""
+    query = _upsert_books_query([_row("9788901272580", "B1"), _row("9788901272581", "B2")])
+    sql = str(query.compile(dialect=postgresql.dialect()))
+
+    assert "ON CONFLICT (isbn) DO UPDATE SET" in sql
+    assert "book_manage_id = excluded.book_manage_id" not in sql
+    assert "title = excluded.title" in sql
+    assert "modified = now()" in sql
+    assert "RETURNING books.id, books.isbn, books.book_manage_id, xmax = 0 AS created" in sql
+    assert "isbn" not in BULK_UPDATE_COLUMNS
+
+
+class _FakeAsyncpgError(Exception):
+    sqlstate = "23505"
+    constraint_name = "ix_books_book_manage_id"
+
+
+def test_db_error_reason():
+    """asyncpg 예외의 제약 조건 이름을 사용자 메시지로 변환하는지 테스트"""
+    orig = Exception("duplicate key value")
+    orig.__cause__ = _FakeAsyncpgError("duplicate key value violates unique constraint")
+    error = IntegrityError("INSERT ...", {}, orig)
+
+    assert db_error_reason(error, BOOK_CONSTRAINT_MESSAGES) == "Book manage id already exists"
+    assert db_error_reason(error) == "Constraint violated: ix_books_book_manage_id"
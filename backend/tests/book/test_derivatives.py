@@ -0,0 +1,158 @@
+import asyncio
+import base64
+import hashlib
+import io
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+from lms.api.books import derivatives
+from lms.api.books.derivatives import (
+    CoverDerivatives,
+    generate_cover_derivatives,
+    needs_cover_derivatives,
+)
+from lms.util.images import render_cover_derivatives
+from PIL import Image
+from sqlalchemy.dialects import postgresql
+
+URL_BASE = derivatives.settings.AWS_S3_CLIENT_URL_BASE
+
+
+def _image(size=(600, 900), mode="RGBA", format="PNG") -> bytes:
+    output = io.BytesIO()
+    Image.new(mode, size, (200, 30, 30, 128)[: len(mode)]).save(output, format=format)
+    return output.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_render_in_process_pool():
+    """프로세스 풀에서 너비별 JPEG/WebP와 미리보기를 만들고, 원본보다 큰 너비는 원본 너비로 합치는지 테스트"""
+    pool = derivatives.get_process_pool()
+    try:
+        rendered = await asyncio.get_running_loop().run_in_executor(
+            pool, render_cover_derivatives, _image(), (120, 240, 480, 1000)
+        )
+    finally:
+        await derivatives.close_process_pool()
+
+    assert [(v.width, v.height) for v in rendered.variants] == [(120, 180), (240, 360), (480, 720), (600, 900)]
+    for variant in rendered.variants:
+        assert Image.open(io.BytesIO(variant.jpeg)).format == "JPEG"
+        assert Image.open(io.BytesIO(variant.webp)).format == "WEBP"
+        assert len(variant.webp) < len(variant.jpeg)
+
+    prefix = "data:image/jpeg;base64,"
+    assert rendered.placeholder.startswith(prefix)
+    placeholder = Image.open(io.BytesIO(base64.b64decode(rendered.placeholder[len(prefix) :])))
+    assert placeholder.size == (16, 24)
+    assert len(rendered.placeholder) < 1024
+
+
+def test_needs_cover_derivatives_sql():
+    """표지가 있고 파생 이미지가 없거나 다른 표지로 만든 도서만 대상으로 하는지 테스트"""
+    sql = str(needs_cover_derivatives().compile(dialect=postgresql.dialect()))
+
+    assert "books._cover_image != " in sql
+    assert "books.cover_derivatives IS NULL" in sql
+    assert "(books.cover_derivatives ->> " in sql
+
+
+class _Row(tuple):
+    @property
+    def _cover_image(self):
+        return self[1]
+
+
+class _FakeSession:
+    """books 행 하나를 dict로 흉내내는 세션 (SELECT 한 번, 조건부 UPDATE 한 번)"""
+
+    def __init__(self, db):
+        self.db = db
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        if statement.is_select:
+            row = (self.db["book_manage_id"], self.db["_cover_image"], self.db["cover_derivatives"])
+            return SimpleNamespace(one_or_none=lambda: _Row(row))
+        # 생성 중 표지가 바뀐 경우를 흉내
+        if self.db.pop("replace_cover", None):
+            self.db["_cover_image"] = "changed"
+            return SimpleNamespace(rowcount=0)
+        self.db["cover_derivatives"] = statement.compile().params["cover_derivatives"]
+        return SimpleNamespace(rowcount=1)
+
+    async def commit(self):
+        pass
+
+
+class _FakeStorage:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.put_keys = []
+
+    async def read(self, key, max_size):
+        assert key == "media/cover/a.png"
+        return self.data
+
+    async def put(self, key, body, content_type, cache_control=None):
+        self.put_keys.append((key, content_type))
+        return f"{URL_BASE}/{key}"
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    db = {"book_manage_id": "B1", "_cover_image": f"{URL_BASE}/media/cover/a.png", "cover_derivatives": None}
+    storage = _FakeStorage(_image((300, 450)))
+    invalidated = []
+
+    async def invalidate_book(book_manage_id):
+        invalidated.append(book_manage_id)
+
+    monkeypatch.setattr(derivatives, "AsyncSessionLocal", lambda: _FakeSession(db))
+    monkeypatch.setattr(derivatives, "storage", storage)
+    monkeypatch.setattr(derivatives, "invalidate_book", invalidate_book)
+    monkeypatch.setattr(derivatives, "get_process_pool", lambda: executor)
+    monkeypatch.setattr(derivatives.settings, "COVER_DERIVATIVE_WIDTHS", [120, 240, 480])
+    executor = ThreadPoolExecutor(max_workers=1)
+    yield SimpleNamespace(db=db, storage=storage, invalidated=invalidated)
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_generate_cover_derivatives(pipeline):
+    """파생 이미지를 원본 해시 키에 저장하고 도서에 기록한 뒤, 같은 표지는 다시 만들지 않는지 테스트"""
+    result = await generate_cover_derivatives("book_1")
+
+    assert isinstance(result, CoverDerivatives)
+    assert [v.width for v in result.variants] == [120, 240, 300]
+    assert pipeline.db["cover_derivatives"] == result.model_dump()
+    assert pipeline.invalidated == ["B1"]
+    digest = hashlib.sha256(pipeline.storage.data).hexdigest()
+    assert sorted(pipeline.storage.put_keys) == sorted(
+        (f"media/cover/derivatives/{digest}/w{width}.{ext}", content_type)
+        for width in (120, 240, 300)
+        for ext, content_type in (("jpg", "image/jpeg"), ("webp", "image/webp"))
+    )
+    assert result.variants[0].webp == f"{URL_BASE}/media/cover/derivatives/{digest}/w120.webp"
+
+    # 현재 표지로 이미 만들었으면 건너뜀
+    assert await generate_cover_derivatives("book_1") == result
+    assert len(pipeline.storage.put_keys) == 6
+
+
+@pytest.mark.asyncio
+async def test_generate_cover_derivatives_skips(pipeline):
+    """외부 URL 표지는 건너뛰고, 생성 중 표지가 바뀌면 결과를 저장하지 않는지 테스트"""
+    pipeline.db["replace_cover"] = True
+    assert await generate_cover_derivatives("book_1") is None
+    assert pipeline.db["cover_derivatives"] is None
+    assert pipeline.invalidated == []
+
+    pipeline.db["_cover_image"] = "https://image.aladin.co.kr/cover.jpg"
+    assert await generate_cover_derivatives("book_1") is None
@@ -0,0 +1,59 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+import pytest
+from lms.api.books import api as books_api
+from lms.api.books.api import EXPORT_FIELDS, ExportFormat, _export_chunks
+
+
+async def _rows(count: int):
+    for i in range(count):
+        row = dict.fromkeys(EXPORT_FIELDS)
+        row.update(
+            id=f"book_{i}",
+            title=f"테스트, 도서 {i}",
+            description="첫 줄\n둘째 줄",
+            quantity=i,
+            created=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        )
+        yield tuple(row[field] for field in EXPORT_FIELDS)
+
+
+async def _collect(format: ExportFormat, count: int):
+    return [chunk async for chunk in _export_chunks(_rows(count), format)]
+
+
+@pytest.mark.asyncio
+async def test_export_ndjson(monkeypatch):
+    """한 줄에 한 건씩 JSON으로 쓰고 EXPORT_CHUNK_ROWS 단위로 나눠 내보내는지 테스트"""
+    monkeypatch.setattr(books_api, "EXPORT_CHUNK_ROWS", 2)
+    chunks = await _collect(ExportFormat.ndjson, 5)
+
+    assert len(chunks) == 3
+    lines = "".join(chunks).splitlines()
+    assert len(lines) == 5
+    first = json.loads(lines[0])
+    assert first["title"] == "테스트, 도서 0"
+    assert first["description"] == "첫 줄\n둘째 줄"
+    assert first["created"] == "2024-01-01T00:00:00+00:00"
+
+
+@pytest.mark.asyncio
+async def test_export_csv():
+    """헤더 행과 함께 쉼표/줄바꿈이 포함된 값을 CSV로 올바르게 내보내는지 테스트"""
+    chunks = await _collect(ExportFormat.csv, 3)
+
+    content = "".join(chunks).lstrip("\ufeff")
+    rows = list(csv.reader(io.StringIO(content)))
+    assert rows[0] == EXPORT_FIELDS
+    assert len(rows) == 4
+    assert rows[1][EXPORT_FIELDS.index("title")] == "테스트, 도서 0"
+    assert rows[1][EXPORT_FIELDS.index("description")] == "첫 줄\n둘째 줄"
+
+
+@pytest.mark.asyncio
+async def test_export_empty_ndjson():
+    """조회 결과가 없으면 빈 본문"""
+    assert await _collect(ExportFormat.ndjson, 0) == []
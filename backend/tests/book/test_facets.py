@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from lms import broker
+from lms.api.books.facets import book_facets_query, fetch_book_facets
+from sqlalchemy.dialects import postgresql
+
+REFRESHED_AT = datetime.now(timezone.utc) - timedelta(minutes=3)
+
+
+def _row(facet, bucket, book_count, stock, label=None, lower=None, upper=None):
+    return SimpleNamespace(
+        facet=facet,
+        bucket=bucket,
+        label=label,
+        lower=lower,
+        upper=upper,
+        book_count=book_count,
+        stock=stock,
+        refreshed_at=REFRESHED_AT,
+    )
+
+
+class _FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def execute(self, query):
+        return SimpleNamespace(all=lambda: self.rows)
+
+
+def test_book_facets_query():
+    """상위 저자만 LIMIT으로 자르고 나머지 facet은 전부 조회하는 단일 쿼리인지 테스트"""
+    sql = str(book_facets_query(20).compile(dialect=postgresql.dialect()))
+
+    assert sql.count("FROM book_facets") == 2
+    assert "ORDER BY book_facets.book_count DESC" in sql
+    assert ") UNION ALL SELECT" in sql
+
+
+@pytest.mark.asyncio
+async def test_fetch_book_facets():
+    """facet별로 묶고 저자는 도서 수 순, 구간은 구간 순으로 정렬하는지 테스트"""
+    rows = [
+        _row("price", "unknown", 1, 0),
+        _row("author", "a1", 2, 5, label="저자1"),
+        _row("price", "4", 1, 3, lower=50000),
+        _row("price", "0", 2, 2, upper=10000),
+        _row("author", "a2", 3, 1, label="저자2"),
+        _row("page_count", "2", 4, 8, lower=200, upper=300),
+        _row("total", "all", 5, 8),
+    ]
+    facets = await fetch_book_facets(_FakeSession(rows), author_limit=20)
+
+    assert [bucket.key for bucket in facets.authors] == ["a2", "a1"]
+    assert [bucket.key for bucket in facets.price] == ["0", "4", "unknown"]
+    assert facets.price[0].upper == 10000 and facets.price[0].lower is None
+    assert len(facets.page_count) == 1
+    assert (facets.total_books, facets.total_stock) == (5, 8)
+    assert facets.refreshed_at == REFRESHED_AT
+    assert 170 < facets.stale_seconds < 300
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+@pytest.mark.asyncio
+async def test_schedule_facets_refresh(monkeypatch):
+    """갱신이 시작되기 전의 중복 요청은 한 번만 태스크로 보내고, 갱신이 시작되면 다시 요청을 받는지 테스트"""
+    client = _FakeRedis()
+    kicked = []
+
+    async def get_redis_client():
+        return client
+
+    async def kiq():
+        kicked.append(True)
+
+    async def refresh_book_facets():
+        pass
+
+    monkeypatch.setattr(broker, "get_redis_client", get_redis_client)
+    monkeypatch.setattr(broker.refresh_book_facets_task, "kiq", kiq)
+    monkeypatch.setattr(broker, "refresh_book_facets", refresh_book_facets)
+
+    await broker.schedule_facets_refresh()
+    await broker.schedule_facets_refresh()
+    assert len(kicked) == 1
+
+    await broker.refresh_book_facets_task.original_func()
+    await broker.schedule_facets_refresh()
+    assert len(kicked) == 2
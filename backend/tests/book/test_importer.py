@@ -0,0 +1,139 @@
+import csv
+import io
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+from lms.api.books import importer
+from lms.api.books.importer import ImportFormat, import_books, iter_import_records
+
+
+def _ndjson(*records):
+    return io.StringIO("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
+
+
+def _record(isbn: str, book_manage_id: str, **extra):
+    return {
+        "book_manage_id": book_manage_id,
+        "title": "테스트 도서",
+        "isbn": isbn,
+        "author_name": "테스트 저자",
+        **extra,
+    }
+
+
+def test_iter_import_records_csv():
+    """CSV 빈 칸은 None으로, 줄 번호와 함께 반환하는지 테스트"""
+    lines = io.StringIO("book_manage_id,title,isbn,author_name,price\nB1,도서,9788901272580,저자,\n")
+
+    records = list(iter_import_records(lines, ImportFormat.csv))
+
+    assert records == [
+        (2, {"book_manage_id": "B1", "title": "도서", "isbn": "9788901272580", "author_name": "저자", "price": None})
+    ]
+
+
+def test_iter_import_records_ndjson_invalid_line():
+    """잘못된 JSON 줄은 오류 메시지로 반환하고 빈 줄은 건너뛰는지 테스트"""
+    lines = io.StringIO('{"isbn": "1"}\n\nnot json\n[1]\n')
+
+    records = list(iter_import_records(lines, ImportFormat.ndjson))
+
+    assert records[0] == (1, {"isbn": "1"})
+    assert records[1][0] == 3 and records[1][1].startswith("Invalid JSON")
+    assert records[2] == (4, "Invalid JSON: object expected")
+
+
+@pytest.fixture
+def loaded(monkeypatch):
+    """DB 적재 대신 배치별 (line, isbn) 목록을 기록"""
+    batches = []
+
+    async def fake_load_batch(conn, batch, raw_records, progress, errors):
+        batches.append([(line, record.isbn) for line, record in batch])
+        progress.created += len(batch)
+        return [f"id_{record.isbn}" for __, record in batch]
+
+    monkeypatch.setattr(importer, "_load_batch", fake_load_batch)
+    monkeypatch.setattr(importer, "index_books_by_id", AsyncMock())
+    return batches
+
+
+@pytest.mark.asyncio
+async def test_import_books_batches_and_errors(loaded):
+    """검증 실패/중복 행을 오류 파일에 기록하고 나머지를 배치 단위로 적재하는지 테스트"""
+    lines = _ndjson(
+        _record("978-89-01-27258-0", "B1"),
+        _record("9788901272581", "B2", quantity=-1),
+        _record("9788901272582", "B1"),
+        _record("9788901272583", "B3"),
+        _record("9788901272580", "B1", title="새 제목"),
+        {"isbn": "9788901272584"},
+    )
+    errors = io.StringIO()
+    progress_calls = []
+
+    async def on_progress(progress):
+        progress_calls.append(progress.model_copy())
+
+    conn = AsyncMock()
+    progress = await import_books(conn, lines, ImportFormat.ndjson, errors=errors, on_progress=on_progress)
+
+    # ISBN 하이픈 제거, 같은 ISBN은 나중 행(5번째 줄)으로 대체
+    assert loaded == [[(5, "9788901272580"), (4, "9788901272583")]]
+    assert progress.processed == 6
+    assert progress.created == 2
+    assert progress.rejected == 4
+    assert progress_calls[-1].processed == 6
+
+    rows = list(csv.reader(io.StringIO(errors.getvalue())))
+    reasons = {int(line): reason for line, reason, __ in rows[1:]}
+    assert reasons[1] == "Superseded by line 5"
+    assert reasons[2].startswith("quantity")
+    assert reasons[3] == "Duplicate book_manage_id in file"
+    assert reasons[6].startswith("book_manage_id")
+    importer.index_books_by_id.assert_awaited_once_with(["id_9788901272580", "id_9788901272583"])
+
+
+@pytest.mark.asyncio
+async def test_import_books_splits_batches(loaded):
+    """batch_size 단위로 나눠 적재하는지 테스트"""
+    lines = _ndjson(*[_record(f"97889012725{i:02d}", f"B{i}") for i in range(5)])
+
+    progress = await import_books(AsyncMock(), lines, ImportFormat.ndjson, batch_size=2)
+
+    assert [len(batch) for batch in loaded] == [2, 2, 1]
+    assert progress.created == 5
+
+
+@pytest.mark.asyncio
+async def test_import_books_blank_cells_use_defaults(loaded):
+    """CSV/NDJSON의 빈 칸은 기본값(quantity 0)으로, 빈 필수 컬럼은 누락으로 처리하는지 테스트"""
+    lines = io.StringIO(
+        "book_manage_id,title,isbn,author_name,quantity,price\n"
+        "B1,도서,9788901272580,저자,,\n"
+        "B2,도서,9788901272581,저자, ,1000\n"
+        "B3, ,9788901272582,저자,1,\n"
+    )
+    errors = io.StringIO()
+
+    progress = await import_books(AsyncMock(), lines, ImportFormat.csv, errors=errors)
+
+    assert loaded == [[(2, "9788901272580"), (3, "9788901272581")]]
+    assert progress.rejected == 1
+    rows = list(csv.reader(io.StringIO(errors.getvalue())))
+    assert rows[1][:2] == ["4", "title: Field required"]
+
+    record = importer.BookImportRecord.model_validate(_record("9788901272583", "B4", quantity="", price=None))
+    assert record.quantity == 0 and record.price is None
+
+
+@pytest.mark.parametrize("description", [None, "", "  "])
+def test_import_record_blank_description(description):
+    """description이 없거나 빈 칸이면 NOT NULL 컬럼에 맞게 빈 문자열로 저장하는지 테스트"""
+    values = _record("9788901272580", "B1")
+    values.pop("description", None)
+    if description is not None:
+        values["description"] = description
+    assert importer.BookImportRecord.model_validate(values).description == ""
+    assert importer.BookImportRecord.model_validate({**values, "description": None}).description == ""
@@ -0,0 +1,38 @@
+from lms.api.books.api import (
+    BookFields,
+    BookFilter,
+    BookOrder,
+    BookSummaryResponse,
+    _book_list_options,
+    _books_query,
+)
+from sqlalchemy.dialects import postgresql
+
+
+def _list_sql(fields: BookFields) -> str:
+    query, __, __ = _books_query(BookFilter(), BookOrder.latest)
+    return str(query.options(*_book_list_options(fields)).compile(dialect=postgresql.dialect()))
+
+
+def test_summary_list_does_not_select_text_columns():
+    """summary 목록은 긴 본문 컬럼을 SELECT 하지 않는지 테스트"""
+    sql = _list_sql(BookFields.summary)
+
+    for column in ("books.description", "books.table_of_contents", "books.introduction", "authors.description"):
+        assert column not in sql
+    assert "books.title" in sql
+    assert "authors.name" in sql
+
+
+def test_full_list_selects_text_columns():
+    """기본(full) 목록은 기존처럼 전체 컬럼을 조회하는지 테스트"""
+    sql = _list_sql(BookFields.full)
+
+    assert "books.description" in sql
+    assert "books.introduction" in sql
+
+
+def test_summary_response_fields():
+    """요약 응답 스키마에 본문 필드가 없는지 테스트"""
+    for field in ("description", "table_of_contents", "introduction"):
+        assert field not in BookSummaryResponse.model_fields
@@ -0,0 +1,161 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from lms.api.authors.model import Author
+from lms.api.books.model import Book
+from lms.database import get_read_session
+from lms.main import app
+from lms.util.utils import (
+    LOOKUP_MAX_KEYS,
+    isbn13_to_isbn10,
+    keyed_lookup,
+    normalize_isbn,
+)
+from sqlalchemy.dialects import postgresql
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("9788901272580", "9788901272580"),
+        ("978-89-01-27258-0", "9788901272580"),
+        ("89-01-27258-X", "9788901272580"),
+        ("0306406152", "9780306406157"),
+        ("12345", None),
+        ("97889012725800", None),
+        # 체크 숫자가 맞지 않음
+        ("9788901272581", None),
+        ("0306406153", None),
+        ("89-01-27258-0", None),
+    ],
+)
+def test_normalize_isbn(value, expected):
+    """ISBN-10/하이픈 포함 ISBN을 ISBN-13으로 변환하고 체크 숫자를 검증하는지 테스트"""
+    assert normalize_isbn(value) == expected
+
+
+def test_isbn13_to_isbn10():
+    assert isbn13_to_isbn10("9788901272580") == "890127258X"
+    assert isbn13_to_isbn10("9780306406157") == "0306406152"
+    assert isbn13_to_isbn10("9791162540640") is None
+
+
+def test_keyed_lookup():
+    """입력 순서와 중복을 유지하고 없는 키는 null과 missing으로 표시하는지 테스트"""
+    result = keyed_lookup(["a", "b", "a", "c"], {"A": 1, "c": 3}, {"a": "A"})
+
+    assert list(result["items"].items()) == [("a", 1), ("b", None), ("c", 3)]
+    assert result["missing"] == ["b"]
+
+
+class _FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    async def execute(self, query):
+        self.queries.append(query)
+        return SimpleNamespace(scalars=lambda: self.rows)
+
+
+def _book(isbn: str) -> Book:
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    author = Author(id="author_1", name="테스트 저자", created=now, modified=now)
+    book = Book(
+        id=f"book_{isbn}",
+        book_manage_id=f"ALADIN_{isbn}",
+        title="테스트 도서",
+        isbn=isbn,
+        author_id=author.id,
+        description="설명",
+        quantity=1,
+        created=now,
+        modified=now,
+    )
+    book.author_rel = author
+    return book
+
+
+@pytest.fixture
+def session():
+    session = _FakeSession([_book("9788901272580")])
+
+    async def override():
+        yield session
+
+    app.dependency_overrides[get_read_session] = override
+    yield session
+    app.dependency_overrides.pop(get_read_session, None)
+
+
+def test_lookup_books_by_isbn(session):
+    """ISBN-10 입력도 ISBN-13으로 찾고, 결과를 입력 키 기준으로 반환하는지 테스트"""
+    keys = ["89-01-27258-X", "9788901272580", "9780306406157", "invalid"]
+    response = TestClient(app).post("/api/books/lookup", json={"by": "isbn", "keys": keys, "fields": "summary"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert list(body["items"]) == keys
+    assert body["items"]["89-01-27258-X"]["book_manage_id"] == "ALADIN_9788901272580"
+    assert "description" not in body["items"]["9788901272580"]
+    assert body["missing"] == ["9780306406157", "invalid"]
+
+    # 입력 값 그대로와 유효한 ISBN의 ISBN-13, ISBN-10 표기를 한 번의 = ANY 쿼리로 조회
+    assert len(session.queries) == 1
+    compiled = session.queries[0].compile(dialect=postgresql.dialect())
+    assert "books.isbn = ANY (%(keys)s::VARCHAR[])" in str(compiled)
+    assert sorted(compiled.params["keys"]) == [
+        "0306406152",
+        "89-01-27258-X",
+        "890127258X",
+        "9780306406157",
+        "9788901272580",
+        "invalid",
+    ]
+
+
+def test_lookup_books_stored_isbn10(session):
+    """ISBN-10으로 저장된 도서도 ISBN-13/ISBN-10 입력으로 찾는지 테스트"""
+    session.rows = [_book("890127258X")]
+    keys = ["9788901272580", "89-01-27258-X"]
+    response = TestClient(app).post("/api/books/lookup", json={"by": "isbn", "keys": keys, "fields": "summary"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["items"]["9788901272580"]["isbn"] == "890127258X"
+    assert body["items"]["89-01-27258-X"]["isbn"] == "890127258X"
+    assert body["missing"] == []
+
+
+def test_lookup_books_max_keys(session):
+    """키 개수 제한"""
+    keys = [str(i) for i in range(LOOKUP_MAX_KEYS + 1)]
+    response = TestClient(app).post("/api/books/lookup", json={"by": "id", "keys": keys})
+
+    assert response.status_code == 422
+    assert session.queries == []
+
+
+def test_lookup_books_stored_invalid_check_digit(session):
+    """체크 숫자가 맞지 않게 저장된 ISBN도 저장된 값 그대로 조회하면 찾는지 테스트"""
+    session.rows = [_book("9791111111111")]
+    keys = ["9791111111111", "9791111111112"]
+    response = TestClient(app).post("/api/books/lookup", json={"by": "isbn", "keys": keys, "fields": "summary"})
+
+    body = response.json()
+    assert body["items"]["9791111111111"]["isbn"] == "9791111111111"
+    assert body["missing"] == ["9791111111112"]
+
+
+def test_lookup_books_prefers_exact_isbn(session):
+    """같은 책의 ISBN-13/ISBN-10이 서로 다른 행이면 입력과 정확히 같은 행을 반환하는지 테스트"""
+    session.rows = [_book("890127258X"), _book("9788901272580")]
+    keys = ["890127258X", "9788901272580", "89-01-27258-X"]
+    response = TestClient(app).post("/api/books/lookup", json={"by": "isbn", "keys": keys, "fields": "summary"})
+
+    items = response.json()["items"]
+    assert items["890127258X"]["isbn"] == "890127258X"
+    assert items["9788901272580"]["isbn"] == "9788901272580"
+    assert items["89-01-27258-X"]["isbn"] == "9788901272580"
@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from lms.api.books import orphans
+from lms.api.books.orphans import is_sweepable, sweep_orphan_objects
+
+URL_BASE = orphans.settings.AWS_S3_CLIENT_URL_BASE
+DIGEST = "a" * 64
+OTHER = "b" * 64
+
+
+def test_is_sweepable():
+    """내용 해시 키, 파생 이미지, 임시 키만 정리 대상인지 테스트"""
+    assert is_sweepable(f"media/cover/{DIGEST}.png")
+    assert is_sweepable(f"media/publisher/{DIGEST}.jpg")
+    assert is_sweepable(f"media/cover/derivatives/{DIGEST}/w120.webp")
+    assert is_sweepable("media/cover/tmp/0123abcd.png")
+    assert not is_sweepable("media/cover/cover_1a2b3c4d.png")
+
+
+class _Stream:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for row in self.rows:
+            yield row
+
+
+class _FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def stream(self, query):
+        return _Stream(self.rows)
+
+
+class _FakeStorage:
+    def __init__(self, objects):
+        self.objects = objects
+        self.deleted = []
+
+    async def list_objects(self, prefix):
+        return [(key, modified) for key, modified in self.objects if key.startswith(prefix)]
+
+    async def delete_many(self, keys):
+        self.deleted.extend(keys)
+        return len(keys)
+
+
+@pytest.fixture
+def bucket(monkeypatch):
+    old = datetime.now(timezone.utc) - timedelta(days=2)
+    new = datetime.now(timezone.utc) - timedelta(minutes=5)
+    storage = _FakeStorage(
+        [
+            (f"media/cover/{DIGEST}.png", old),
+            (f"media/cover/derivatives/{DIGEST}/w120.webp", old),
+            (f"media/publisher/{DIGEST}.jpg", old),
+            # 참조 없음
+            (f"media/cover/{OTHER}.png", old),
+            (f"media/cover/derivatives/{OTHER}/w120.webp", old),
+            ("media/cover/tmp/0123abcd.png", old),
+            # 참조 없지만 유예 기간 안
+            (f"media/cover/{'c' * 64}.png", new),
+            # 예전 방식의 파일명 키는 대상이 아님
+            ("media/cover/cover_1a2b3c4d.png", old),
+        ]
+    )
+    derivatives = {
+        "variants": [
+            {"jpeg": "https://example.com/w120.jpg", "webp": f"{URL_BASE}/media/cover/derivatives/{DIGEST}/w120.webp"}
+        ]
+    }
+    rows = [
+        (f"{URL_BASE}/media/cover/{DIGEST}.png", f"{URL_BASE}/media/publisher/{DIGEST}.jpg", derivatives),
+        ("https://image.aladin.co.kr/cover.jpg", None, None),
+        ("", None, None),
+    ]
+    monkeypatch.setattr(orphans, "storage", storage)
+    monkeypatch.setattr(orphans, "AsyncSessionLocal", lambda: _FakeSession(rows))
+    return SimpleNamespace(storage=storage)
+
+
+@pytest.mark.asyncio
+async def test_sweep_orphan_objects(bucket):
+    """도서가 참조하지 않고 유예 기간이 지난 정리 대상 객체만 삭제하는지 테스트"""
+    result = await sweep_orphan_objects(grace_seconds=3600)
+
+    assert sorted(bucket.storage.deleted) == [
+        f"media/cover/{OTHER}.png",
+        f"media/cover/derivatives/{OTHER}/w120.webp",
+        "media/cover/tmp/0123abcd.png",
+    ]
+    assert (result.scanned, result.referenced, result.recent, result.deleted) == (7, 3, 1, 3)
+
+
+@pytest.mark.asyncio
+async def test_sweep_orphan_objects_dry_run(bucket):
+    """dry run은 대상 수만 반환하고 삭제하지 않는지 테스트"""
+    result = await sweep_orphan_objects(grace_seconds=3600, dry_run=True)
+
+    assert result.deleted == 3
+    assert bucket.storage.deleted == []
@@ -0,0 +1,74 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from lms.api.books.model import Book
+from lms.api.books.search import book_to_document, index_book, search_books
+
+
+def test_book_to_document():
+    """도서 모델을 검색 문서로 변환하는 함수 테스트"""
+    book = Book(
+        book_manage_id="ALADIN_9788901272580",
+        title="테스트 도서",
+        author_id="author_1",
+        isbn="9788901272580",
+        description="테스트 설명",
+        price=15000.0,
+        quantity=3,
+    )
+
+    document = book_to_document(book, "테스트 저자")
+
+    assert document["title"] == "테스트 도서"
+    assert document["author_name"] == "테스트 저자"
+    assert document["isbn"] == "9788901272580"
+    assert document["cover_image"] == ""
+    assert document["created"] is None
+
+
+@pytest.mark.asyncio
+async def test_index_book_document_error():
+    """문서 변환 중 오류(커밋 후 만료된 속성 등)가 나도 예외 없이 색인 실패로 처리하는지 테스트"""
+    book = Book(id="book_1", book_manage_id="ALADIN_9788901272580", title="테스트 도서", isbn="9788901272580")
+
+    with (
+        patch("lms.api.books.search.book_to_document", side_effect=RuntimeError("MissingGreenlet")),
+        patch("lms.api.books.search.index_book_document", new=AsyncMock()) as index_document,
+    ):
+        assert await index_book(book, "테스트 저자") is False
+
+    index_document.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_search_books():
+    """검색 결과를 점수/하이라이트 포함 목록으로 변환하는지 테스트"""
+    mock_client = MagicMock()
+    mock_client.search = AsyncMock(
+        return_value={
+            "took": 3,
+            "hits": {
+                "total": {"value": 1},
+                "hits": [
+                    {
+                        "_id": "book_1",
+                        "_score": 4.2,
+                        "_source": {"title": "테스트 도서", "author_name": "테스트 저자"},
+                        "highlight": {"title": ["<em>테스트</em> 도서"]},
+                    }
+                ],
+            },
+        }
+    )
+
+    with patch("lms.api.books.search.get_search_client", return_value=mock_client):
+        result = await search_books("테스트", page=2, size=5)
+
+    body = mock_client.search.call_args.kwargs["body"]
+    assert body["from"] == 5
+    assert body["size"] == 5
+
+    assert result["total"] == 1
+    assert result["items"][0]["id"] == "book_1"
+    assert result["items"][0]["score"] == 4.2
+    assert result["items"][0]["highlight"]["title"] == ["<em>테스트</em> 도서"]
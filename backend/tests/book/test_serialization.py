@@ -0,0 +1,79 @@
+from datetime import datetime, timezone
+
+import pytest
+from lms.api.authors.model import Author
+from lms.api.books.api import (
+    BookResponse,
+    BookSummaryResponse,
+    book_to_dict,
+    serialize_book,
+)
+from lms.api.books.model import Book
+from lms.util.utils import json_dumps
+
+
+def _book():
+    created = datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc)
+    author = Author(id="author_1", name="테스트 저자", description="저자 소개", created=created, modified=created)
+    book = Book(
+        id="book_1",
+        book_manage_id="ALADIN_9788901272580",
+        title="테스트 도서",
+        isbn="9788901272580",
+        author_id=author.id,
+        description="테스트 설명",
+        price=15000.0,
+        quantity=3,
+        created=created,
+        modified=created,
+    )
+    book.author_rel = author
+    return book
+
+
+@pytest.mark.parametrize("schema", [BookResponse, BookSummaryResponse])
+def test_book_to_dict_matches_pydantic(schema):
+    """빠른 변환 경로가 pydantic 검증 경로와 같은 JSON을 만드는지 테스트"""
+    book = _book()
+
+    assert json_dumps(book_to_dict(book, schema)) == json_dumps(serialize_book(book, schema))
+
+
+@pytest.mark.parametrize("schema", [BookResponse, BookSummaryResponse])
+def test_book_to_dict_with_cover_derivatives(schema):
+    """DB(JSONB) 값을 그대로 쓰는 빠른 변환 경로가 표지 파생 이미지도 pydantic 경로와 같은 JSON으로 만드는지 테스트"""
+    book = _book()
+    book._cover_image = "http://localhost:9000/lms/media/cover/a.jpg"
+    # JSONB가 돌려주는 키 순서 (길이, 바이트 순)
+    book.cover_derivatives = {
+        "source": book._cover_image,
+        "variants": [
+            {
+                "jpeg": f"http://localhost:9000/lms/d/w{w}.jpg",
+                "webp": f"http://localhost:9000/lms/d/w{w}.webp",
+                "width": w,
+                "height": w * 3 // 2,
+            }
+            for w in (120, 240)
+        ],
+        "placeholder": "data:image/jpeg;base64,AAAA",
+    }
+
+    assert json_dumps(book_to_dict(book, schema)) == json_dumps(serialize_book(book, schema))
+    assert serialize_book(book, schema)["cover_derivatives"]["variants"][0]["width"] == 120
+
+
+def test_json_dumps_utc_z():
+    """UTC datetime을 pydantic과 같은 Z 표기로 인코딩하는지 테스트"""
+    value = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+    assert json_dumps({"created": value}) == b'{"created":"2024-01-02T03:04:05Z"}'
+
+
+def test_book_author_excludes_book_count():
+    """도서 응답(캐시 대상)의 저자 정보에는 도서 등록/삭제마다 바뀌는 book_count를 넣지 않는지 테스트"""
+    book = _book()
+    book.author_rel.book_count = 7
+
+    assert "book_count" not in book_to_dict(book)["author"]
+    assert "book_count" not in book_to_dict(book, BookSummaryResponse)["author"]
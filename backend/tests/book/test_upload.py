@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from lms.api.books import api as books_api
+from lms.main import app
+
+
+class _FakeStorage:
+    """파일명에 따라 지연/실패하는 가짜 스토리지"""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+
+    async def upload_content_addressed(self, new_file, path_prefix):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            # 앞쪽 파일일수록 늦게 끝나도록 (f0.png, f1.png, ...)
+            number = new_file.filename.split(".")[0][1:]
+            await asyncio.sleep(0.05 / (int(number) + 1 if number.isdigit() else 1))
+            if new_file.filename.startswith("fail"):
+                return None
+            return f"{path_prefix}/{new_file.filename}"
+        finally:
+            self.active -= 1
+
+
+@pytest.fixture
+def fake_storage(monkeypatch):
+    storage = _FakeStorage()
+    monkeypatch.setattr(books_api, "storage", storage)
+    monkeypatch.setattr(books_api.settings, "UPLOAD_CONCURRENCY", 2)
+    return storage
+
+
+def _files(*names):
+    return [("files", (name, b"image", "image/png")) for name in names]
+
+
+def test_upload_parallel_keeps_order(fake_storage):
+    """동시 업로드 수를 제한하면서 응답은 요청 순서대로 반환하는지 테스트"""
+    names = [f"f{i}.png" for i in range(6)]
+    response = TestClient(app).post("/api/books/upload", files=_files(*names))
+
+    assert response.status_code == 200
+    assert response.json() == [f"media/cover/{name}" for name in names]
+    assert fake_storage.max_active == 2
+
+
+def test_upload_partial_failure_results(fake_storage):
+    """results=true면 검증/업로드 실패를 파일별로 반환하고 나머지 파일은 업로드하는지 테스트"""
+    response = TestClient(app).post(
+        "/api/books/upload?results=true", files=_files("f0.png", "fail.png", "f2.exe", "f3.png")
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["uploaded"], body["failed"]) == (2, 2)
+    assert [(item["index"], item["status"]) for item in body["items"]] == [
+        (0, "uploaded"),
+        (1, "failed"),
+        (2, "failed"),
+        (3, "uploaded"),
+    ]
+    assert body["items"][1]["reason"] == "Upload failed"
+    assert body["items"][2]["reason"] == "File type .exe is not allowed"
+    assert body["items"][3]["url"] == "media/cover/f3.png"
+
+
+def test_upload_failure(fake_storage):
+    """기존 형식에서는 검증 오류는 업로드 전에 400, 업로드 실패는 500인지 테스트"""
+    client = TestClient(app)
+
+    response = client.post("/api/books/upload", files=_files("f0.png", "f1.exe"))
+    assert response.status_code == 400
+    assert fake_storage.max_active == 0
+
+    response = client.post("/api/books/upload", files=_files("f0.png", "fail.png"))
+    assert response.status_code == 500
+    assert response.json()["detail"] == "Failed to upload fail.png"
@@ -0,0 +1,73 @@
+import pytest
+from fastapi import BackgroundTasks, HTTPException
+from lms.api.books import api as books_api
+from lms.api.books.api import (
+    BookUpdate,
+    _book_write_error,
+    _returning_with_author,
+    update_book,
+)
+from lms.api.books.model import Book
+from lms.base.model import generate_id
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+
+
+def _integrity_error(sqlstate: str, constraint_name: str) -> IntegrityError:
+    cause = type("AsyncpgError", (Exception,), {"sqlstate": sqlstate, "constraint_name": constraint_name})()
+    orig = Exception("integrity error")
+    orig.__cause__ = cause
+    return IntegrityError("INSERT ...", {}, orig)
+
+
+def test_book_write_error_mapping():
+    """FK/unique 제약 조건 위반을 기존 API 응답으로 변환하는지 테스트"""
+    author_error = _book_write_error(_integrity_error("23503", "books_author_id_fkey"))
+    isbn_error = _book_write_error(_integrity_error("23505", "books_isbn_key"))
+
+    assert (author_error.status_code, author_error.detail) == (404, "Author not found")
+    assert (isbn_error.status_code, isbn_error.detail) == (400, "ISBN already exists")
+    assert _book_write_error(_integrity_error("23505", "unknown_constraint")) is None
+
+
+def test_create_is_single_statement():
+    """INSERT ... RETURNING 결과를 저자와 join 하는 한 문장인지 테스트"""
+    write = insert(Book).values(
+        id=generate_id(), book_manage_id="B1", title="테스트 도서", isbn="9788901272580", author_id="author_1"
+    )
+    sql = str(_returning_with_author(write).compile(dialect=postgresql.dialect()))
+
+    assert sql.startswith("WITH written AS \n(INSERT INTO books")
+    assert "RETURNING books.book_manage_id" in sql
+    assert "FROM written JOIN authors ON authors.id = written.author_id" in sql
+
+
+class _FakeStorage:
+    def __init__(self):
+        self.deleted = []
+
+    async def set_file(self, current_url, new_file, path_prefix, optimize=False):
+        if new_file is None:
+            self.deleted.append(current_url)
+            return ""
+        return "https://cdn.example.com/media/cover/new.png"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error", [HTTPException(status_code=400, detail="ISBN already exists"), RuntimeError("connection lost")]
+)
+async def test_update_book_removes_new_cover_on_failure(monkeypatch, error):
+    """쓰기가 예외로 실패해도 먼저 올린 새 표지를 삭제하는지 테스트"""
+    storage = _FakeStorage()
+
+    async def execute_book_write(session, query):
+        raise error
+
+    monkeypatch.setattr(books_api, "storage", storage)
+    monkeypatch.setattr(books_api, "_execute_book_write", execute_book_write)
+
+    with pytest.raises(type(error)):
+        await update_book("B1", BookUpdate(cover_image="https://image.example.com/c.png"), None, BackgroundTasks())
+    assert storage.deleted == ["https://cdn.example.com/media/cover/new.png"]
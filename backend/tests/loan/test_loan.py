@@ -0,0 +1,37 @@
+from lms.api.loans.api import checkout_query, return_query
+from sqlalchemy.dialects import postgresql
+
+
+def _sql(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_checkout_query():
+    """재고 감소와 대출 기록 생성이 재고 > 0 조건의 한 문장으로 처리되는지 테스트"""
+    sql = _sql(checkout_query("B1", "홍길동"))
+
+    assert sql.startswith("WITH updated AS")
+    assert "SET quantity=(books.quantity - 1)" in sql
+    assert "books.book_manage_id = 'B1' AND books.quantity > 0" in sql
+    assert "INSERT INTO loans (id, book_id, borrower) SELECT" in sql
+    assert "FROM updated RETURNING" in sql
+    assert "'홍길동'" in sql
+
+
+def test_checkout_query_generates_loan_id():
+    """CTE 안의 INSERT에는 id 기본값이 적용되지 않으므로 요청마다 새 id를 넣는지 테스트"""
+    first = checkout_query("B1").compile(dialect=postgresql.dialect()).params
+    second = checkout_query("B1").compile(dialect=postgresql.dialect()).params
+
+    assert first["param_1"] and first["param_1"] != second["param_1"]
+
+
+def test_return_query():
+    """미반납 대출만 반납 처리하고 반납된 경우에만 재고를 증가시키는지 테스트"""
+    sql = _sql(return_query("B1", "L1"))
+
+    assert sql.startswith("WITH returned AS")
+    assert "loans.id = 'L1'" in sql
+    assert "loans.returned IS NULL" in sql
+    assert "SET quantity=(books.quantity + 1)" in sql
+    assert "FROM returned WHERE books.id = returned.book_id" in sql
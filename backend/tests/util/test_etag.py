@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+
+from fastapi import Request
+from lms.util.utils import http_date, is_not_modified, make_etag, to_aware_datetime
+
+
+def make_request(headers: dict) -> Request:
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(key.lower().encode(), value.encode()) for key, value in headers.items()],
+    }
+    return Request(scope)
+
+
+def test_etag_same_for_db_and_cached_values():
+    """DB 조회 값(datetime)과 캐시된 JSON 값(ISO 문자열)이 같은 ETag를 만드는지 테스트"""
+    modified = datetime(2025, 4, 3, 9, 28, 41, 63641, tzinfo=timezone.utc)
+
+    from_db = make_etag("book_1", modified)
+    from_cache = make_etag("book_1", to_aware_datetime("2025-04-03T09:28:41.063641Z"))
+
+    assert from_db == from_cache
+    assert from_db.startswith('W/"')
+    assert make_etag("book_1", modified.replace(microsecond=0)) != from_db
+
+
+def test_is_not_modified_with_if_none_match():
+    """If-None-Match 비교 테스트 (weak 비교, 여러 값)"""
+    etag = make_etag("book_1")
+
+    assert is_not_modified(make_request({"If-None-Match": etag}), etag)
+    assert is_not_modified(make_request({"If-None-Match": f'"other", {etag.removeprefix("W/")}'}), etag)
+    assert not is_not_modified(make_request({"If-None-Match": '"other"'}), etag)
+    assert not is_not_modified(make_request({}), etag)
+
+
+def test_is_not_modified_with_if_modified_since():
+    """If-Modified-Since 비교 테스트 (초 단위)"""
+    modified = datetime(2025, 4, 3, 9, 28, 41, 63641, tzinfo=timezone.utc)
+    etag = make_etag("book_1", modified)
+
+    assert is_not_modified(make_request({"If-Modified-Since": http_date(modified)}), etag, modified)
+    assert not is_not_modified(make_request({"If-Modified-Since": "Thu, 03 Apr 2025 09:28:40 GMT"}), etag, modified)
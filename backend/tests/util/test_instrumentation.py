@@ -0,0 +1,121 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from lms.config import settings
+from lms.util import instrumentation
+from lms.util.instrumentation import (
+    ServerTimingMiddleware,
+    _explain,
+    current_query_stats,
+    instrument_engine,
+)
+from sqlalchemy import create_engine, text
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def sql_logger(monkeypatch, caplog):
+    # conftest의 silence_logging()이 lms.sql과 상위 lms 로거의 전파를 끄므로
+    # 로거를 다시 켜고 caplog 핸들러를 직접 연결 (root까지 전파되지 않아도 수집)
+    monkeypatch.setattr(instrumentation.logger, "disabled", False)
+    monkeypatch.setattr(instrumentation.logger, "propagate", False)
+    instrumentation.logger.addHandler(caplog.handler)
+    yield
+    instrumentation.logger.removeHandler(caplog.handler)
+
+
+def test_slow_query_log_with_explain(engine, monkeypatch, caplog):
+    """기준 시간 이상 걸린 문장을 실행 계획과 함께 경고 로그로 남기는지 테스트"""
+    monkeypatch.setattr(settings, "SQL_SLOW_QUERY_MS", 0.000001)
+    monkeypatch.setattr(settings, "SQL_LOG_PARAMETERS", True)
+
+    with caplog.at_level(logging.WARNING, logger="lms.sql"), engine.connect() as conn:
+        assert conn.execute(text("SELECT :value"), {"value": 1}).scalar() == 1
+
+    records = [record for record in caplog.records if record.name == "lms.sql"]
+    assert len(records) == 1
+    message = records[0].getMessage()
+    assert message.startswith("slow query")
+    assert "SELECT ?" in message
+    assert "parameters=(1,)" in message
+    # EXPLAIN 결과가 로그 다음 줄에 포함됨
+    assert "\n" in message and "EXPLAIN failed" not in message
+
+
+def test_sampled_query_log(engine, monkeypatch, caplog):
+    """느린 쿼리가 아니면 샘플링 비율에 따라서만 로그를 남기는지 테스트"""
+    monkeypatch.setattr(settings, "SQL_SLOW_QUERY_MS", 0)
+    monkeypatch.setattr(settings, "SQL_LOG_PARAMETERS", False)
+
+    with caplog.at_level(logging.INFO, logger="lms.sql"), engine.connect() as conn:
+        monkeypatch.setattr(settings, "SQL_LOG_SAMPLE_RATE", 0.0)
+        conn.execute(text("SELECT 1"))
+        assert not caplog.records
+
+        monkeypatch.setattr(settings, "SQL_LOG_SAMPLE_RATE", 1.0)
+        conn.execute(text("SELECT 2"))
+        assert caplog.records[-1].getMessage().endswith("SELECT 2")
+
+
+class _ExplainCursor:
+    """EXPLAIN만 실패하는 DBAPI cursor - 실행한 문장을 기록"""
+
+    def __init__(self, executed):
+        self.executed = executed
+
+    def execute(self, statement, parameters=None):
+        self.executed.append(statement)
+        if statement.startswith("EXPLAIN"):
+            raise RuntimeError("syntax error")
+
+    def close(self):
+        pass
+
+
+def test_explain_failure_rolls_back_to_savepoint():
+    """EXPLAIN이 실패하면 savepoint로 되돌려서 요청의 트랜잭션을 계속 쓸 수 있게 하는지 테스트"""
+    executed = []
+    conn = SimpleNamespace(connection=SimpleNamespace(cursor=lambda: _ExplainCursor(executed)))
+    context = SimpleNamespace(executemany=False, execution_options={})
+
+    plan = _explain(conn, None, "SELECT broken", (), context)
+
+    assert plan.startswith("(EXPLAIN failed")
+    assert executed == [
+        "SAVEPOINT lms_explain",
+        "EXPLAIN SELECT broken",
+        "ROLLBACK TO SAVEPOINT lms_explain",
+        "RELEASE SAVEPOINT lms_explain",
+    ]
+
+
+def test_server_timing_header(engine):
+    """요청에서 실행한 쿼리 수와 DB 시간을 Server-Timing 헤더로 응답하는지 테스트"""
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware)
+
+    @app.get("/queries")
+    def queries():
+        with engine.connect() as conn:
+            for __ in range(3):
+                conn.execute(text("SELECT 1"))
+        return {"count": current_query_stats().count}
+
+    response = TestClient(app).get("/queries")
+
+    assert response.json() == {"count": 3}
+    timing = response.headers["server-timing"]
+    assert timing.startswith("db;dur=")
+    assert 'desc="3 queries"' in timing
+    assert "app;dur=" in timing
+    assert current_query_stats() is None
@@ -0,0 +1,48 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+from lms.api.authors.model import Author
+from lms.api.books.model import Book
+from lms.util.utils import _unfiltered_table, decode_cursor, encode_cursor
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+
+def test_cursor_round_trip():
+    """cursor 인코딩/디코딩 시 keyset 값과 타입이 유지되는지 테스트"""
+    created = datetime(2025, 4, 3, 9, 28, 41, 63641, tzinfo=timezone.utc)
+    cursor = encode_cursor([created, "abc123"])
+
+    values = decode_cursor(cursor, (Book.created, Book.id))
+
+    assert values == [created, "abc123"]
+    assert isinstance(values[0], datetime)
+
+
+def test_cursor_is_url_safe():
+    """cursor가 쿼리 파라미터로 그대로 사용 가능한지 테스트"""
+    cursor = encode_cursor(["가나다 저자", "id/with+chars"])
+
+    assert "=" not in cursor
+    assert "+" not in cursor
+    assert "/" not in cursor
+    assert decode_cursor(cursor, (Author.name, Author.id)) == ["가나다 저자", "id/with+chars"]
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor(["only-one"])])
+def test_invalid_cursor(cursor):
+    """잘못된 cursor는 400 에러로 처리되는지 테스트"""
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor, (Book.created, Book.id))
+
+    assert exc_info.value.status_code == 400
+
+
+def test_unfiltered_table_for_estimate():
+    """조건 없는 목록 쿼리만 pg_class 추정치 대상이 되는지 테스트"""
+    query = select(Book).options(joinedload(Book.author_rel)).order_by(Book.created.desc())
+    assert _unfiltered_table(query).name == Book.__tablename__
+
+    filtered = query.where(Book.title.ilike("%테스트%"))
+    assert _unfiltered_table(filtered) is None